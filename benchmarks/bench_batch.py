@@ -0,0 +1,45 @@
+"""
+bench_batch.py · /predict loop vs /predict/batch
+------------------------------------------------
+Sends the same synthetic customers once through `/predict` one by one and
+once through `/predict/batch`, and reports rows/sec for both.
+
+    python -m benchmarks.bench_batch --rows 2000 --single-rows 200
+"""
+
+from __future__ import annotations
+
+import time
+
+import click
+from fastapi.testclient import TestClient
+
+from benchmarks.synth import make_payloads
+
+
+@click.command()
+@click.option("--rows", default=2000, show_default=True, help="Rows per batch call.")
+@click.option("--single-rows", default=200, show_default=True, help="Rows sent through /predict.")
+def main(rows: int, single_rows: int) -> None:
+    from src.api.app import CACHE, app
+
+    client = TestClient(app)
+    CACHE.max_size = 0                                  # time scoring, not cache hits
+    payloads = make_payloads(max(rows, single_rows))
+    client.post("/predict", json=payloads[0])          # warm-up
+
+    t0 = time.perf_counter()
+    for body in payloads[:single_rows]:
+        client.post("/predict", json=body).raise_for_status()
+    single_rps = single_rows / (time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    client.post("/predict/batch", json=payloads[:rows]).raise_for_status()
+    batch_rps = rows / (time.perf_counter() - t0)
+
+    print(f"/predict loop  : {single_rps:10.0f} rows/s")
+    print(f"/predict/batch : {batch_rps:10.0f} rows/s  ({batch_rps / single_rps:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
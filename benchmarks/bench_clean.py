@@ -0,0 +1,115 @@
+"""
+bench_clean.py · schema-driven vs. inferred-dtype cleaning
+----------------------------------------------------------
+Writes a synthetic raw extract (same columns as the Telco CSV, a few blank
+TotalCharges) and cleans it in fresh interpreters with
+
+  • legacy — `pd.read_csv` with inferred object/int64/float64 dtypes,
+    per-column `fillna`, a Python `set` per column for Yes/No casting,
+    per-column quantiles (the pre-schema `clean_data.py`)
+  • schema — `clean_data.load_raw` (pyarrow engine, declared
+    category/int8/float32) → `impute` → `winsorize_iqr`
+
+reporting wall time and peak RSS of each.
+
+    python -m benchmarks.bench_clean --rows 10000000 --csv /tmp/telco_10m.csv
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import click
+import numpy as np
+
+from benchmarks.synth import make_frame
+
+_LEGACY = r"""
+import json, resource, sys, time
+import pandas as pd
+t = time.perf_counter()
+df = pd.read_csv(sys.argv[1])
+df["TotalCharges"] = pd.to_numeric(df["TotalCharges"].replace(r"^\s*$", pd.NA, regex=True),
+                                   errors="coerce")
+df["SeniorCitizen"] = df["SeniorCitizen"].astype("bool")
+for col in df.select_dtypes(include="number").columns:
+    if df[col].isna().any():
+        df[col] = df[col].fillna(df[col].mean())
+for col in df.select_dtypes(exclude="number").columns:
+    if df[col].isna().any():
+        df[col] = df[col].fillna("Unknown")
+for col in df.columns:
+    if set(df[col].dropna().unique()) <= {"Yes", "No"}:
+        df[col] = df[col].astype("category")
+for col in df.select_dtypes(include=["number"]).columns:
+    q1, q3 = df[col].quantile([0.25, 0.75])
+    df[col] = df[col].clip(q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1))
+df.to_parquet(sys.argv[2], index=False)
+print(json.dumps({"wall_s": time.perf_counter() - t,
+                  "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                  "frame_mb": df.memory_usage(deep=True).sum() / 2**20}))
+"""
+
+_SCHEMA = r"""
+import json, resource, sys, time
+from src.data.clean_data import impute, load_raw, winsorize_iqr
+t = time.perf_counter()
+df = winsorize_iqr(impute(load_raw(sys.argv[1])))
+df.to_parquet(sys.argv[2], index=False)
+print(json.dumps({"wall_s": time.perf_counter() - t,
+                  "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                  "frame_mb": df.memory_usage(deep=True).sum() / 2**20}))
+"""
+
+
+def write_raw_csv(path: Path, rows: int, seed: int = 0, block: int = 1_000_000) -> None:
+    """Synthetic raw extract in blocks, with ~0.15 % blank TotalCharges like the real file."""
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, block):
+        df = make_frame(min(block, rows - start), seed=seed + start)
+        df.insert(0, "customerID", [f"{i:07d}-SYNTH" for i in range(start, start + len(df))])
+        df["TotalCharges"] = df["TotalCharges"].map("{:.2f}".format)
+        df.loc[rng.random(len(df)) < 0.0015, "TotalCharges"] = " "
+        df["Churn"] = np.where(rng.random(len(df)) < 0.265, "Yes", "No")
+        df.to_csv(path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+
+
+def _run(probe: str, csv: Path, out: Path) -> dict:
+    res = subprocess.run([sys.executable, "-c", probe, str(csv), str(out)],
+                         capture_output=True, text=True, check=True)
+    return json.loads(res.stdout.strip().splitlines()[-1])
+
+
+@click.command()
+@click.option("--rows", default=10_000_000, show_default=True)
+@click.option("--csv", "csv_path", type=click.Path(dir_okay=False), default=None,
+              help="Reuse / keep the synthetic CSV here (default: temp file).")
+@click.option("--output", type=click.Path(dir_okay=False), default=None,
+              help="Write both results as JSON.")
+def main(rows: int, csv_path: str | None, output: str | None) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        csv = Path(csv_path) if csv_path else Path(tmp) / "raw.csv"
+        if not csv.exists():
+            print(f"📝  Writing {rows:,} synthetic rows → {csv}")
+            write_raw_csv(csv, rows)
+
+        results = {}
+        for name, probe in (("legacy", _LEGACY), ("schema", _SCHEMA)):
+            results[name] = r = _run(probe, csv, Path(tmp) / f"{name}.parquet")
+            print(f"{name:<7} {r['wall_s']:8.1f} s   peak RSS {r['peak_rss_mb']:8.0f} MB"
+                  f"   frame {r['frame_mb']:7.0f} MB")
+
+    old, new = results["legacy"], results["schema"]
+    print(f"⚡  wall time ×{old['wall_s'] / new['wall_s']:.1f} faster, "
+          f"peak RSS −{1 - new['peak_rss_mb'] / old['peak_rss_mb']:.0%}")
+    if output:
+        with open(output, "w") as fh:
+            json.dump({"rows": rows, **results}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
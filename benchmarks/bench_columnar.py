@@ -0,0 +1,92 @@
+"""
+bench_columnar.py · JSON /predict/batch vs columnar /predict/bulk
+-----------------------------------------------------------------
+Encodes the same synthetic customers as a JSON list (`/predict/batch`,
+one pydantic model per row) and as Arrow IPC, Parquet and NDJSON bodies
+(`/predict/bulk`, validated column by column), posts each in-process and
+reports the server round trip (request → decoded response) in rows/s.
+Body encoding happens before the clock starts.
+
+    python -m benchmarks.bench_columnar --rows 100000 --no-explain
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import time
+
+import click
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi.testclient import TestClient
+
+from benchmarks.synth import make_frame
+from src.api import columnar
+
+
+def _bodies(rows: int) -> dict[str, tuple[str, bytes]]:
+    df = make_frame(rows, seed=5)
+    df.insert(0, "customer_id", [f"C{i:07d}" for i in range(rows)])
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    records = df.to_dict(orient="records")
+    payloads = [{"customer_id": r.pop("customer_id"), "data": r} for r in records]
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    parquet = io.BytesIO()
+    pq.write_table(table, parquet)
+    ndjson = "".join(json.dumps(r) + "\n" for r in df.to_dict(orient="records")).encode()
+    return {
+        "json": ("application/json", json.dumps(payloads).encode()),
+        "arrow": (columnar.ARROW, sink.getvalue().to_pybytes()),
+        "parquet": (columnar.PARQUET, parquet.getvalue()),
+        "ndjson": (columnar.NDJSON, ndjson),
+    }
+
+
+def _decode(kind: str, content: bytes) -> int:
+    if kind == "json":
+        return len(json.loads(content)["results"])
+    if kind == "arrow":
+        return pa.ipc.open_stream(content).read_all().num_rows
+    if kind == "parquet":
+        return pq.read_table(pa.BufferReader(content)).num_rows
+    return content.count(b"\n")
+
+
+@click.command()
+@click.option("--rows", default=100_000, show_default=True)
+@click.option("--explain/--no-explain", default=False, show_default=True,
+              help="Also compute top features (time then goes to SHAP, not parsing).")
+@click.option("--repeat", default=3, show_default=True)
+def main(rows: int, explain: bool, repeat: int) -> None:
+    import src.api.app as api
+
+    api.CACHE.max_size = 0                              # time scoring, not cache hits
+    api.BATCH_MAX_ROWS = max(api.BATCH_MAX_ROWS, rows)
+    client = TestClient(api.app)
+    bodies = _bodies(rows)
+    print(f"{rows:,} rows, explain={explain}")
+
+    base = None
+    for kind, (ctype, body) in bodies.items():
+        url = "/predict/batch" if kind == "json" else "/predict/bulk"
+        params = {} if kind == "json" else {"explain": str(explain).lower()}
+        if kind == "json" and not explain:
+            body = body.replace(b'"data":', b'"explain": false, "data":')
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            resp = client.post(url, content=body, params=params, headers={"content-type": ctype})
+            resp.raise_for_status()
+            assert _decode(kind, resp.content) == rows
+            best = min(best, time.perf_counter() - t0)
+        base = base or best
+        print(f"{kind:<8} {len(body) / 2**20:7.1f} MB body   {best:7.2f} s   "
+              f"{rows / best:9.0f} rows/s   ⚡ {base / best:5.1f}×")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+bench_encoder.py · single-row transform: PIPE.transform vs compiled encoder
+---------------------------------------------------------------------------
+    python -m benchmarks.bench_encoder --pipeline models/feature_pipeline_v2.pkl
+"""
+
+from __future__ import annotations
+
+import timeit
+
+import click
+import joblib
+import numpy as np
+import pandas as pd
+
+from benchmarks.synth import make_frame
+from src.api.schemas import TelcoInput
+from src.features.compiled import compile_pipeline
+
+
+@click.command()
+@click.option("--pipeline", default="models/feature_pipeline_v2.pkl", show_default=True,
+              type=click.Path(exists=True, dir_okay=False))
+@click.option("--rows", default=200, show_default=True, help="Distinct rows to cycle through.")
+@click.option("--repeat", default=5, show_default=True)
+def main(pipeline: str, rows: int, repeat: int) -> None:
+    pipe = joblib.load(pipeline)
+    enc = compile_pipeline(pipe)
+    frame = make_frame(rows, seed=1)
+    inputs = [TelcoInput(**r) for r in frame.to_dict(orient="records")]
+
+    np.testing.assert_array_equal(enc.transform(inputs), pipe.transform(frame))
+    print(f"parity ✓ ({rows} rows, {enc.n_features_out} features)")
+
+    def per_row_us(fn, number):
+        best = min(timeit.repeat(fn, number=number, repeat=repeat))
+        return best / (number * rows) * 1e6
+
+    def run_pipe():
+        for x in inputs:
+            pipe.transform(pd.DataFrame([x.model_dump()]))
+
+    def run_compiled():
+        for x in inputs:
+            enc.transform_one(x)
+
+    pipe_us = per_row_us(run_pipe, 1)
+    comp_us = per_row_us(run_compiled, 20)
+    print(f"PIPE.transform (1 row) : {pipe_us:10.1f} µs/row")
+    print(f"compiled encoder       : {comp_us:10.1f} µs/row  ({pipe_us / comp_us:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
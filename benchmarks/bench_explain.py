@@ -0,0 +1,66 @@
+"""
+bench_explain.py · /predict latency per explanation mode
+--------------------------------------------------------
+p50 / p99 single-request latency, end to end through the app (HTTP) and
+for the scoring call alone (score), for
+
+  shap    – predict_proba + shap.TreeExplainer.shap_values
+  native  – one booster call with pred_contribs / pred_contrib
+  none    – `"explain": false`, probability only
+
+    python -m benchmarks.bench_explain --requests 500
+"""
+
+from __future__ import annotations
+
+import time
+
+import click
+import numpy as np
+from fastapi.testclient import TestClient
+
+from benchmarks.synth import make_payloads
+
+
+@click.command()
+@click.option("--requests", "n", default=500, show_default=True)
+def main(n: int) -> None:
+    import src.api.app as api
+    from src.api.artifacts import Artifacts
+
+    client = TestClient(api.app)
+    api.CACHE.max_size = 0                              # time scoring, not cache hits
+    native = api.get_artifacts()
+    shap_art = Artifacts(native.model, native.pipe, explain_backend="shap")
+    payloads = make_payloads(n, seed=2)
+
+    modes = {
+        "shap": (shap_art, True),
+        "native": (native, True),
+        "none": (native, False),
+    }
+    rows = [native.encoder.transform_one(api.TelcoInput(**b["data"]))[None, :] for b in payloads]
+
+    print(f"{'mode':<8} {'HTTP p50':>9} {'HTTP p99':>9} {'score p50':>10} {'score p99':>10}   (ms)")
+    default = api.MODELS.serving_name
+    api.MODELS.add("shap", shap_art)
+    for mode, (art, explain) in modes.items():
+        api.MODELS.promote("shap" if art is shap_art else default)
+        for body in payloads[:20]:                        # warm-up
+            client.post("/predict", json={**body, "explain": explain})
+        http, score = [], []
+        for body, X in zip(payloads, rows):
+            t0 = time.perf_counter()
+            client.post("/predict", json={**body, "explain": explain}).raise_for_status()
+            t1 = time.perf_counter()
+            api._score_matrix(art, X, explain)
+            http.append(t1 - t0)
+            score.append(time.perf_counter() - t1)
+        h50, h99 = np.percentile(http, [50, 99]) * 1e3
+        s50, s99 = np.percentile(score, [50, 99]) * 1e3
+        print(f"{mode:<8} {h50:9.2f} {h99:9.2f} {s50:10.2f} {s99:10.2f}")
+    api.MODELS.promote(default)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+bench_flat_trees.py · booster predict vs. flattened NumPy evaluator
+-------------------------------------------------------------------
+Exports the final model with `src.models.flat_trees.export`, checks parity
+on the training matrix, then times `predict_proba` of both for batch sizes
+1 … 100k (best of `--repeat`).
+
+    python -m benchmarks.bench_flat_trees --model models/final/model.pkl
+"""
+
+from __future__ import annotations
+
+import json
+import timeit
+
+import click
+import numpy as np
+
+from src.features.matrix_store import load_training_data
+from src.models import final_model
+from src.models.explain import predict_proba
+from src.models.flat_trees import export
+
+BATCHES = (1, 10, 100, 1_000, 10_000, 100_000)
+
+
+@click.command()
+@click.option("--model", "model_path", default=None,
+              help="Model file for final_model.load (default: models/final/model.pkl).")
+@click.option("--data-dir", default="data/processed", show_default=True)
+@click.option("--repeat", default=3, show_default=True)
+@click.option("--output", type=click.Path(dir_okay=False), default=None,
+              help="Write the timings as JSON.")
+def main(model_path: str | None, data_dir: str, repeat: int, output: str | None) -> None:
+    model = final_model.load(model_path) if model_path else final_model.load()
+    flat = export(model)
+    X = np.asarray(load_training_data(data_dir)[0])
+    diff = np.abs(predict_proba(flat, X) - predict_proba(model, X)).max()
+    print(f"parity ✓ max |Δp| = {diff:.1e} ({len(flat.roots)} trees, depth {flat.depth})")
+
+    rng = np.random.default_rng(0)
+    results = []
+    for n in BATCHES:
+        batch = X[rng.integers(0, len(X), n)]
+        number = max(1, 2000 // n)
+
+        def ms(fn):
+            return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e3
+
+        booster_ms = ms(lambda: predict_proba(model, batch))
+        flat_ms = ms(lambda: predict_proba(flat, batch))
+        results.append({"rows": n, "booster_ms": booster_ms, "flat_ms": flat_ms})
+        print(f"{n:>7} rows   booster {booster_ms:9.3f} ms   flat {flat_ms:9.3f} ms"
+              f"   ⚡ {booster_ms / flat_ms:5.2f}×")
+    if output:
+        with open(output, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+bench_matrix_store.py · pickled X_train.pkl vs. memory-mapped matrix store
+--------------------------------------------------------------------------
+Tiles the training matrix up to `--rows`, writes it both ways
+
+  • pickle — `joblib.dump` of X / y (the pre-store `build_train_matrix.py`)
+  • mmap   — `matrix_store.save_matrix` (X.npy / y.npy / meta.json)
+
+and, in a fresh interpreter per format, times the load and runs a 5-fold
+`cross_validate_oof(n_jobs=5)` while sampling the whole process tree.
+Reported: load time, peak summed RSS (what `top` adds up; shared pages
+counted once per process) and peak summed PSS (shared pages split
+between the processes mapping them, i.e. actual physical memory).
+
+    python -m benchmarks.bench_matrix_store --rows 1000000
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import click
+import joblib
+import numpy as np
+
+from src.features.matrix_store import load_training_data, save_matrix
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_PROBE = r"""
+import json, sys, threading, time
+import joblib, numpy as np, psutil
+from sklearn.linear_model import LogisticRegression
+from src.features.matrix_store import load_matrix
+from src.train.cv import cross_validate_oof, make_cv
+
+fmt, path = sys.argv[1], sys.argv[2]
+t = time.perf_counter()
+if fmt == "pickle":
+    X, y = joblib.load(f"{path}/X_train.pkl"), joblib.load(f"{path}/y_train.pkl")
+else:
+    X, y, _, _ = load_matrix(f"{path}/train_matrix")
+load_s = time.perf_counter() - t
+
+peak = {"rss": 0, "pss": 0}
+done = threading.Event()
+def sample():
+    me = psutil.Process()
+    while not done.is_set():
+        rss = pss = 0
+        for p in [me, *me.children(recursive=True)]:
+            try:
+                m = p.memory_full_info()
+            except psutil.Error:
+                continue
+            rss, pss = rss + m.rss, pss + m.pss
+        peak["rss"], peak["pss"] = max(peak["rss"], rss), max(peak["pss"], pss)
+        time.sleep(0.05)
+th = threading.Thread(target=sample, daemon=True); th.start()
+t = time.perf_counter()
+cross_validate_oof(LogisticRegression(max_iter=200), X, y, cv=make_cv(), n_jobs=5)
+cv_s = time.perf_counter() - t
+done.set(); th.join()
+print(json.dumps({"load_s": load_s, "cv_s": cv_s,
+                  "peak_rss_mb": peak["rss"] / 2**20, "peak_pss_mb": peak["pss"] / 2**20}))
+"""
+
+
+def write_both(out: Path, rows: int) -> int:
+    """Tile the real training matrix to `rows` and write it in both formats; returns MB."""
+    X, y = load_training_data(ROOT / "data" / "processed")
+    reps = -(-rows // len(X))
+    X = np.tile(np.asarray(X), (reps, 1))[:rows]
+    y = np.tile(np.asarray(y).astype(np.int8), reps)[:rows]
+    joblib.dump(X, out / "X_train.pkl")
+    joblib.dump(y, out / "y_train.pkl")
+    save_matrix(out / "train_matrix", X, y, [f"f{i}" for i in range(X.shape[1])])
+    return X.nbytes >> 20
+
+
+def _run(fmt: str, path: Path) -> dict:
+    res = subprocess.run([sys.executable, "-c", _PROBE, fmt, str(path)],
+                         capture_output=True, text=True, check=True, cwd=ROOT)
+    return json.loads(res.stdout.strip().splitlines()[-1])
+
+
+@click.command()
+@click.option("--rows", default=1_000_000, show_default=True)
+@click.option("--output", type=click.Path(dir_okay=False), default=None,
+              help="Write both results as JSON.")
+def main(rows: int, output: str | None) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        mb = write_both(Path(tmp), rows)
+        print(f"📝  {rows:,} × X ({mb} MB) written as pickle and as matrix store")
+        results = {}
+        for fmt in ("pickle", "mmap"):
+            results[fmt] = r = _run(fmt, Path(tmp))
+            print(f"{fmt:<7} load {r['load_s'] * 1e3:8.1f} ms   5-fold CV {r['cv_s']:6.1f} s"
+                  f"   peak ΣRSS {r['peak_rss_mb']:7.0f} MB   peak ΣPSS {r['peak_pss_mb']:7.0f} MB")
+
+    old, new = results["pickle"], results["mmap"]
+    print(f"⚡  load ×{old['load_s'] / new['load_s']:.0f} faster, "
+          f"physical memory during CV −{1 - new['peak_pss_mb'] / old['peak_pss_mb']:.0%}")
+    if output:
+        with open(output, "w") as fh:
+            json.dump({"rows": rows, "matrix_mb": mb, **results}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+bench_microbatch.py · throughput / latency trade-off of /predict micro-batching
+------------------------------------------------------------------------------
+Drives the app in-process (httpx ASGI transport) with `--concurrency`
+clients each sending single-row `/predict` calls back to back, once with
+micro-batching disabled and once per `--setting ROWS:WAIT_MS`.
+
+    python -m benchmarks.bench_microbatch --concurrency 200 --requests 4000 \\
+        --setting 16:0 --setting 64:0 --setting 64:2 --setting 256:5
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import click
+import httpx
+import numpy as np
+
+from benchmarks.synth import make_payloads
+
+
+async def _drive(app, payloads: list[dict], concurrency: int) -> tuple[float, list[float], int]:
+    lat: list[float] = []
+    errors = 0
+    it = iter(payloads)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker():
+            nonlocal errors
+            for body in it:
+                t0 = time.perf_counter()
+                resp = await client.post("/predict", json=body)
+                lat.append(time.perf_counter() - t0)
+                errors += resp.status_code != 200
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - t0, lat, errors
+
+
+@click.command()
+@click.option("--concurrency", default=200, show_default=True)
+@click.option("--requests", "n", default=4000, show_default=True)
+@click.option("--setting", "settings", multiple=True, default=("16:0", "64:0", "64:2", "256:5"),
+              show_default=True, help="MAX_ROWS:MAX_WAIT_MS, repeatable.")
+def main(concurrency: int, n: int, settings: tuple[str, ...]) -> None:
+    import src.api.app as api
+    from src.api.batcher import MicroBatcher
+
+    api.CACHE.max_size = 0                              # time scoring, not cache hits
+    api.get_artifacts()
+    payloads = make_payloads(n, seed=4)
+    score_fn = lambda reqs: api._score_requests(api.get_artifacts(), reqs)   # noqa: E731
+
+    configs: list[tuple[str, MicroBatcher | None]] = [("off", None)]
+    for s in settings:
+        rows, wait = s.split(":")
+        configs.append((s, MicroBatcher(score_fn, int(rows), float(wait))))
+
+    print(f"{'rows:wait':<10} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'batch':>6} {'err':>4}")
+    for name, batcher in configs:
+        api.BATCHER = batcher
+        asyncio.run(_drive(api.app, payloads[:200], concurrency))      # warm-up
+        if batcher is not None:
+            batcher.batches = batcher.items = 0
+        wall, lat, errors = asyncio.run(_drive(api.app, payloads, concurrency))
+        p50, p95, p99 = np.percentile(lat, [50, 95, 99]) * 1e3
+        mean_batch = batcher.stats()["mean_batch_size"] if batcher else 1.0
+        print(f"{name:<10} {n / wall:8.0f} {p50:8.1f} {p95:8.1f} {p99:8.1f} "
+              f"{mean_batch:6.1f} {errors:4d}")
+
+
+if __name__ == "__main__":
+    main()
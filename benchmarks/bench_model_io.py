@@ -0,0 +1,101 @@
+"""
+bench_model_io.py · Model load time and memory per serialization format
+-----------------------------------------------------------------------
+Converts every model in `models/` (`final/model.pkl`, `*.pkl`, `*.txt`)
+to each format `final_model.save` supports for it — pickle, XGBoost
+UBJSON / JSON, LightGBM text, flattened `.npz` — and loads each file in a
+fresh interpreter.  The model library is imported first, so `load ms` is
+the load alone; `RSS MB` / `USS MB` are the growth of the process during
+the load (mapped `.npz` pages count once they are read); `cached µs` is
+a repeated `final_model.load` of the unchanged file (best of 100).
+
+    python -m benchmarks.bench_model_io
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import click
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_PROBE = r"""
+import json, sys, time
+import numpy as np, psutil
+import joblib, xgboost, lightgbm, sklearn.linear_model
+from src.models import final_model
+proc = psutil.Process()
+n_features = int(sys.argv[2])
+m0 = proc.memory_full_info()
+t0 = time.perf_counter(); model = final_model.load(sys.argv[1]); t1 = time.perf_counter()
+if n_features:                                  # score one row so mapped pages count
+    from src.models.explain import predict_proba
+    predict_proba(model, np.zeros((1, n_features)))
+m1 = proc.memory_full_info()
+cached = []
+for _ in range(100):
+    t2 = time.perf_counter(); final_model.load(sys.argv[1]); cached.append(time.perf_counter() - t2)
+print(json.dumps({"load_ms": (t1 - t0) * 1e3, "cached_us": min(cached) * 1e6,
+                  "rss_mb": (m1.rss - m0.rss) / 2**20, "uss_mb": (m1.uss - m0.uss) / 2**20}))
+"""
+
+
+def _formats(model) -> list[str]:
+    from src.models.explain import _booster
+
+    lib = _booster(model)[0]
+    if lib == "xgboost":
+        return [".pkl", ".ubj", ".json", ".npz"]
+    if lib == "lightgbm":
+        return [".pkl", ".txt", ".npz"]
+    return [".pkl"]
+
+
+def _n_features(model) -> int:
+    """Width of the model's input matrix; 0 for models that take raw columns (a Pipeline)."""
+    for attr in ("n_features_in_", "n_features"):
+        if hasattr(model, attr):
+            return int(getattr(model, attr))
+    return int(model.num_feature()) if hasattr(model, "num_feature") else 0
+
+
+@click.command()
+@click.option("--repeat", default=3, show_default=True, help="Fresh-interpreter loads per file (best kept).")
+def main(repeat: int) -> None:
+    from src.models import final_model
+    from src.models.explain import _booster
+
+    sources = [ROOT / "models" / "final" / "model.pkl"]
+    sources += sorted(p for p in (ROOT / "models").glob("*") if p.suffix in (".pkl", ".txt"))
+    results = []
+    print(f"{'model':<24} {'format':<6} {'size MB':>8} {'load ms':>8} {'cached µs':>10} "
+          f"{'RSS MB':>7} {'USS MB':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for src in sources:
+            if not src.exists():
+                continue
+            model = final_model.load(src)
+            if not (hasattr(model, "predict_proba") or _booster(model)[0]):
+                continue                                    # a feature pipeline, not a model
+            name = src.relative_to(ROOT / "models").as_posix()
+            for fmt in _formats(model):
+                path = final_model.save(model, Path(tmp) / f"{src.stem}{fmt}")
+                runs = [json.loads(subprocess.run(
+                    [sys.executable, "-c", _PROBE, str(path), str(_n_features(model))],
+                    capture_output=True, text=True, check=True, cwd=ROOT).stdout.splitlines()[-1])
+                    for _ in range(repeat)]
+                r = {"model": name, "format": fmt, "size_mb": path.stat().st_size / 2**20,
+                     **{k: min(run[k] for run in runs) for k in runs[0]}}
+                results.append(r)
+                print(f"{name:<24} {fmt:<6} {r['size_mb']:8.2f} {r['load_ms']:8.1f} "
+                      f"{r['cached_us']:10.1f} {r['rss_mb']:7.1f} {r['uss_mb']:7.1f}")
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+bench_sparse.py · dense vs. CSR feature matrix at scale
+-------------------------------------------------------
+Builds `--rows` synthetic customers (optionally with a `City` column of
+`--high-card` categories, standing in for `categorical_high_card`) and, in
+a fresh interpreter per encoding, runs
+
+  • onehot — the dense one-hot pipeline (float64 ndarray)
+  • sparse — the same layout as scipy CSR (`encoding="sparse"`)
+
+through fit_transform, LogisticRegression, XGBoost and a batch predict,
+reporting matrix size, time per step and peak RSS.
+
+    python -m benchmarks.bench_sparse --rows 1000000 --high-card 100
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+import click
+
+_PROBE = r"""
+import json, resource, sys, time
+import numpy as np, scipy.sparse as sp
+from sklearn.linear_model import LogisticRegression
+from xgboost import XGBClassifier
+from benchmarks.synth import make_frame
+from src.features import feature_lists as fl
+from src.features.feature_pipeline import build_preprocessor
+
+encoding, rows, high_card = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+rng = np.random.default_rng(0)
+df = make_frame(rows, seed=0)
+high = []
+if high_card:
+    df["City"] = rng.integers(0, high_card, rows).astype(str)
+    high = ["City"]
+y = ((df["Contract"] == "Month-to-month") & (rng.random(rows) < 0.6)
+     | (rng.random(rows) < 0.1)).to_numpy()
+
+out, t = {}, time.perf_counter()
+pipe, _ = build_preprocessor(encoding=encoding, high_card_cols=high)
+X = pipe.fit_transform(df[fl.numeric_features + fl.categorical_low_card + high], y)
+out["transform_s"] = time.perf_counter() - t
+del df
+out["cols"] = X.shape[1]
+out["matrix_mb"] = (X.data.nbytes + X.indices.nbytes + X.indptr.nbytes if sp.issparse(X)
+                    else X.nbytes) / 2**20
+
+t = time.perf_counter()
+LogisticRegression(max_iter=200).fit(X, y)
+out["logreg_fit_s"] = time.perf_counter() - t
+t = time.perf_counter()
+xgb = XGBClassifier(n_estimators=50, max_depth=6, n_jobs=1).fit(X, y)
+out["xgb_fit_s"] = time.perf_counter() - t
+t = time.perf_counter()
+xgb.predict_proba(X)
+out["xgb_predict_s"] = time.perf_counter() - t
+out["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps(out))
+"""
+
+
+def _run(encoding: str, rows: int, high_card: int) -> dict:
+    res = subprocess.run([sys.executable, "-c", _PROBE, encoding, str(rows), str(high_card)],
+                         capture_output=True, text=True, check=True)
+    return json.loads(res.stdout.strip().splitlines()[-1])
+
+
+@click.command()
+@click.option("--rows", default=1_000_000, show_default=True)
+@click.option("--high-card", default=0, show_default=True,
+              help="Categories of an extra synthetic high-cardinality column (0 = none).")
+@click.option("--output", type=click.Path(dir_okay=False), default=None,
+              help="Write both results as JSON.")
+def main(rows: int, high_card: int, output: str | None) -> None:
+    results = {}
+    for enc in ("onehot", "sparse"):
+        results[enc] = r = _run(enc, rows, high_card)
+        print(f"{enc:<7} {r['cols']:>4} cols {r['matrix_mb']:7.0f} MB   transform {r['transform_s']:5.1f} s"
+              f"   logreg {r['logreg_fit_s']:5.1f} s   xgb fit {r['xgb_fit_s']:5.1f} s"
+              f"   predict {r['xgb_predict_s']:4.1f} s   peak RSS {r['peak_rss_mb']:6.0f} MB")
+    old, new = results["onehot"], results["sparse"]
+    print(f"⚡  matrix −{1 - new['matrix_mb'] / old['matrix_mb']:.0%}, "
+          f"peak RSS −{1 - new['peak_rss_mb'] / old['peak_rss_mb']:.0%}")
+    if output:
+        with open(output, "w") as fh:
+            json.dump({"rows": rows, "high_card": high_card, **results}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
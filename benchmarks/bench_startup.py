@@ -0,0 +1,63 @@
+"""
+bench_startup.py · cold-start breakdown of the API worker
+---------------------------------------------------------
+Each repeat runs in a fresh interpreter (like a uvicorn worker restart) and
+times: app module import, artifact load, `shap` import, TreeExplainer
+construction and the warm-up request.
+
+    python -m benchmarks.bench_startup --repeat 5 --output startup.json
+"""
+
+from __future__ import annotations
+
+import json
+import statistics
+import subprocess
+import sys
+
+import click
+
+_PROBE = r"""
+import json, time
+t = time.perf_counter()
+import src.api.app as api
+out = {"import_s": time.perf_counter() - t}
+
+t = time.perf_counter(); art = api.get_artifacts()
+out["artifact_load_s"] = time.perf_counter() - t
+
+t = time.perf_counter(); import shap
+out["shap_import_s"] = time.perf_counter() - t
+
+t = time.perf_counter(); shap.TreeExplainer(art.model)
+out["explainer_s"] = time.perf_counter() - t
+
+t = time.perf_counter(); art.explainer; api.warm_up()
+out["warmup_s"] = time.perf_counter() - t
+out["total_s"] = sum(out.values())
+print(json.dumps(out))
+"""
+
+
+@click.command()
+@click.option("--repeat", default=5, show_default=True)
+@click.option("--output", type=click.Path(dir_okay=False), default=None,
+              help="Write the per-stage medians as JSON.")
+def main(repeat: int, output: str | None) -> None:
+    runs = []
+    for _ in range(repeat):
+        res = subprocess.run([sys.executable, "-c", _PROBE], capture_output=True,
+                             text=True, check=True)
+        runs.append(json.loads(res.stdout.strip().splitlines()[-1]))
+
+    medians = {k: statistics.median(r[k] for r in runs) for k in runs[0]}
+    for k, v in medians.items():
+        print(f"{k:<16} {v * 1e3:9.1f} ms   (min {min(r[k] for r in runs) * 1e3:.1f})")
+
+    if output:
+        with open(output, "w") as fh:
+            json.dump({"repeat": repeat, "median": medians, "runs": runs}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
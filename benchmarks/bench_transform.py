@@ -0,0 +1,101 @@
+"""
+bench_transform.py · Peak memory / throughput of the training-matrix build
+--------------------------------------------------------------------------
+Tiles the clean Telco parquet up to `--rows` (its compact category /
+float32 dtypes, as `scratch/build_train_matrix.py` reads it) and, in a
+fresh interpreter per mode, fits and transforms it with the one-hot
+pipeline:
+
+  • fit_transform — `pipe.fit_transform(X)` (the pre-chunking build)
+  • chunked       — `fit_columnwise` + `transform_chunked`, float64 in memory
+  • chunked32     — the same into a float32 array
+  • memmap32      — the same into a float32 `.npy` memmap
+
+Reported: fit / transform seconds, rows/s of the transform, the output
+size and the peak RSS growth over the loaded input.  A memmap's written
+pages count in RSS too, but they are page cache the kernel can write back
+and drop under memory pressure.
+
+    python -m benchmarks.bench_transform --rows 1000000,10000000 --modes chunked,chunked32,memmap32
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import click
+
+ROOT = Path(__file__).resolve().parents[1]
+MODES = ("fit_transform", "chunked", "chunked32", "memmap32")
+
+_PROBE = r"""
+import json, sys, threading, time
+import numpy as np, pandas as pd, psutil
+from src.features import feature_lists as fl
+from src.features.feature_pipeline import build_preprocessor, fit_columnwise, transform_chunked
+
+mode, n, tmp = sys.argv[1], int(sys.argv[2]), sys.argv[3]
+df = pd.read_parquet("data/clean/telco_clean.parquet")
+df = df[fl.numeric_features + fl.categorical_low_card]
+X = df.iloc[np.resize(np.arange(len(df)), n)].reset_index(drop=True)
+del df
+pipe, _ = build_preprocessor()
+
+me = psutil.Process()
+m0 = me.memory_info()
+peak = {"rss": 0}
+done = threading.Event()
+def sample():
+    while not done.is_set():
+        peak["rss"] = max(peak["rss"], me.memory_info().rss - m0.rss)
+        time.sleep(0.01)
+threading.Thread(target=sample, daemon=True).start()
+
+t0 = time.perf_counter()
+if mode == "fit_transform":
+    out = pipe.fit_transform(X)
+    t1 = t0
+else:
+    fit_columnwise(pipe, X)
+    t1 = time.perf_counter()
+    dtype = np.float64 if mode == "chunked" else np.float32
+    out = transform_chunked(pipe, X, out=f"{tmp}/X.npy" if mode == "memmap32" else None, dtype=dtype)
+t2 = time.perf_counter()
+time.sleep(0.05)
+done.set()
+rows_per_s = n / (t2 - (t0 if mode == "fit_transform" else t1))
+print(json.dumps({"fit_s": t1 - t0, "transform_s": t2 - t1, "rows_per_s": rows_per_s,
+                  "input_mb": X.memory_usage(deep=True).sum() / 2**20, "output_mb": out.nbytes / 2**20,
+                  "peak_rss_mb": peak["rss"] / 2**20}))
+"""
+
+
+@click.command()
+@click.option("--rows", default="1000000", show_default=True, help="Comma-separated row counts.")
+@click.option("--modes", default=",".join(MODES), show_default=True)
+def main(rows: str, modes: str) -> None:
+    results = []
+    print(f"{'rows':>10} {'mode':<14} {'fit s':>6} {'xform s':>8} {'rows/s':>10} "
+          f"{'out MB':>7} {'peak RSS MB':>12}")
+    for n in (int(r) for r in rows.split(",")):
+        for mode in modes.split(","):
+            with tempfile.TemporaryDirectory() as tmp:
+                proc = subprocess.run([sys.executable, "-c", _PROBE, mode, str(n), tmp],
+                                      capture_output=True, text=True, cwd=ROOT)
+            if proc.returncode != 0:                  # e.g. killed for running out of memory
+                print(f"{n:>10} {mode:<14} failed (exit {proc.returncode})")
+                results.append({"rows": n, "mode": mode, "failed": proc.returncode})
+                continue
+            r = {"rows": n, "mode": mode, **json.loads(proc.stdout.splitlines()[-1])}
+            results.append(r)
+            print(f"{n:>10} {mode:<14} {r['fit_s']:6.1f} {r['transform_s']:8.1f} "
+                  f"{r['rows_per_s']:10,.0f} {r['output_mb']:7.0f} {r['peak_rss_mb']:12.0f}")
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
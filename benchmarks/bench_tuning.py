@@ -0,0 +1,101 @@
+"""
+bench_tuning.py · tuning wall time: searched trees vs. early stopping + pruning
+-------------------------------------------------------------------------------
+Runs the same TPE search (same seed, same search space minus n_estimators)
+over the training matrix in two modes and reports wall time and best PR-AUC:
+
+  • legacy — n_estimators searched, every fold trained to completion,
+    `cross_val_score` once for PR-AUC and once for ROC-AUC
+  • early  — one fit per fold with early stopping (src/train/cv.py), the
+    running PR-AUC reported after each fold to a median / halving pruner
+
+    python -m benchmarks.bench_tuning --model xgb --trials 80
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import click
+import numpy as np
+import optuna
+from sklearn.model_selection import cross_val_score
+
+from src.features.matrix_store import load_training_data
+from src.train.cv import cross_validate_oof, make_cv
+from src.train.tuning import EARLY_STOPPING_ROUNDS, MAX_TREES, fold_reporter, make_pruner
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _space(trial: optuna.Trial, model: str) -> dict:
+    if model == "xgb":
+        from xgboost import XGBClassifier
+        return XGBClassifier, {
+            "max_depth": trial.suggest_int("max_depth", 3, 10),
+            "learning_rate": trial.suggest_float("learning_rate", 1e-3, 0.3, log=True),
+            "subsample": trial.suggest_float("subsample", 0.5, 1.0),
+            "colsample_bytree": trial.suggest_float("colsample_bytree", 0.5, 1.0),
+            "objective": "binary:logistic", "eval_metric": "aucpr", "random_state": 42,
+        }
+    from lightgbm import LGBMClassifier
+    return LGBMClassifier, {
+        "learning_rate": trial.suggest_float("learning_rate", 1e-3, 0.2, log=True),
+        "max_depth": trial.suggest_int("max_depth", -1, 10),
+        "num_leaves": trial.suggest_int("num_leaves", 31, 255, step=32),
+        "min_child_samples": trial.suggest_int("min_child_samples", 5, 40, step=5),
+        "reg_alpha": trial.suggest_float("reg_alpha", 0.0, 1.0),
+        "reg_lambda": trial.suggest_float("reg_lambda", 0.0, 1.0),
+        "subsample": trial.suggest_float("subsample", 0.6, 1.0),
+        "colsample_bytree": trial.suggest_float("colsample_bytree", 0.6, 1.0),
+        "objective": "binary", "metric": "average_precision", "random_state": 42, "verbose": -1,
+    }
+
+
+def run(model: str, mode: str, X, y, trials: int, pruner: str) -> dict:
+    cv = make_cv()
+    hi = 800 if model == "xgb" else 900
+
+    def objective(trial: optuna.Trial) -> float:
+        cls, params = _space(trial, model)
+        if mode == "legacy":
+            params["n_estimators"] = trial.suggest_int("n_estimators", 200, hi, step=100)
+            clf = cls(**params)
+            pr = cross_val_score(clf, X, y, cv=cv, scoring="average_precision").mean()
+            cross_val_score(clf, X, y, cv=cv, scoring="roc_auc")
+            return pr
+        res = cross_validate_oof(cls(**params, n_estimators=MAX_TREES), X, y, cv=cv,
+                                 early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+                                 on_fold=fold_reporter(trial))
+        return res.summary()["pr_auc_mean"]
+
+    study = optuna.create_study(direction="maximize",
+                                sampler=optuna.samplers.TPESampler(seed=0),
+                                pruner=make_pruner("none" if mode == "legacy" else pruner))
+    t0 = time.perf_counter()
+    study.optimize(objective, n_trials=trials)
+    states = [t.state for t in study.trials]
+    return {"wall_s": time.perf_counter() - t0, "best_pr_auc": study.best_value,
+            "pruned": states.count(optuna.trial.TrialState.PRUNED)}
+
+
+@click.command()
+@click.option("--model", type=click.Choice(["xgb", "lgbm"]), default="xgb", show_default=True)
+@click.option("--trials", default=80, show_default=True)
+@click.option("--pruner", type=click.Choice(["median", "halving"]), default="median",
+              show_default=True)
+def main(model: str, trials: int, pruner: str) -> None:
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    X, y = load_training_data(ROOT / "data" / "processed")
+    y = np.asarray(y)
+
+    out = {mode: run(model, mode, X, y, trials, pruner) for mode in ("legacy", "early")}
+    for mode, r in out.items():
+        print(f"{mode:<7} {r['wall_s']:8.1f} s   best PR-AUC {r['best_pr_auc']:.4f}"
+              f"   pruned {r['pruned']}/{trials}")
+    print(f"⚡  ×{out['legacy']['wall_s'] / out['early']['wall_s']:.1f} faster")
+
+
+if __name__ == "__main__":
+    main()
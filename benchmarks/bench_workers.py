@@ -0,0 +1,86 @@
+"""
+bench_workers.py · Per-worker memory: uvicorn --workers vs pre-fork preload
+---------------------------------------------------------------------------
+For every `--workers` value starts the service twice, as
+`uvicorn src.api.app:app --workers N` (spawned workers, each loading its
+own copy of everything) and as `python -m src.api.serve --workers N`
+(artifacts loaded once, workers forked), sends `--requests` /predict and
+/predict/batch calls per worker so every worker has scored, and reads
+`memory_full_info()` of every process:
+
+  USS  pages only this process maps — what stopping it would free
+  PSS  USS + its share of pages mapped by several processes
+  RSS  everything mapped, shared pages counted in full
+
+Reported per mode: mean worker USS / PSS / RSS and the PSS total of the
+whole process tree (workers, supervisor, resource tracker), i.e. the
+memory the service actually costs the machine.
+
+    python -m benchmarks.bench_workers --workers 1,4,16
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import click
+import httpx
+import numpy as np
+
+from benchmarks.loadtest import _free_port, _ints, _Server
+from benchmarks.synth import make_payloads
+
+
+async def _traffic(url: str, payloads: list, n: int) -> None:
+    async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+        sem = asyncio.Semaphore(32)
+
+        async def one(i: int):
+            async with sem:
+                if i % 10:
+                    await client.post("/predict", json=payloads[i % len(payloads)])
+                else:
+                    await client.post("/predict/batch", json=payloads[:100])
+
+        await asyncio.gather(*(one(i) for i in range(n)))
+
+
+def measure(server: _Server) -> dict:
+    """Per-worker USS / PSS / RSS (MB) and the PSS total of the process tree."""
+    import psutil
+    mb = 2**20
+    workers = [p.memory_full_info() for p in server.workers()]
+    tree = [psutil.Process(server.proc.pid)]
+    tree += tree[0].children(recursive=True)
+    return {"uss_mb": float(np.mean([m.uss for m in workers]) / mb),
+            "pss_mb": float(np.mean([m.pss for m in workers]) / mb),
+            "rss_mb": float(np.mean([m.rss for m in workers]) / mb),
+            "total_pss_mb": sum(p.memory_full_info().pss for p in tree) / mb}
+
+
+@click.command()
+@click.option("--workers", default="1,4,16", show_default=True, help="Comma-separated worker counts.")
+@click.option("--requests", "per_worker", default=100, show_default=True,
+              help="Scoring calls per worker before measuring.")
+def main(workers: str, per_worker: int) -> None:
+    payloads = make_payloads(500, seed=3)
+    results = []
+    print(f"{'workers':>7} {'mode':<8} {'USS MB':>8} {'PSS MB':>8} {'RSS MB':>8} {'total PSS MB':>13}")
+    for n in _ints(workers):
+        for preload in (False, True):
+            server = _Server(n, _free_port(), {}, preload)
+            try:
+                server.wait_ready()
+                asyncio.run(_traffic(server.url, payloads, per_worker * n))
+                r = {"workers": n, "mode": "preload" if preload else "spawn", **measure(server)}
+            finally:
+                server.close()
+            results.append(r)
+            print(f"{n:>7} {r['mode']:<8} {r['uss_mb']:8.0f} {r['pss_mb']:8.0f} {r['rss_mb']:8.0f} "
+                  f"{r['total_pss_mb']:13.0f}")
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+loadtest.py · Open-loop load test against a local uvicorn service
+-----------------------------------------------------------------
+Starts `uvicorn src.api.app:app` (the Dockerfile command) — or, with
+`--preload`, the pre-fork server `src.api.serve` — once per `--workers`
+value, waits for `/readyz`, then for every `--rate` sends
+`/predict` (or `/predict/batch` with `--batch-size` rows) on a Poisson
+arrival schedule for `--duration` seconds.  The schedule is open loop:
+requests go out at their arrival time whether or not earlier ones have
+answered, and latency is measured from the scheduled time, so a server
+that falls behind shows it in the tail instead of slowing the client down.
+
+Payloads are `benchmarks.synth.make_payloads` rows (valid `TelcoInput`).
+Reported per run: achieved throughput, p50 / p95 / p99 latency of the
+answered requests, shed rate (503s from admission control), error rate
+(other non-200s, timeouts, connection errors) and peak RSS of every worker.
+
+    python -m benchmarks.loadtest --workers 1,2,4 --rate 50,100,200 --duration 20
+    python -m benchmarks.loadtest --endpoint batch --batch-size 100 --rate 5,10 \\
+        --env CHURN_CACHE_MAX_SIZE=0 --output reports/loadtest.json
+
+The client runs on the same machine, so leave it a core when sizing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import click
+import httpx
+import numpy as np
+
+from benchmarks.synth import make_payloads
+
+ROOT = Path(__file__).resolve().parents[1]
+ENDPOINTS = {"predict": "/predict", "batch": "/predict/batch"}
+
+
+def arrival_times(rate: float, duration: float, seed: int = 0) -> np.ndarray:
+    """Poisson arrivals: offsets in seconds from the start, `rate` per second on average."""
+    rng = np.random.default_rng(seed)
+    gaps = rng.exponential(1.0 / rate, size=int(rate * duration * 1.5) + 10)
+    times = np.cumsum(gaps)
+    return times[times < duration]
+
+
+def summarize(latencies: list[float], errors: int, duration: float, rows_per_request: int = 1,
+              shed: int = 0) -> dict:
+    """Throughput and latency percentiles (ms) over the successful requests."""
+    sent = len(latencies) + errors + shed
+    p50, p95, p99 = (np.percentile(latencies, [50, 95, 99]) * 1e3 if latencies
+                     else (float("nan"),) * 3)
+    return {"sent": sent, "ok": len(latencies),
+            "throughput_rps": len(latencies) / duration,
+            "rows_per_s": len(latencies) * rows_per_request / duration,
+            "p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99),
+            "shed_rate": shed / sent if sent else 0.0,
+            "error_rate": errors / sent if sent else 0.0}
+
+
+class _Server:
+    """uvicorn (or `src.api.serve`) in a subprocess, plus a sampler of its workers' peak RSS."""
+
+    def __init__(self, workers: int, port: int, env: dict[str, str], preload: bool = False):
+        app = ["src.api.serve"] if preload else ["uvicorn", "src.api.app:app"]
+        cmd = [sys.executable, "-m", *app, "--host", "127.0.0.1",
+               "--port", str(port), "--workers", str(workers), "--log-level", "warning"]
+        self.proc = subprocess.Popen(cmd, cwd=ROOT, env={**os.environ, **env})
+        self.url = f"http://127.0.0.1:{port}"
+        self.peak: dict[int, int] = {}
+        self._stop = threading.Event()
+
+    def wait_ready(self, timeout: float = 120.0) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {self.proc.returncode}")
+            try:
+                if httpx.get(f"{self.url}/readyz", timeout=1.0).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            time.sleep(0.2)
+        raise TimeoutError(f"{self.url}/readyz not ready after {timeout:.0f} s")
+
+    def workers(self):
+        """The processes that serve requests: the spawned / forked workers, or uvicorn itself."""
+        import psutil
+        me = psutil.Process(self.proc.pid)
+        kids = [p for p in me.children(recursive=True)
+                if "resource_tracker" not in " ".join(p.cmdline())]
+        return kids or [me]
+
+    def _sample(self) -> None:
+        import psutil
+        while not self._stop.wait(0.1):
+            for p in self.workers():
+                try:
+                    self.peak[p.pid] = max(self.peak.get(p.pid, 0), p.memory_info().rss)
+                except psutil.Error:
+                    continue
+
+    def start_sampling(self) -> None:
+        self.peak.clear()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+    def stop_sampling(self) -> list[float]:
+        self._stop.set()
+        self._thread.join()
+        return sorted(rss / 2**20 for rss in self.peak.values())
+
+    def close(self) -> None:
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+
+async def _open_loop(url: str, path: str, bodies: list, offsets: np.ndarray, timeout: float
+                     ) -> tuple[list[float], int, int]:
+    latencies: list[float] = []
+    errors = shed = 0
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=256)
+    async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+
+        async def fire(body, scheduled: float):
+            nonlocal errors, shed
+            try:
+                status = (await client.post(path, json=body)).status_code
+            except httpx.HTTPError:
+                status = None
+            if status == 200:
+                latencies.append(time.perf_counter() - scheduled)
+            elif status == 503:
+                shed += 1
+            else:
+                errors += 1
+
+        start = time.perf_counter()
+        tasks = []
+        for i, offset in enumerate(offsets):
+            delay = start + offset - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(fire(bodies[i % len(bodies)], start + offset)))
+        await asyncio.gather(*tasks)
+    return latencies, errors, shed
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _ints(values: str) -> list[int]:
+    return [int(v) for v in values.split(",")]
+
+
+@click.command()
+@click.option("--workers", default="1", show_default=True, help="Comma-separated uvicorn worker counts.")
+@click.option("--rate", "rates", default="20,50,100", show_default=True,
+              help="Comma-separated arrival rates (requests/s).")
+@click.option("--duration", default=15.0, show_default=True, help="Seconds per rate.")
+@click.option("--warmup", default=3.0, show_default=True, help="Unrecorded seconds at the first rate.")
+@click.option("--endpoint", type=click.Choice(list(ENDPOINTS)), default="predict", show_default=True)
+@click.option("--batch-size", default=50, show_default=True, help="Rows per /predict/batch call.")
+@click.option("--payloads", "n_payloads", default=5000, show_default=True,
+              help="Distinct synthetic customers to cycle through.")
+@click.option("--timeout", default=10.0, show_default=True, help="Per-request timeout (s).")
+@click.option("--preload", is_flag=True,
+              help="Serve with src.api.serve (artifacts loaded once, workers forked).")
+@click.option("--env", "env_pairs", multiple=True, help="KEY=VALUE for the server, repeatable.")
+@click.option("--output", type=click.Path(dir_okay=False), default=None,
+              help="Write all runs as JSON.")
+def main(workers: str, rates: str, duration: float, warmup: float, endpoint: str,
+         batch_size: int, n_payloads: int, timeout: float, preload: bool,
+         env_pairs: tuple[str, ...], output: str | None) -> None:
+    env = dict(pair.split("=", 1) for pair in env_pairs)
+    path = ENDPOINTS[endpoint]
+    payloads = make_payloads(n_payloads, seed=7)
+    if endpoint == "batch":
+        bodies = [payloads[i:i + batch_size] for i in range(0, len(payloads), batch_size)]
+        rows_per_request = batch_size
+    else:
+        bodies, rows_per_request = payloads, 1
+
+    runs = []
+    print(f"{'workers':>7} {'rate':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'shed %':>6} {'err %':>6}  worker RSS MB")
+    for n_workers in _ints(workers):
+        server = _Server(n_workers, _free_port(), env, preload)
+        try:
+            server.wait_ready()
+            first = float(_ints(rates)[0])
+            asyncio.run(_open_loop(server.url, path, bodies,
+                                   arrival_times(first, warmup, seed=99), timeout))
+            for rate in _ints(rates):
+                server.start_sampling()
+                lat, errors, shed = asyncio.run(_open_loop(
+                    server.url, path, bodies, arrival_times(rate, duration, seed=rate), timeout))
+                rss = server.stop_sampling()
+                r = {"workers": n_workers, "preload": preload, "rate": rate, "endpoint": endpoint,
+                     **summarize(lat, errors, duration, rows_per_request, shed),
+                     "worker_rss_mb": rss}
+                runs.append(r)
+                print(f"{n_workers:>7} {rate:>6} {r['throughput_rps']:8.1f} {r['p50_ms']:8.1f} "
+                      f"{r['p95_ms']:8.1f} {r['p99_ms']:8.1f} {r['shed_rate']:6.1%} "
+                      f"{r['error_rate']:6.1%}  "
+                      + " ".join(f"{m:.0f}" for m in rss))
+        finally:
+            server.close()
+    if output:
+        with open(output, "w") as fh:
+            json.dump({"duration": duration, "batch_size": batch_size, "env": env, "runs": runs},
+                      fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
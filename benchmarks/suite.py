@@ -0,0 +1,240 @@
+"""
+suite.py · Stage-by-stage benchmark suite with regression check
+---------------------------------------------------------------
+Writes a synthetic raw Telco extract per size (`bench_clean.write_raw_csv`,
+rows valid under `TelcoInput`, cached in `--data-dir`) and, in a fresh
+interpreter per size, times every stage of the offline path:
+
+  read_csv            `schema.read_csv`  ┐ together `clean_data.load_raw`
+  coerce_raw          dtype casts, Yes/No → category (the old cast_yes_no)
+  impute              `clean_data.impute`
+  winsorize_iqr       `clean_data.winsorize_iqr`
+  pipeline_fit        `build_preprocessor()` fit on the cleaned frame
+  pipeline_transform  `PIPE.transform`
+  predict_proba       `--model` on the whole matrix
+  shap                native TreeSHAP contributions on the first `--shap-rows` rows
+
+Each stage records wall time, RSS after it and peak RSS while it ran (best
+of `--repeat` runs).  Results go to JSON (default
+`reports/bench/<git sha>.json`) so two commits can be compared:
+
+    python -m benchmarks.suite run --sizes 10k,1m
+    python -m benchmarks.suite compare reports/bench/abc1234.json reports/bench/def5678.json \\
+        --threshold 0.10
+
+`compare` exits 1 if any stage got more than `--threshold` slower (or
+its peak memory grew by more than that), ignoring changes below
+`--min-seconds` / `--min-mb` as noise.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import click
+
+ROOT = Path(__file__).resolve().parents[1]
+SIZES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+STAGES = ("read_csv", "coerce_raw", "impute", "winsorize_iqr", "pipeline_fit",
+          "pipeline_transform", "predict_proba", "shap")
+
+_PROBE = r"""
+import json, sys
+from benchmarks.suite import run_stages
+print(json.dumps(run_stages(sys.argv[1], sys.argv[2], int(sys.argv[3]))))
+"""
+
+
+class _Stage:
+    """Context manager: wall time + RSS after + peak RSS (sampled every 5 ms)."""
+
+    def __init__(self, results: dict, name: str, rows: int):
+        import psutil
+        self.results, self.name, self.rows = results, name, rows
+        self.proc = psutil.Process()
+
+    def _sample(self):
+        while not self.done.wait(0.005):
+            self.peak = max(self.peak, self.proc.memory_info().rss)
+
+    def __enter__(self):
+        self.peak = self.proc.memory_info().rss
+        self.done = threading.Event()
+        self.thread = threading.Thread(target=self._sample, daemon=True)
+        self.thread.start()
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.t0
+        self.done.set()
+        self.thread.join()
+        rss = self.proc.memory_info().rss
+        self.results[self.name] = {"wall_s": wall, "rows": self.rows,
+                                   "rss_mb": rss / 2**20,
+                                   "peak_rss_mb": max(self.peak, rss) / 2**20}
+
+
+def run_stages(csv: str | Path, model_path: str | Path, shap_rows: int = 1_000) -> dict:
+    """Run every stage once in this process; `{stage: {wall_s, rows, rss_mb, peak_rss_mb}}`."""
+    import numpy as np
+
+    from src.data import schema
+    from src.data.clean_data import coerce_raw, impute, winsorize_iqr
+    from src.features import feature_lists as fl
+    from src.features.feature_pipeline import build_preprocessor
+    from src.models import final_model
+    from src.models.explain import predict_proba, predict_with_contribs
+
+    model = final_model.load(model_path)
+    out: dict = {}
+    with _Stage(out, "read_csv", 0) as st:
+        df = schema.read_csv(Path(csv))
+        st.rows = len(df)
+    n = len(df)
+    with _Stage(out, "coerce_raw", n):
+        df = coerce_raw(df)
+    with _Stage(out, "impute", n):
+        df = impute(df)
+    with _Stage(out, "winsorize_iqr", n):
+        df = winsorize_iqr(df)
+
+    y = np.asarray(df["Churn"].map({"Yes": 1, "No": 0}), dtype=np.int8)
+    X_raw = df[fl.numeric_features + fl.categorical_low_card + fl.categorical_high_card]
+    del df
+    pipe, _ = build_preprocessor()
+    with _Stage(out, "pipeline_fit", n):
+        pipe.fit(X_raw, y)
+    with _Stage(out, "pipeline_transform", n):
+        X = pipe.transform(X_raw)
+    del X_raw
+    with _Stage(out, "predict_proba", n):
+        predict_proba(model, X)
+    sample = X[:shap_rows]
+    with _Stage(out, "shap", len(sample)):
+        predict_with_contribs(model, sample)
+    return out
+
+
+def _git_sha() -> str:
+    try:
+        res = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+        return res.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _parse_sizes(sizes: str) -> list[int]:
+    return [SIZES.get(s.strip().lower()) or int(s) for s in sizes.split(",")]
+
+
+def _best_of(runs: list[dict]) -> dict:
+    """Per stage and metric, the minimum over the repeated runs."""
+    return {stage: {k: min(r[stage][k] for r in runs) for k in runs[0][stage]}
+            for stage in runs[0]}
+
+
+def compare(base: dict, new: dict, threshold: float = 0.10,
+            min_seconds: float = 0.005, min_mb: float = 5.0) -> list[dict]:
+    """One row per (size, stage) in both results; `regression` set where `new` is worse."""
+    rows = []
+    for size, stages in new["sizes"].items():
+        for stage, b in base["sizes"].get(size, {}).items():
+            if stage not in stages:
+                continue
+            n = stages[stage]
+            wall_ratio = n["wall_s"] / b["wall_s"] if b["wall_s"] else float("inf")
+            mem_ratio = n["peak_rss_mb"] / b["peak_rss_mb"]
+            slower = wall_ratio > 1 + threshold and n["wall_s"] - b["wall_s"] > min_seconds
+            bigger = mem_ratio > 1 + threshold and n["peak_rss_mb"] - b["peak_rss_mb"] > min_mb
+            rows.append({"size": size, "stage": stage,
+                         "base_s": b["wall_s"], "new_s": n["wall_s"], "wall_ratio": wall_ratio,
+                         "base_mb": b["peak_rss_mb"], "new_mb": n["peak_rss_mb"],
+                         "mem_ratio": mem_ratio, "regression": slower or bigger})
+    return rows
+
+
+@click.group()
+def cli() -> None:
+    """Benchmark suite: `run` a set of sizes, `compare` two result files."""
+
+
+@cli.command()
+@click.option("--sizes", default="10k,1m", show_default=True,
+              help="Comma-separated row counts (10k / 1m / 10m or plain integers).")
+@click.option("--model", "model_path", default="models/xgb_optuna_best.pkl", show_default=True,
+              help="Model for final_model.load; a tracked file keeps commits comparable.")
+@click.option("--shap-rows", default=1_000, show_default=True)
+@click.option("--repeat", default=3, show_default=True, help="Fresh-interpreter runs per size.")
+@click.option("--seed", default=0, show_default=True)
+@click.option("--data-dir", type=click.Path(file_okay=False), default="data/bench",
+              show_default=True, help="Where the synthetic CSVs are cached.")
+@click.option("--output", type=click.Path(dir_okay=False), default=None,
+              help="Result JSON (default: reports/bench/<git sha>.json).")
+def run(sizes: str, model_path: str, shap_rows: int, repeat: int, seed: int,
+        data_dir: str, output: str | None) -> None:
+    from benchmarks.bench_clean import write_raw_csv
+
+    sha = _git_sha()
+    result = {"commit": sha, "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+              "python": platform.python_version(), "machine": platform.machine(),
+              "model": model_path, "shap_rows": shap_rows, "repeat": repeat, "seed": seed,
+              "sizes": {}}
+    for rows in _parse_sizes(sizes):
+        csv = Path(data_dir) / f"telco_synth_{rows}_{seed}.csv"
+        if not csv.exists():
+            csv.parent.mkdir(parents=True, exist_ok=True)
+            print(f"📝  Writing {rows:,} synthetic rows → {csv}")
+            write_raw_csv(csv, rows, seed=seed)
+        runs = []
+        for _ in range(repeat):
+            res = subprocess.run([sys.executable, "-c", _PROBE, str(csv), model_path,
+                                  str(shap_rows)], capture_output=True, text=True, check=True,
+                                 cwd=ROOT)
+            runs.append(json.loads(res.stdout.strip().splitlines()[-1]))
+        result["sizes"][str(rows)] = stages = _best_of(runs)
+        print(f"── {rows:,} rows")
+        for name, s in stages.items():
+            print(f"   {name:<19} {s['wall_s']:9.3f} s   RSS {s['rss_mb']:7.0f} MB"
+                  f"   peak {s['peak_rss_mb']:7.0f} MB")
+
+    path = Path(output) if output else ROOT / "reports" / "bench" / f"{sha}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(result, indent=2))
+    print(f"✅ Results → {path}")
+
+
+@cli.command("compare")
+@click.argument("base", type=click.Path(exists=True, dir_okay=False))
+@click.argument("new", type=click.Path(exists=True, dir_okay=False))
+@click.option("--threshold", default=0.10, show_default=True,
+              help="Allowed relative slowdown / peak-memory growth per stage.")
+@click.option("--min-seconds", default=0.005, show_default=True,
+              help="Ignore slowdowns smaller than this (timer noise).")
+@click.option("--min-mb", default=5.0, show_default=True,
+              help="Ignore peak-memory growth smaller than this.")
+def compare_cmd(base: str, new: str, threshold: float, min_seconds: float, min_mb: float) -> None:
+    old, cur = json.loads(Path(base).read_text()), json.loads(Path(new).read_text())
+    rows = compare(old, cur, threshold, min_seconds, min_mb)
+    print(f"{old['commit']} → {cur['commit']}  (threshold {threshold:.0%})")
+    for r in rows:
+        flag = "❌" if r["regression"] else "  "
+        print(f"{flag} {int(r['size']):>10,}  {r['stage']:<19} {r['base_s']:9.3f} → "
+              f"{r['new_s']:9.3f} s ({r['wall_ratio']:5.2f}×)   peak {r['base_mb']:6.0f} → "
+              f"{r['new_mb']:6.0f} MB ({r['mem_ratio']:4.2f}×)")
+    bad = [r for r in rows if r["regression"]]
+    if bad:
+        click.echo(f"❌ {len(bad)} stage(s) regressed beyond {threshold:.0%}", err=True)
+        sys.exit(1)
+    print("✅ No regressions")
+
+
+if __name__ == "__main__":
+    cli()
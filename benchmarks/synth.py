@@ -0,0 +1,56 @@
+"""
+synth.py · Synthetic Telco customers
+------------------------------------
+Rows are drawn from the Literal domains and Field bounds declared on
+`src.api.schemas.TelcoInput`, so every record validates and can be sent
+straight to the API or through the feature pipeline.
+
+    from benchmarks.synth import make_frame, make_payloads
+    df = make_frame(10_000)             # DataFrame, one column per field
+    body = make_payloads(500)           # [{"customer_id": ..., "data": {...}}]
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.api.schemas import TelcoInput
+from src.data.schema import telco_domains
+
+
+def make_frame(n: int, seed: int = 0) -> pd.DataFrame:
+    """Return `n` TelcoInput-valid rows as a DataFrame (column order = schema)."""
+    rng = np.random.default_rng(seed)
+    cols: dict[str, np.ndarray] = {}
+
+    for name, choices in telco_domains().items():
+        cols[name] = rng.choice(np.array(choices, dtype=object), size=n)
+
+    # keep the dependent service columns consistent with their parent
+    no_phone = cols["PhoneService"] == "No"
+    cols["MultipleLines"] = np.where(
+        no_phone, "No phone service",
+        rng.choice(np.array(["Yes", "No"], dtype=object), size=n),
+    ).astype(object)
+    no_net = cols["InternetService"] == "No"
+    for name in ("OnlineSecurity", "OnlineBackup", "DeviceProtection",
+                 "TechSupport", "StreamingTV", "StreamingMovies"):
+        cols[name] = np.where(no_net, "No internet service",
+                              rng.choice(np.array(["Yes", "No"], dtype=object), size=n)
+                              ).astype(object)
+
+    cols["SeniorCitizen"] = (rng.random(n) < 0.16).astype(np.int64)
+    cols["tenure"] = rng.integers(0, 73, size=n)
+    cols["MonthlyCharges"] = rng.uniform(18.25, 118.75, size=n).round(2)
+    cols["TotalCharges"] = (
+        cols["MonthlyCharges"] * np.maximum(cols["tenure"], 1) * rng.uniform(0.9, 1.1, size=n)
+    ).round(2)
+
+    return pd.DataFrame({name: cols[name] for name in TelcoInput.model_fields})
+
+
+def make_payloads(n: int, seed: int = 0) -> list[dict]:
+    """Return `n` `/predict` request bodies."""
+    records = make_frame(n, seed).to_dict(orient="records")
+    return [{"customer_id": f"C{i:07d}", "data": rec} for i, rec in enumerate(records)]
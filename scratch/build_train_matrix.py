@@ -1,28 +1,46 @@
 # scratch/build_train_matrix.py 
-import pathlib as pl, joblib, pandas as pd, numpy as np
+import os, pathlib as pl, joblib, pandas as pd, numpy as np
 from src.features import feature_lists as fl
-from src.features.feature_pipeline import build_preprocessor
+from src.features.feature_pipeline import (build_preprocessor, categorical_features,
+                                           fit_columnwise, transform_chunked)
+from src.features.matrix_store import save_matrix, store_name
 
 # --- paths --------------------------------------------------------------
 PIPE_PATH   = "models/feature_pipeline_v2.pkl"   
 DATA_CLEAN  = "data/clean/telco_clean.parquet"
 OUT_DIR     = pl.Path("data/processed")
 OUT_DIR.mkdir(parents=True, exist_ok=True)
+# CHURN_ENCODING=native → ordinal-coded categoricals in train_matrix_native/,
+#                sparse → the one-hot layout as CSR in train_matrix_sparse/
+ENCODING    = os.getenv("CHURN_ENCODING", "onehot")
+SUFFIX      = "" if ENCODING == "onehot" else f"_{ENCODING}"
+# dense encodings are transformed in row chunks into one preallocated array;
+# CHURN_MATRIX_DTYPE=float32 halves it (XGBoost / LightGBM bin in float32 anyway)
+DTYPE       = np.dtype(os.getenv("CHURN_MATRIX_DTYPE", "float64"))
+CHUNK_ROWS  = int(os.getenv("CHURN_CHUNK_ROWS", "100000"))
 
 # --- read data ----------------------------------------------------------
 df = pd.read_parquet(DATA_CLEAN)
-y  = df["Churn"].map({"Yes": 1, "No": 0}).values
+y  = np.asarray(df["Churn"].map({"Yes": 1, "No": 0}), dtype=np.int8)
 
 
-X_raw = df[fl.numeric_features + fl.categorical_low_card]
+X_raw = df[fl.numeric_features + fl.categorical_low_card + fl.categorical_high_card]
 
 # --- load pipeline & fit‑transform --------------------------------------
-pipe, _ = build_preprocessor()          # fresh pipeline in current env
-X_trans = pipe.fit_transform(X_raw, y)  # fit on full data, then transform
+pipe, _ = build_preprocessor(encoding=ENCODING)   # fresh pipeline in current env
+if ENCODING == "sparse":
+    X_trans = pipe.fit_transform(X_raw, y)
+else:                                   # fit on full data, then transform chunk by chunk
+    fit_columnwise(pipe, X_raw, y)
+    X_trans = transform_chunked(pipe, X_raw, dtype=DTYPE, chunk_rows=CHUNK_ROWS)
 
 # --- persist ------------------------------------------------------------
-joblib.dump(X_trans, OUT_DIR / "X_train.pkl")
-joblib.dump(y,       OUT_DIR / "y_train.pkl")
-joblib.dump(pipe,    "models/feature_pipeline_v2_fitted.pkl")   
-print("✅ Saved matrices to", OUT_DIR)
+# X.npy / y.npy + meta.json (feature names, pipeline & data hashes);
+# training scripts open it memory-mapped via load_training_data()
+feature_names = pipe.named_steps["pre"].get_feature_names_out().tolist()
+store = save_matrix(OUT_DIR / store_name(ENCODING), X_trans, y, feature_names,
+                    pipeline=pipe, data_path=DATA_CLEAN,
+                    categorical=categorical_features(pipe))
+joblib.dump(pipe,    f"models/feature_pipeline_v2{SUFFIX}_fitted.pkl")   
+print("✅ Saved training matrix to", store)
 
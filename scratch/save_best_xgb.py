@@ -1,14 +1,16 @@
 import joblib, optuna
 from xgboost import XGBClassifier
 from pathlib import Path
+from src.features.matrix_store import load_training_data
 
 ROOT = Path.cwd().parents[0] / "churn-prediction-pipeline"  
-X = joblib.load(ROOT/"data/processed/X_train.pkl")
-y = joblib.load(ROOT/"data/processed/y_train.pkl")
+X, y = load_training_data(ROOT/"data/processed")
 
 study = optuna.load_study(study_name="xgb_pr_auc", storage="sqlite:///optuna.db")   
 
 best_params = study.best_trial.params
+# tree count is learned by per-fold early stopping, not searched
+best_params.setdefault("n_estimators", study.best_trial.user_attrs.get("n_estimators", 100))
 best_params.update({"objective": "binary:logistic", "eval_metric": "aucpr", "random_state": 42, "n_jobs": -1})
 
 best_clf = XGBClassifier(**best_params).fit(X, y)
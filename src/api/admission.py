@@ -0,0 +1,177 @@
+"""
+admission.py
+------------
+Admission control for the scoring routes: at most `max_concurrency`
+requests run at once, up to `max_queue` more wait in FIFO order, and
+everything else is shed straight away with `503` + `Retry-After` instead
+of piling up on the threadpool until clients time out.
+
+Each request has a deadline for its wait — `X-Request-Deadline-Ms` if the
+client sends one, else `deadline_ms`.  A request is shed on arrival when
+the queue is full, or when the wait predicted for its queue position
+(position / concurrency × recent service time) already exceeds its
+deadline; one that is still waiting at its deadline is shed then.  Once
+admitted a request runs to completion.  `Retry-After` is the predicted
+time to drain the current queue, at least 1 s.
+
+`AdmissionMiddleware` is a plain ASGI middleware like `MetricsMiddleware`
+and sits inside it, so shed responses show up in the request metrics; the
+queue wait is recorded as stage `queue`.  It maps paths to controllers so
+routes of very different cost get their own limits: micro-batched
+`/predict` calls want many in flight (they are scored together), CPU-bound
+batch bodies about one per core.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import time
+from collections import deque
+
+from src.api.metrics import SHED, STAGE_SECONDS
+
+DEADLINE_HEADER = b"x-request-deadline-ms"
+
+
+class Overloaded(Exception):
+    def __init__(self, reason: str, retry_after_s: float):
+        super().__init__(reason)
+        self.reason = reason                        # queue_full | deadline
+        self.retry_after_s = retry_after_s
+
+
+class AdmissionController:
+    """Concurrency limit, bounded FIFO wait queue and per-request deadlines."""
+
+    def __init__(self, max_concurrency: int = 64, max_queue: int = 256,
+                 deadline_ms: float = 1000.0, service_s: float = 0.01):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.deadline_s = deadline_ms / 1e3
+        # EWMA of admitted request duration
+        self.service_s = service_s
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed = {"queue_full": 0, "deadline": 0}
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def expected_wait(self, position: int) -> float:
+        """Predicted wait (s) of the request at queue `position` (0 = next)."""
+        return (position + 1) / self.max_concurrency * self.service_s
+
+    def _overloaded(self, reason: str) -> Overloaded:
+        self.shed[reason] += 1
+        wait = self.expected_wait(len(self._waiters))
+        return Overloaded(reason, max(1.0, wait))
+
+    async def acquire(self, deadline_s: float | None = None) -> None:
+        """Take a slot, waiting at most `deadline_s`; `Overloaded` if shed."""
+        deadline_s = self.deadline_s if deadline_s is None else deadline_s
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise self._overloaded("queue_full")
+        if self.expected_wait(len(self._waiters)) > deadline_s:
+            raise self._overloaded("deadline")
+
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            # `release` hands its slot over
+            await asyncio.wait_for(fut, deadline_s)
+        except asyncio.TimeoutError:
+            self._discard(fut)
+            raise self._overloaded("deadline") from None
+        except asyncio.CancelledError:      # client went away while waiting
+            if fut.done() and not fut.cancelled():
+                self.release()
+            self._discard(fut)
+            raise
+        self.admitted += 1
+
+    def _discard(self, fut: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(fut)
+        except ValueError:
+            pass
+
+    def release(self, service_s: float | None = None) -> None:
+        """Give the slot to the next live waiter, or free it."""
+        if service_s is not None:
+            self.service_s += 0.1 * (service_s - self.service_s)
+        while self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {"max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "deadline_ms": self.deadline_s * 1e3,
+                "in_flight": self.in_flight,
+                "queue_depth": self.queue_depth, "admitted": self.admitted,
+                "shed": dict(self.shed), "service_ms": self.service_s * 1e3}
+
+
+def _deadline_s(scope) -> float | None:
+    for name, value in scope.get("headers", ()):
+        if name == DEADLINE_HEADER:
+            try:
+                return max(0.0, float(value) / 1e3)
+            except ValueError:
+                return None
+    return None
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware: admission control per request path (`routes`: path →
+    controller).
+    """
+
+    def __init__(self, app, routes: dict[str, AdmissionController]):
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope, receive, send):
+        controller = None
+        if scope["type"] == "http":
+            controller = self.routes.get(scope["path"])
+        if controller is None:
+            await self.app(scope, receive, send)
+            return
+        t0 = time.perf_counter()
+        try:
+            await controller.acquire(_deadline_s(scope))
+        except Overloaded as e:
+            SHED.labels(scope["path"], e.reason).inc()
+            detail = f"Overloaded ({e.reason}), retry later"
+            body = json.dumps({"detail": detail}).encode()
+            retry_after = str(math.ceil(e.retry_after_s)).encode()
+            await send({"type": "http.response.start", "status": 503,
+                        "headers": [
+                            (b"content-type", b"application/json"),
+                            (b"retry-after", retry_after),
+                            (b"content-length", str(len(body)).encode())]})
+            await send({"type": "http.response.body", "body": body})
+            return
+        t_admitted = time.perf_counter()
+        STAGE_SECONDS.labels("queue").observe(t_admitted - t0)
+        # validate starts now
+        scope.setdefault("state", {})["t_received"] = t_admitted
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(time.perf_counter() - t_admitted)
@@ -1,45 +1,662 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-import joblib, numpy as np, pandas as pd, pathlib
-from shap import TreeExplainer
+import time; _T_IMPORT = time.perf_counter()  # noqa: E702 (before imports)
 
-from src.api.schemas import TelcoInput 
+from contextlib import asynccontextmanager
+from typing import Any
+import json
+import logging
+import os
+import pathlib
+import secrets
+import threading
 
-# ---- load artifacts once
+from fastapi import Body, FastAPI, Header, HTTPException, Request
+from fastapi.responses import (JSONResponse, PlainTextResponse, Response,
+                               StreamingResponse)
+from pydantic import BaseModel, Field, ValidationError
+from starlette.concurrency import run_in_threadpool
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from src.api import columnar
+from src.api.admission import AdmissionController, AdmissionMiddleware
+from src.api.artifacts import Artifacts
+from src.api.batcher import MicroBatcher
+from src.api.cache import PredictionCache, cache_key
+from src.api.metrics import (CONTENT_TYPE, REGISTRY, ROW_ERRORS, ROWS,
+                             ROWS_SCORED, STAGE_SECONDS, MetricsMiddleware)
+from src.api.registry import ModelRegistry, ModelSpec
+from src.api.schemas import TELCO_EXAMPLE, TelcoInput
+
+log = logging.getLogger(__name__)
+
+# ---- artifacts are loaded on first use / in the background at startup
 ROOT = pathlib.Path(__file__).resolve().parents[2]
-MODEL = joblib.load(ROOT / "models" / "final" / "model.pkl")
-PIPE  = joblib.load(ROOT / "models" / "feature_pipeline_v2.pkl")
-FEATURE_NAMES = PIPE.named_steps["pre"].get_feature_names_out()
+MODEL_PATH = pathlib.Path(os.getenv(
+    "CHURN_MODEL_PATH", ROOT / "models" / "final" / "model.pkl"))
+PIPE_PATH = pathlib.Path(os.getenv(
+    "CHURN_PIPELINE_PATH", ROOT / "models" / "feature_pipeline_v2.pkl"))
+
+# native | shap | none
+EXPLAIN_BACKEND = os.getenv("CHURN_EXPLAIN_BACKEND", "native")
+# named model versions (JSON, see src/api/registry.py); unset → one "default"
+# version from CHURN_MODEL_PATH / CHURN_PIPELINE_PATH
+MODEL_REGISTRY_PATH = os.getenv("CHURN_MODEL_REGISTRY")
+# poll interval for model file changes; 0: no reload on file change
+MODEL_WATCH_S = float(os.getenv("CHURN_MODEL_WATCH_S", "5"))
+# unset: admin routes disabled
+ADMIN_TOKEN = os.getenv("CHURN_ADMIN_TOKEN")
+TOP_K = 3
+BATCH_MAX_ROWS = int(os.getenv("CHURN_BATCH_MAX_ROWS", "10000"))
+# columnar /predict/bulk bodies (Arrow / Parquet); NDJSON is scored block
+# by block
+BULK_MAX_ROWS = int(os.getenv("CHURN_BULK_MAX_ROWS", "1000000"))
+NDJSON_BLOCK_BYTES = int(os.getenv("CHURN_NDJSON_BLOCK_BYTES",
+                                   str(1 << 20)))
+# batches up to this size go through the compiled encoder instead of
+# PIPE.transform
+ENCODER_MAX_ROWS = int(os.getenv("CHURN_ENCODER_MAX_ROWS", "256"))
+
+# concurrent /predict calls are coalesced into one scoring call of up to
+# MICROBATCH_MAX_ROWS rows, waiting at most MICROBATCH_MAX_WAIT_MS for company
+# MICROBATCH_MAX_ROWS <= 1 disables micro-batching
+MICROBATCH_MAX_ROWS = int(os.getenv("CHURN_MICROBATCH_MAX_ROWS", "64"))
+MICROBATCH_MAX_WAIT_MS = float(os.getenv("CHURN_MICROBATCH_MAX_WAIT_MS",
+                                         "0"))
+
+# admission control on the scoring routes: beyond MAX_CONCURRENCY running and
+# MAX_QUEUE waiting (or past a request's deadline) answer 503 + Retry-After.
+# /predict calls are micro-batched, so many can run at once; batch / bulk
+# bodies are CPU-bound, so about one per core
+# MAX_CONCURRENCY=0 disables admission control
+MAX_CONCURRENCY = int(os.getenv("CHURN_MAX_CONCURRENCY", "64"))
+MAX_BATCH_CONCURRENCY = int(os.getenv("CHURN_MAX_BATCH_CONCURRENCY",
+                                      str(os.cpu_count() or 1)))
+MAX_QUEUE = int(os.getenv("CHURN_MAX_QUEUE", "64"))
+# default wait budget of a queued request
+QUEUE_DEADLINE_MS = float(os.getenv("CHURN_QUEUE_DEADLINE_MS", "1000"))
+
+# loaded versions + the serving one; swaps are atomic, loads happen off the
+# request path
+MODELS = (
+    ModelRegistry.from_file(MODEL_REGISTRY_PATH, ROOT, EXPLAIN_BACKEND,
+                            warm_fn=lambda art: warm_up(art))
+    if MODEL_REGISTRY_PATH else
+    ModelRegistry({"default": ModelSpec(MODEL_PATH, PIPE_PATH,
+                                        EXPLAIN_BACKEND)},
+                  "default", warm_fn=lambda art: warm_up(art))
+)
+
+# prediction cache: keyed on validated input + explain flag + artifact
+# version, dropped whenever the serving version changes (swap or reload)
+CACHE = PredictionCache(
+    max_size=int(os.getenv("CHURN_CACHE_MAX_SIZE", "50000")),      # 0 disables
+    ttl_s=float(os.getenv("CHURN_CACHE_TTL_S", "600")),
+    version_fn=lambda: MODELS.serving_version,
+)
+
+_ready = threading.Event()
+STARTUP: dict[str, Any] = {}
+
+
+def get_artifacts() -> Artifacts:
+    """
+    The serving artifacts; the first caller pays the load, concurrent
+    callers wait.
+    """
+    return MODELS.serving
+
+
+def _startup() -> None:
+    """
+    Load artifacts, build the explainer, run a warm-up request, then report
+    ready; the other registered versions load and warm after that.
+    """
+    try:
+        art = get_artifacts()
+        if art.explain_backend == "shap":
+            art.explainer
+        t0 = time.perf_counter()
+        MODELS.warm(MODELS.serving_name)
+        STARTUP.update(art.timings, warmup_s=time.perf_counter() - t0,
+                       model=MODELS.serving_name)
+        _ready.set()
+        log.info("Churn API ready: %s", STARTUP)
+    except Exception as e:
+        STARTUP["error"] = repr(e)
+        log.exception("Churn API startup failed")
+        return
+    MODELS.preload()
+    if MODEL_WATCH_S > 0:
+        MODELS.start_watching(MODEL_WATCH_S)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    threading.Thread(target=_startup, name="churn-startup",
+                     daemon=True).start()
+    yield
 
-explainer = TreeExplainer(MODEL)
 
-app = FastAPI(title="Churn Predictor API", version="0.1")
+app = FastAPI(title="Churn Predictor API", version="0.1", lifespan=lifespan)
+ADMISSION: dict[str, AdmissionController] = {}
+if MAX_CONCURRENCY > 0:
+    ADMISSION["predict"] = AdmissionController(MAX_CONCURRENCY, MAX_QUEUE,
+                                               QUEUE_DEADLINE_MS)
+    ADMISSION["batch"] = AdmissionController(MAX_BATCH_CONCURRENCY, MAX_QUEUE,
+                                             QUEUE_DEADLINE_MS, service_s=0.05)
+    app.add_middleware(AdmissionMiddleware,
+                       routes={"/predict": ADMISSION["predict"],
+                               "/predict/batch": ADMISSION["batch"],
+                               "/predict/bulk": ADMISSION["batch"]})
+# per-route latency / in-flight / status counts for GET /metrics
+# (outermost, sees 503s)
+app.add_middleware(MetricsMiddleware)
+
 
 class PredictRequest(BaseModel):
     customer_id: str
     data: TelcoInput
+    explain: bool = True            # False → skip top_features entirely
+
 
 class PredictResponse(BaseModel):
     customer_id: str
     churn_probability: float
     top_features: list[str]
 
+
+class BatchItemResult(BaseModel):
+    customer_id: str | None = None
+    churn_probability: float | None = None
+    top_features: list[str] | None = None
+    error: str | None = None
+
+
+class PredictBatchResponse(BaseModel):
+    n_ok: int
+    n_failed: int
+    results: list[BatchItemResult]
+
+
+def _top_feature_idx(contribs: np.ndarray, k: int = TOP_K) -> np.ndarray:
+    """Column indices of the k largest |contribution| features, per row."""
+    return np.argsort(np.abs(contribs), axis=1)[:, ::-1][:, :k]
+
+
+def _top_features(art: Artifacts, contribs: np.ndarray,
+                  k: int = TOP_K) -> list[list[str]]:
+    """Names of the k largest |contribution| features for every row."""
+    return [[str(art.feature_names[i]) for i in row]
+            for row in _top_feature_idx(contribs, k)]
+
+
+def _predict_matrix(
+    art: Artifacts, X: np.ndarray, explain: bool = True
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """`(proba, contribs)` for an already transformed matrix, per stage."""
+    if explain and art.explain_backend == "shap":
+        with STAGE_SECONDS.labels("predict").time():
+            proba, _ = art.score(X, explain=False)
+        with STAGE_SECONDS.labels("shap").time():
+            contribs = art.shap_values(X)
+    else:
+        # native contributions come out of the same booster call as the
+        # probability
+        stage = "predict_explain" if explain else "predict"
+        with STAGE_SECONDS.labels(stage).time():
+            proba, contribs = art.score(X, explain)
+    return proba, contribs
+
+
+def _score_matrix(
+    art: Artifacts, X: np.ndarray, explain: bool = True
+) -> tuple[np.ndarray, list[list[str]]]:
+    """
+    Probabilities (+ top features if `explain`) for an already transformed
+    matrix.
+    """
+    proba, contribs = _predict_matrix(art, X, explain)
+    if contribs is None:
+        return proba, [[] for _ in range(len(proba))]
+    return proba, _top_features(art, contribs)
+
+
+def _score(
+    art: Artifacts, df: pd.DataFrame, explain: bool = True
+) -> tuple[np.ndarray, list[list[str]]]:
+    """One transform and one scoring/explanation pass over all rows of `df`."""
+    return _score_matrix(art, art.pipe.transform(df), explain)
+
+
+def _transform_requests(art: Artifacts,
+                        reqs: list[PredictRequest]) -> np.ndarray:
+    """Compiled encoder for small batches, one PIPE.transform for big ones."""
+    with STAGE_SECONDS.labels("transform").time():
+        if art.encoder is not None and len(reqs) <= ENCODER_MAX_ROWS:
+            return art.encoder.transform([r.data for r in reqs])
+        df = pd.DataFrame([r.data.model_dump() for r in reqs])
+        return art.pipe.transform(df)
+
+
+def _score_group(art: Artifacts, reqs: list[PredictRequest],
+                 explain: bool) -> list[dict]:
+    """
+    Score validated requests together; isolate failures row by row if the
+    batch fails.
+    """
+    try:
+        X = _transform_requests(art, reqs)
+        proba, top = _score_matrix(art, X, explain)
+    except Exception as e:
+        if len(reqs) == 1:
+            return [{"customer_id": reqs[0].customer_id,
+                     "error": f"Prediction failed: {e}"}]
+        return [res for r in reqs for res in _score_group(art, [r], explain)]
+    return [
+        {"customer_id": r.customer_id, "churn_probability": float(p),
+         "top_features": t}
+        for r, p, t in zip(reqs, proba, top)
+    ]
+
+
+def _score_requests(art: Artifacts,
+                    reqs: list[PredictRequest]) -> list[dict]:
+    """
+    Serve cache hits, then one vectorized pass for explained misses and one
+    for the rest.
+    """
+    results: list[dict] = [{} for _ in reqs]
+    keys = ([cache_key(r.data, r.explain, art.version) for r in reqs]
+            if CACHE.enabled else [])
+    todo = []
+    for i, r in enumerate(reqs):
+        hit = CACHE.get(keys[i]) if keys else None
+        if hit is None:
+            todo.append(i)
+        else:
+            results[i] = {"customer_id": r.customer_id,
+                          "churn_probability": hit[0], "top_features": hit[1]}
+
+    for explain in (True, False):
+        pos = [i for i in todo if reqs[i].explain is explain]
+        if pos:
+            ROWS_SCORED.labels(str(explain).lower()).inc(len(pos))
+            scored = _score_group(art, [reqs[i] for i in pos], explain)
+            for i, res in zip(pos, scored):
+                results[i] = res
+                if keys and "error" not in res:
+                    CACHE.put(keys[i], (res["churn_probability"],
+                                        res["top_features"]))
+
+    if MODELS.shadow.active:
+        pos = [i for i in MODELS.shadow.sample(len(reqs))
+               if "error" not in results[i]]
+        if pos:
+            served = [results[i]["churn_probability"] for i in pos]
+            MODELS.shadow.submit([reqs[i].data for i in pos], served)
+    return results
+
+
+BATCHER = (
+    MicroBatcher(lambda reqs: _score_requests(get_artifacts(), reqs),
+                 max_batch_size=MICROBATCH_MAX_ROWS,
+                 max_wait_ms=MICROBATCH_MAX_WAIT_MS)
+    if MICROBATCH_MAX_ROWS > 1 else None
+)
+
+
+def _score_table(art: Artifacts, table: pa.Table, explain: bool,
+                 route: str) -> pa.Table:
+    """
+    Validate a columnar body column-wise and score its valid rows in one
+    pass.
+    """
+    with STAGE_SECONDS.labels("validate").time():
+        v = columnar.validate_table(table)
+    n_valid = int(v.valid.sum())
+    if n_valid < len(v.valid):
+        ROW_ERRORS.labels(route, "validation").inc(
+            len(v.valid) - n_valid)
+    proba = np.full(n_valid, np.nan)
+    top = (np.full((n_valid, TOP_K), "", dtype=object)
+           if explain else None)
+    row_errors = None
+    if n_valid:
+        try:
+            with STAGE_SECONDS.labels("transform").time():
+                X = art.pipe.transform(v.frame)
+            proba, contribs = _predict_matrix(art, X, explain)
+            ROWS_SCORED.labels(str(explain).lower()).inc(n_valid)
+            if contribs is not None:
+                names = np.asarray(art.feature_names, dtype=object)
+                top = names[_top_feature_idx(contribs)]
+            pos = MODELS.shadow.sample(n_valid)
+            if len(pos):
+                MODELS.shadow.submit(v.frame.iloc[pos], proba[pos])
+        except Exception as e:
+            row_errors = [err or f"Prediction failed: {e}"
+                          for err in v.errors]
+            ROW_ERRORS.labels(route, "prediction_failed").inc(n_valid)
+    return columnar.results_table(v, proba, top, row_errors)
+
+
+def _score_ndjson_block(art: Artifacts, block: bytes, explain: bool) -> bytes:
+    """
+    Score complete NDJSON lines.  A block pyarrow can't read as a whole is
+    parsed line by line, so only its unreadable lines fail.
+    """
+    failed: dict[int, str] = {}
+    try:
+        table = columnar.read_table(block, columnar.NDJSON)
+    except columnar.ColumnarError:
+        table, failed = columnar.read_ndjson_lines(block)
+    ROWS.labels("/predict/bulk").inc(table.num_rows + len(failed))
+    if failed:
+        ROW_ERRORS.labels("/predict/bulk", "validation").inc(len(failed))
+    try:
+        scored = _score_table(art, table, explain, "/predict/bulk")
+        lines = columnar.ndjson_lines(scored).splitlines(keepends=True)
+    except columnar.ColumnarError as e:     # e.g. required columns missing
+        ROW_ERRORS.labels("/predict/bulk", "validation").inc(table.num_rows)
+        error = (json.dumps({"error": str(e)}) + "\n").encode()
+        lines = [error] * table.num_rows
+    for i in sorted(failed):                # back in input order
+        lines.insert(i, (json.dumps({"error": failed[i]}) + "\n").encode())
+    return b"".join(lines)
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """
+    Streams while its generator is still reading the request body.  The
+    stock response also listens for a disconnect, which would consume the
+    body messages; a gone client surfaces from `request.stream()` instead.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+
+async def _ndjson_stream(request: Request, explain: bool):
+    art = await run_in_threadpool(get_artifacts)
+    buf = b""
+    async for chunk in request.stream():
+        buf += chunk
+        if len(buf) >= NDJSON_BLOCK_BYTES:
+            block, buf = columnar.split_lines(buf)
+            if block:
+                yield await run_in_threadpool(_score_ndjson_block, art,
+                                              block, explain)
+    if buf.strip():
+        yield await run_in_threadpool(_score_ndjson_block, art, buf,
+                                      explain)
+
+
+def _format_validation_error(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}"
+        for err in e.errors()
+    )
+
+
+def warm_up(art: Artifacts | None = None) -> None:
+    """Push a synthetic customer through the single-row and batch paths."""
+    req = PredictRequest(customer_id="warmup",
+                         data=TelcoInput(**TELCO_EXAMPLE))
+    art = art or get_artifacts()
+    _score_group(art, [req], explain=True)
+    _score_group(art, [req, req], explain=True)
+    df = pd.DataFrame([req.data.model_dump()] * 2)
+    _score_matrix(art, art.pipe.transform(df))
+
+
+@app.get("/healthz")
+def healthz():
+    """Liveness: the process is up and serving HTTP."""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+def readyz():
+    """Readiness: artifacts loaded, explainer ready and warm-up done."""
+    if _ready.is_set():
+        return {"status": "ready", "startup": STARTUP}
+    status = "failed" if "error" in STARTUP else "starting"
+    return JSONResponse(status_code=503,
+                        content={"status": status, "startup": STARTUP})
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    """Prediction-cache size and hit / miss / eviction / invalidation."""
+    return CACHE.stats()
+
+
+class ShadowConfig(BaseModel):
+    name: str | None                # challenger; None turns shadow scoring off
+    fraction: float = Field(0.05, ge=0, le=1)
+
+
+def _require_admin(token: str | None) -> None:
+    if not ADMIN_TOKEN:
+        raise HTTPException(
+            status_code=403,
+            detail="Model admin is disabled (set CHURN_ADMIN_TOKEN)")
+    if not secrets.compare_digest(token or "", ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid X-Admin-Token")
+
+
+def _model_admin(name: str, token: str | None, action) -> dict:
+    _require_admin(token)
+    if name not in MODELS.specs:
+        raise HTTPException(status_code=404,
+                            detail=f"Unknown model {name!r}")
+    try:
+        action(name)
+    except Exception as e:
+        raise HTTPException(status_code=400,
+                            detail=f"Loading {name!r} failed: {e}")
+    return MODELS.stats()
+
+
+@app.get("/models")
+def models():
+    """Registered versions, which one serves, and the shadow's stats."""
+    return MODELS.stats()
+
+
+@app.post("/models/{name}/load")
+def load_model(name: str, x_admin_token: str | None = Header(None)):
+    """(Re)load and warm `name` from its files; swapped in if serving."""
+    return _model_admin(name, x_admin_token, MODELS.load)
+
+
+@app.post("/models/{name}/promote")
+def promote_model(name: str, x_admin_token: str | None = Header(None)):
+    """Load and warm `name` if needed, then atomically make it serve."""
+    return _model_admin(name, x_admin_token, MODELS.promote)
+
+
+@app.post("/models/shadow")
+def shadow_model(cfg: ShadowConfig,
+                 x_admin_token: str | None = Header(None)):
+    """Shadow-score `fraction` of served rows with `name` in the background."""
+    if cfg.name is None:
+        _require_admin(x_admin_token)
+        MODELS.set_shadow(None, 0.0)
+        return MODELS.stats()
+    return _model_admin(cfg.name, x_admin_token,
+                        lambda name: MODELS.set_shadow(name, cfg.fraction))
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Prometheus text format: request / stage latency histograms, counters,
+    gauges.
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+def _collect_service_stats():
+    """Cache, micro-batcher and readiness numbers, read at scrape time."""
+    c = CACHE.stats()
+    yield ("churn_ready", "gauge",
+           "1 once artifacts are loaded and warmed up.",
+           [({}, float(_ready.is_set()))])
+    m = MODELS.stats()
+
+    def role(name: str) -> str:
+        if name == m["serving"]:
+            return "serving"
+        return "shadow" if name == m["shadow"]["name"] else "standby"
+
+    yield ("churn_model_info", "gauge",
+           "Loaded model versions by role (serving, shadow, standby).",
+           [({"model": name, "version": info["version"], "role": role(name)},
+             1.0)
+            for name, info in m["models"].items() if info["loaded"]])
+    yield ("churn_model_swaps_total", "counter",
+           "Serving-model swaps and reloads.", [({}, m["swaps"])])
+    yield ("churn_cache_entries", "gauge", "Prediction-cache entries.",
+           [({}, c["size"])])
+    yield ("churn_cache_lookups_total", "counter",
+           "Prediction-cache lookups by result.",
+           [({"result": "hit"}, c["hits"]),
+            ({"result": "miss"}, c["misses"])])
+    yield ("churn_cache_removals_total", "counter",
+           "Prediction-cache entries dropped, by cause.",
+           [({"cause": k}, c[k])
+            for k in ("evictions", "expirations", "invalidations")])
+    if ADMISSION:
+        stats = {name: a.stats() for name, a in ADMISSION.items()}
+        yield ("churn_admission_in_flight", "gauge",
+               "Scoring requests admitted and running.",
+               [({"limiter": n}, a["in_flight"]) for n, a in stats.items()])
+        yield ("churn_admission_queue_depth", "gauge",
+               "Scoring requests waiting for admission.",
+               [({"limiter": n}, a["queue_depth"])
+                for n, a in stats.items()])
+    if BATCHER is not None:
+        b = BATCHER.stats()
+        yield ("churn_microbatch_queue_depth", "gauge",
+               "/predict calls waiting for a batch.",
+               [({}, b["queue_depth"])])
+        yield ("churn_microbatches_total", "counter",
+               "Micro-batches scored.", [({}, b["batches"])])
+        yield ("churn_microbatch_items_total", "counter",
+               "Requests scored in micro-batches.", [({}, b["items"])])
+
+
+REGISTRY.add_collector(_collect_service_stats)
+
+
 @app.post("/predict", response_model=PredictResponse)
-def predict(req: PredictRequest):
+async def predict(req: PredictRequest, request: Request):
+    # body read + JSON parse + pydantic validation all happen before we get
+    # here
+    t_received = getattr(request.state, "t_received", None)
+    if t_received is not None:
+        STAGE_SECONDS.labels("validate").observe(
+            time.perf_counter() - t_received)
+    ROWS.labels("/predict").inc()
     try:
-        df = pd.DataFrame([req.data.model_dump()])
-        X = PIPE.transform(df)
-        proba = float(MODEL.predict_proba(X)[:, 1])
-
-        shap_val = explainer.shap_values(X, check_additivity=False)[0]  # 1-sample
-        top_idx = np.argsort(np.abs(shap_val))[::-1][:3]
-        top_feats = [str(FEATURE_NAMES[i]) for i in top_idx]
-
-        return {
-            "customer_id": req.customer_id,
-            "churn_probability": proba,
-            "top_features": top_feats,
-        }
+        if BATCHER is not None:
+            res = await BATCHER.submit(req)
+        else:
+            res = (await run_in_threadpool(
+                lambda: _score_requests(get_artifacts(), [req])))[0]
     except Exception as e:
+        res = {"error": f"Prediction failed: {e}"}
+    if "error" in res:
         # helpful 400 instead of 500 on schema/column issues
-        raise HTTPException(status_code=400, detail=f"Prediction failed: {e}")
+        raise HTTPException(status_code=400, detail=res["error"])
+    return res
+
+
+@app.post("/predict/batch", response_model=PredictBatchResponse)
+def predict_batch(items: list[dict[str, Any]] = Body(...)):
+    """
+    Score a list of `PredictRequest` bodies in one vectorized pass.
+    Invalid rows are reported in their own `error` field; the rest are
+    scored.
+    """
+    if len(items) > BATCH_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(items)} rows exceeds limit of "
+                   f"{BATCH_MAX_ROWS}",
+        )
+
+    ROWS.labels("/predict/batch").inc(len(items))
+    results: list[dict] = [{} for _ in items]
+    valid_pos, valid_reqs = [], []
+    with STAGE_SECONDS.labels("validate").time():
+        for i, item in enumerate(items):
+            try:
+                valid_reqs.append(PredictRequest.model_validate(item))
+                valid_pos.append(i)
+            except ValidationError as e:
+                cid = item.get("customer_id")
+                results[i] = {
+                    "customer_id": cid if isinstance(cid, str) else None,
+                    "error": "Validation failed: "
+                             + _format_validation_error(e),
+                }
+    if len(valid_reqs) < len(items):
+        ROW_ERRORS.labels("/predict/batch", "validation").inc(
+            len(items) - len(valid_reqs))
+
+    if valid_reqs:
+        scored = _score_requests(get_artifacts(), valid_reqs)
+        for i, res in zip(valid_pos, scored):
+            results[i] = res
+        failed = sum(1 for res in scored if "error" in res)
+        if failed:
+            ROW_ERRORS.labels("/predict/batch",
+                              "prediction_failed").inc(failed)
+
+    n_failed = sum(1 for r in results if r.get("error"))
+    return {"n_ok": len(results) - n_failed, "n_failed": n_failed,
+            "results": results}
+
+
+@app.post("/predict/bulk")
+async def predict_bulk(request: Request, explain: bool = True):
+    """
+    Columnar bulk scoring: an Arrow IPC stream, Parquet or NDJSON body
+    (Content-Type) with one `TelcoInput` row per customer, validated column
+    by column.  The response has the same format; NDJSON is read and
+    answered block by block as it streams.
+    """
+    kind = columnar.media_type(request.headers.get("content-type"))
+    if kind is None:
+        raise HTTPException(status_code=415,
+                            detail="Content-Type must be one of "
+                                   f"{sorted(columnar.MEDIA_TYPES)}")
+    if kind == columnar.NDJSON:
+        return _DuplexStreamingResponse(_ndjson_stream(request, explain),
+                                        media_type=columnar.NDJSON)
+
+    body = await request.body()
+
+    def run() -> bytes:
+        table = columnar.read_table(body, kind)
+        if table.num_rows > BULK_MAX_ROWS:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Body of {table.num_rows} rows exceeds limit of "
+                       f"{BULK_MAX_ROWS}",
+            )
+        ROWS.labels("/predict/bulk").inc(table.num_rows)
+        res = _score_table(get_artifacts(), table, explain, "/predict/bulk")
+        return columnar.write_table(res, kind)
+
+    try:
+        content = await run_in_threadpool(run)
+    except columnar.ColumnarError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(content, media_type=kind)
+
+
+STARTUP["import_s"] = time.perf_counter() - _T_IMPORT
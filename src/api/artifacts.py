@@ -0,0 +1,143 @@
+"""
+artifacts.py
+------------
+Everything one scoring call needs — fitted model, feature pipeline,
+compiled single-row encoder and the explanation backend — loaded
+together so the API can build it off the import path.
+
+Explanations default to the booster's native contributions
+(`src.models.explain`), computed in the same call as the probability.
+The "shap" backend keeps `shap.TreeExplainer`; `shap` is then only
+imported the first time `Artifacts.explainer` is read.  "none" scores
+without explanations (`top_features` come back empty); it is what a
+flattened `.npz` model gets, which has no booster for either backend.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from src.api.schemas import TELCO_EXAMPLE, TelcoInput
+from src.features.compiled import CompiledEncoder, compile_pipeline
+from src.models import final_model
+from src.models.explain import (
+    predict_proba,
+    predict_with_contribs,
+    supports_native_contribs,
+)
+from src.models.flat_trees import FlatTrees
+
+EXPLAIN_BACKENDS = ("native", "shap", "none")
+
+log = logging.getLogger(__name__)
+
+
+def _compile_encoder(pipe) -> CompiledEncoder | None:
+    """Compiled single-row encoder, or None if it can't reproduce `pipe`."""
+    try:
+        enc = compile_pipeline(pipe)
+        probe = TelcoInput(**TELCO_EXAMPLE)
+        ref = pipe.transform(pd.DataFrame([probe.model_dump()]))
+        ref = (ref.toarray() if sp.issparse(ref) else ref)[0]
+        if not np.allclose(enc.transform_one(probe), ref, rtol=0, atol=1e-12):
+            raise ValueError("compiled output differs from PIPE.transform")
+        return enc
+    except Exception as e:
+        log.warning("Single-row fast path disabled: %s", e)
+        return None
+
+
+def artifact_fingerprint(*paths: str | Path) -> str:
+    """Cheap change detector over artifact files: path, size and mtime."""
+    h = hashlib.blake2b(digest_size=8)
+    for p in paths:
+        try:
+            st = os.stat(p)
+            h.update(f"{p}:{st.st_size}:{st.st_mtime_ns};".encode())
+        except FileNotFoundError:
+            h.update(f"{p}:missing;".encode())
+    return h.hexdigest()
+
+
+class Artifacts:
+    """Fitted model, pipeline and explanation backend of a serving version."""
+
+    def __init__(self, model, pipe, explain_backend: str = "native"):
+        if explain_backend not in EXPLAIN_BACKENDS:
+            raise ValueError("explain_backend must be one of "
+                             f"{EXPLAIN_BACKENDS}")
+        if isinstance(model, FlatTrees) and explain_backend != "none":
+            log.warning("Flattened trees give probabilities only; "
+                        "serving without explanations")
+            explain_backend = "none"
+        elif (explain_backend == "native"
+              and not supports_native_contribs(model)):
+            log.warning("%s has no native contributions; using shap",
+                        type(model).__name__)
+            explain_backend = "shap"
+        self.model = model
+        self.pipe = pipe
+        self.explain_backend = explain_backend
+        self.feature_names = pipe.named_steps["pre"].get_feature_names_out()
+        self.encoder = _compile_encoder(pipe)
+        # load_artifacts replaces it with the on-disk fingerprint
+        self.version = f"mem-{id(self):x}"
+        self.timings: dict[str, float] = {}
+        self._explainer = None
+        self._explainer_lock = threading.Lock()
+
+    @property
+    def explainer(self):
+        if self._explainer is None:
+            with self._explainer_lock:
+                if self._explainer is None:
+                    t0 = time.perf_counter()
+                    # deferred heavy import
+                    from shap import TreeExplainer
+                    self._explainer = TreeExplainer(self.model)
+                    self.timings["explainer_s"] = time.perf_counter() - t0
+        return self._explainer
+
+    def score(
+        self, X, explain: bool = True
+    ) -> tuple[np.ndarray, np.ndarray | None]:
+        """
+        `(proba, contribs)` for a transformed matrix; `contribs` is None if
+        not explained.
+        """
+        if not explain or self.explain_backend == "none":
+            return predict_proba(self.model, X), None
+        if self.explain_backend == "native":
+            return predict_with_contribs(self.model, X)
+        return predict_proba(self.model, X), self.shap_values(X)
+
+    def shap_values(self, X) -> np.ndarray:
+        """`shap.TreeExplainer` contributions, one row per row of `X`."""
+        values = self.explainer.shap_values(X, check_additivity=False)
+        return np.atleast_2d(values)
+
+
+def load_artifacts(
+    model_path: str | Path,
+    pipe_path: str | Path,
+    explain_backend: str = "native",
+) -> Artifacts:
+    """Load model (`final_model.load`) and pipeline; SHAP is deferred."""
+    t0 = time.perf_counter()
+    version = artifact_fingerprint(model_path, pipe_path)
+    model = final_model.load(model_path)
+    pipe = joblib.load(pipe_path)
+    art = Artifacts(model, pipe, explain_backend)
+    art.version = version
+    art.timings["artifact_load_s"] = time.perf_counter() - t0
+    return art
@@ -0,0 +1,105 @@
+"""
+batcher.py
+----------
+Dynamic micro-batching for concurrent single-row requests.
+
+Callers `await batcher.submit(item)`; a background task takes the first
+queued item, keeps collecting until `max_batch_size` items or `max_wait_ms`
+have passed, scores the whole batch with one `score_fn(items)` call in a
+worker thread and hands each caller its own result.  Items that arrive while
+a batch is being scored simply form the next batch, so with
+`max_wait_ms=0` batching is purely opportunistic and adds no latency when
+the service is idle.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable, Sequence
+
+from starlette.concurrency import run_in_threadpool
+
+
+class MicroBatcher:
+    """Coalesce concurrent `submit` calls into batched `score_fn` calls."""
+
+    def __init__(
+        self,
+        score_fn: Callable[[list[Any]], Sequence[Any]],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 0.0,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1e3
+        self.batches = self.items = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _ensure_started(self) -> asyncio.Queue:
+        # (re)bind to the running loop — test clients may spin up a loop
+        # per request
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+        return self._queue
+
+    async def submit(self, item: Any) -> Any:
+        fut = asyncio.get_running_loop().create_future()
+        await self._ensure_started().put((item, fut))
+        return await fut
+
+    async def _collect(self) -> list[tuple[Any, asyncio.Future]]:
+        queue = self._queue
+        batch = [await queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait_s
+        while len(batch) < self.max_batch_size:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            items = [item for item, _ in batch]
+            try:
+                results = await run_in_threadpool(self.score_fn, items)
+            except Exception as e:
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += len(items)
+            for (_, fut), res in zip(batch, results):
+                if not fut.done():            # caller may have gone away
+                    fut.set_result(res)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_s * 1e3,
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": (self.items / self.batches
+                                if self.batches else 0.0),
+            "queue_depth": self.queue_depth,
+        }
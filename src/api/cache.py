@@ -0,0 +1,119 @@
+"""
+cache.py
+--------
+In-process prediction cache for the scoring API.
+
+Keys are a stable hash of the validated `TelcoInput` (pydantic's canonical
+JSON dump, so `0` / `0.0` / `"0"` collapse to one key), the `explain` flag
+and the version of the loaded model + pipeline.  Entries live in a bounded
+LRU with a per-entry TTL.  A `version_fn` (typically the on-disk artifact
+fingerprint) is polled every `check_interval_s`; when it changes, the whole
+cache is dropped.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+from pydantic import BaseModel
+
+
+def cache_key(data: BaseModel, explain: bool, version: str) -> str:
+    h = hashlib.blake2b(data.model_dump_json().encode(), digest_size=16)
+    h.update(b"\x01" if explain else b"\x00")
+    h.update(version.encode())
+    return h.hexdigest()
+
+
+class PredictionCache:
+    """Thread-safe LRU + TTL cache with hit/miss/eviction counters."""
+
+    def __init__(
+        self,
+        max_size: int = 50_000,
+        ttl_s: float = 600.0,
+        version_fn: Callable[[], str] | None = None,
+        check_interval_s: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.ttl_s = ttl_s
+        self.check_interval_s = check_interval_s
+        self._version_fn = version_fn
+        self._clock = clock
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = version_fn() if version_fn else None
+        self._next_check = clock() + check_interval_s
+        self.hits = self.misses = self.evictions = 0
+        self.expirations = self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_s > 0
+
+    def _check_version(self, now: float) -> None:
+        if self._version_fn is None or now < self._next_check:
+            return
+        self._next_check = now + self.check_interval_s
+        version = self._version_fn()
+        if version != self._version:
+            self._version = version
+            self._data.clear()
+            self.invalidations += 1
+
+    def get(self, key: str) -> Any | None:
+        if not self.enabled:
+            return None
+        now = self._clock()
+        with self._lock:
+            self._check_version(now)
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expires, value = item
+            if expires <= now:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl_s, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.invalidations += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "ttl_s": self.ttl_s,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
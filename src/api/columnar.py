@@ -0,0 +1,283 @@
+"""
+columnar.py
+-----------
+Columnar request / response bodies for bulk scoring (`POST /predict/bulk`):
+
+  application/vnd.apache.arrow.stream   Arrow IPC stream
+  application/vnd.apache.parquet        Parquet file
+  application/x-ndjson                  one JSON object per line
+
+A body is one row per customer with the `TelcoInput` fields as columns
+(flat, or nested under a `data` struct like the JSON routes) and an
+optional `customer_id`.  `validate_table` checks whole columns against the
+same Literal domains and `Field(ge=, le=)` bounds as `TelcoInput`
+(`src.data.schema`) and returns a DataFrame for the pipeline: categoricals
+are built from Arrow dictionary codes, so no per-row Python objects exist
+unless a row is invalid (only those get an error message).
+
+Responses use the request's format: `customer_id` (if sent),
+`churn_probability`, `top_features` (unless `explain=false`) and `error`,
+null where not applicable.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.api.schemas import TelcoInput
+from src.data.schema import BOUNDS, telco_domains
+
+ARROW = "application/vnd.apache.arrow.stream"
+PARQUET = "application/vnd.apache.parquet"
+NDJSON = "application/x-ndjson"
+MEDIA_TYPES = {ARROW: ARROW, PARQUET: PARQUET,
+               "application/x-parquet": PARQUET,
+               NDJSON: NDJSON, "application/jsonl": NDJSON}
+ID_COL = "customer_id"
+
+FIELDS = list(TelcoInput.model_fields)
+DOMAINS = {name: list(choices) for name, choices in telco_domains().items()}
+INT_FIELDS = {n for n, f in TelcoInput.model_fields.items()
+              if f.annotation is int}
+
+
+class ColumnarError(ValueError):
+    """The body as a whole can't be used (unreadable, columns missing)."""
+
+
+def media_type(content_type: str | None) -> str | None:
+    """
+    Canonical columnar media type for a Content-Type header, None if not
+    columnar.
+    """
+    return MEDIA_TYPES.get((content_type or "").split(";")[0].strip().lower())
+
+
+def read_table(body: bytes, kind: str) -> pa.Table:
+    try:
+        if kind == ARROW:
+            return pa.ipc.open_stream(pa.BufferReader(body)).read_all()
+        if kind == PARQUET:
+            import pyarrow.parquet as pq
+            return pq.read_table(pa.BufferReader(body))
+        import pyarrow.json as pj
+        return pj.read_json(pa.BufferReader(body))
+    except (pa.ArrowInvalid, OSError) as e:
+        raise ColumnarError(f"Unreadable {kind} body: {e}") from e
+
+
+def _line_value(v) -> str | None:
+    """
+    A JSON value as the string `validate_table` coerces (numbers / bools as
+    digits).
+    """
+    if v is None or isinstance(v, str):
+        return v
+    if isinstance(v, bool):
+        return str(int(v))
+    return json.dumps(v)
+
+
+def read_ndjson_lines(block: bytes) -> tuple[pa.Table, dict[int, str]]:
+    """
+    NDJSON parsed line by line, for blocks pyarrow can't read as a whole (a
+    value whose JSON type differs between lines): every field becomes a
+    string column, coerced and checked by `validate_table` like any other
+    body.  Returns the table of the readable lines and `{line: error}` for
+    the rest, line numbers counting non-blank lines.
+    """
+    records, failed = [], {}
+    lines = [line for line in block.splitlines() if line.strip()]
+    for i, line in enumerate(lines):
+        try:
+            rec = json.loads(line)
+        except ValueError as e:
+            failed[i] = f"Unreadable NDJSON line: {e}"
+            continue
+        if not isinstance(rec, dict):
+            failed[i] = "Unreadable NDJSON line: not a JSON object"
+            continue
+        if isinstance(rec.get("data"), dict):   # the JSON routes' nesting
+            rec = {**rec, **rec.pop("data")}
+        records.append(rec)
+    columns = ([ID_COL] if any(ID_COL in r for r in records) else []) + FIELDS
+    table = pa.table({
+        c: pa.array([_line_value(r.get(c)) for r in records], pa.string())
+        for c in columns})
+    return table, failed
+
+
+def _flatten_data(table: pa.Table) -> pa.Table:
+    """
+    `data.<field>` struct columns (the JSON routes' nesting) → top-level
+    columns.
+    """
+    if ("data" not in table.column_names
+            or not pa.types.is_struct(table.schema.field("data").type)):
+        return table
+    flat = table.flatten()
+    return flat.rename_columns([c[5:] if c.startswith("data.") else c
+                                for c in flat.column_names])
+
+
+def _literal_msg(choices: list[str]) -> str:
+    quoted = [f"'{c}'" for c in choices]
+    if len(quoted) < 3:
+        return "Input should be " + " or ".join(quoted)
+    return "Input should be " + ", ".join(quoted[:-1]) + " or " + quoted[-1]
+
+
+def _as_float(col: pa.ChunkedArray) -> np.ndarray:
+    """Column as float64, NaN where missing or not a number."""
+    t = col.type
+    if pa.types.is_dictionary(t):
+        col, t = col.cast(t.value_type), t.value_type
+    if (pa.types.is_integer(t) or pa.types.is_floating(t)
+            or pa.types.is_boolean(t)):
+        x = col.cast(pa.float64()).to_numpy(zero_copy_only=False)
+        return x.astype(np.float64, copy=False)
+    if pa.types.is_string(t) or pa.types.is_large_string(t):
+        x = pd.to_numeric(col.to_pandas(), errors="coerce")
+        return x.to_numpy(np.float64)
+    return np.full(len(col), np.nan)
+
+
+class Validated(NamedTuple):
+    frame: pd.DataFrame             # valid rows only, TelcoInput columns
+    valid: np.ndarray               # bool, one per input row
+    errors: list[str | None]        # message per input row, None if valid
+    ids: pa.Array | None            # customer_id column as strings, if sent
+
+
+def validate_table(table: pa.Table) -> Validated:
+    table = _flatten_data(table)
+    missing = [f for f in FIELDS if f not in table.column_names]
+    if missing:
+        raise ColumnarError(f"Missing columns: {', '.join(missing)}")
+    n = table.num_rows
+    problems: list[tuple[np.ndarray, str]] = []     # (bad-row mask, message)
+    cols: dict[str, object] = {}
+
+    for name in FIELDS:
+        col = table.column(name)
+        if name in DOMAINS:
+            choices = DOMAINS[name]
+            if not (pa.types.is_dictionary(col.type)
+                    or pa.types.is_string(col.type)):
+                col = col.cast(pa.string())
+            codes = pc.index_in(col, value_set=pa.array(choices))
+            codes = pc.fill_null(codes, -1)
+            codes = codes.to_numpy().astype(np.int8)
+            problems.append((codes < 0, f"{name}: {_literal_msg(choices)}"))
+            cols[name] = pd.Categorical.from_codes(np.maximum(codes, 0),
+                                                   categories=choices)
+            continue
+
+        x = _as_float(col)
+        lo, hi = BOUNDS.get(name, (None, None))
+        kind = "integer" if name in INT_FIELDS else "number"
+        nan = np.isnan(x)
+        problems.append((nan, f"{name}: Input should be a valid {kind}"))
+        with np.errstate(invalid="ignore"):
+            if name in INT_FIELDS:
+                problems.append((~nan & (x != np.round(x)),
+                                 f"{name}: Input should be a valid integer, "
+                                 "got a number with a fractional part"))
+            if lo is not None:
+                problems.append((~nan & (x < lo),
+                                 f"{name}: Input should be greater than or "
+                                 f"equal to {lo}"))
+            if hi is not None:
+                problems.append((~nan & (x > hi),
+                                 f"{name}: Input should be less than or "
+                                 f"equal to {hi}"))
+        if name in INT_FIELDS:
+            x = np.nan_to_num(x).astype(np.int64)
+        cols[name] = x
+
+    bad = np.zeros(n, dtype=bool)
+    for mask, _ in problems:
+        bad |= mask
+    errors: list[str | None] = [None] * n
+    if bad.any():
+        msgs: dict[int, list[str]] = {}
+        for mask, msg in problems:
+            for i in np.flatnonzero(mask):
+                msgs.setdefault(int(i), []).append(msg)
+        for i, m in msgs.items():
+            errors[i] = "Validation failed: " + "; ".join(m)
+
+    valid = ~bad
+    frame = pd.DataFrame(cols)
+    if bad.any():
+        frame = frame.loc[valid].reset_index(drop=True)
+    ids = None
+    if ID_COL in table.column_names:
+        ids = table.column(ID_COL).cast(pa.string()).combine_chunks()
+    return Validated(frame, valid, errors, ids)
+
+
+def results_table(v: Validated, proba: np.ndarray,
+                  top_names: np.ndarray | None,
+                  row_errors: list[str | None] | None = None) -> pa.Table:
+    """
+    Response table for all input rows; `proba` / `top_names` (n_valid × k
+    strings) cover the valid rows, `row_errors` replaces `v.errors` if given.
+    """
+    n = len(v.valid)
+    errors = row_errors if row_errors is not None else v.errors
+    failed = np.array([e is not None for e in errors], dtype=bool)
+    out_p = np.full(n, np.nan)
+    out_p[v.valid] = proba
+    cols: dict[str, pa.Array] = {}
+    if v.ids is not None:
+        cols[ID_COL] = v.ids
+    cols["churn_probability"] = pa.array(out_p, mask=failed)
+    if top_names is not None:
+        # list<string>, empty + null for failed rows (Parquet can't store
+        # null fixed-size lists)
+        k = top_names.shape[1]
+        lengths = np.where(failed, 0, k)
+        offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int32)
+        ok = ~failed[v.valid]
+        names = np.asarray(top_names, dtype=object)[ok].ravel()
+        values = pa.array(names, pa.string())
+        cols["top_features"] = pa.ListArray.from_arrays(
+            offsets, values, mask=pa.array(failed))
+    cols["error"] = pa.array(errors, pa.string())
+    return pa.table(cols)
+
+
+def write_table(table: pa.Table, kind: str) -> bytes:
+    if kind == ARROW:
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+    if kind == PARQUET:
+        import pyarrow.parquet as pq
+        buf = io.BytesIO()
+        pq.write_table(table, buf)
+        return buf.getvalue()
+    return ndjson_lines(table)
+
+
+def ndjson_lines(table: pa.Table) -> bytes:
+    """One compact JSON object per row, newline-terminated."""
+    if not table.num_rows:
+        return b""
+    rows = (json.dumps(r, separators=(",", ":")) for r in table.to_pylist())
+    return ("\n".join(rows) + "\n").encode()
+
+
+def split_lines(buffer: bytes) -> tuple[bytes, bytes]:
+    """`(complete lines, rest)` of a streamed NDJSON buffer."""
+    cut = buffer.rfind(b"\n") + 1
+    return buffer[:cut], buffer[cut:]
@@ -0,0 +1,320 @@
+"""
+metrics.py
+----------
+In-process counters, gauges and histograms for the scoring API, rendered
+in the Prometheus text exposition format (`GET /metrics`).
+
+Every labelled series is a small object with its own lock, created on
+first use and cached, so recording a value is a dict lookup plus a locked
+add (a histogram adds a `bisect`).  `MetricsMiddleware` is a plain ASGI
+middleware — no per-request Request/Response objects — that times every
+HTTP request, tracks in-flight requests and counts responses by status.
+
+Values are per process: with `uvicorn --workers N` each worker exposes its
+own, so scrape the workers individually (or run one worker per container).
+
+    STAGE_SECONDS.labels("transform").observe(0.0012)
+    with STAGE_SECONDS.labels("predict").time():
+        ...
+    REGISTRY.render()          # text/plain; version=0.0.4
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# seconds: 250 µs … 10 s
+LATENCY_BUCKETS = (0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _fmt(v: float) -> str:
+    v = float(v)
+    if v != v:
+        return "NaN"
+    if v in (float("inf"), float("-inf")):
+        return "+Inf" if v > 0 else "-Inf"
+    return str(int(v)) if v.is_integer() and abs(v) < 1e15 else repr(v)
+
+
+def _label_str(names: tuple[str, ...], values: tuple[str, ...],
+               extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(v: str) -> str:
+    return str(v).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+class _Value:
+    """One counter / gauge series."""
+
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class _HistogramValue:
+    """One histogram series: per-bucket counts (non-cumulative), sum, count."""
+
+    __slots__ = ("buckets", "counts", "sum", "count", "_lock")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last one: > largest bucket
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name, self.help = name, help
+        self.labelnames = tuple(labelnames)
+        self._series: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new(self):
+        return _Value()
+
+    def labels(self, *values: str):
+        """The series for these label values (created on first use)."""
+        series = self._series.get(values)
+        if series is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels "
+                                 f"{self.labelnames}, got {values}")
+            with self._lock:
+                series = self._series.setdefault(values, self._new())
+        return series
+
+    def _samples(self) -> list[str]:
+        return [f"{self.name}{_label_str(self.labelnames, k)} {_fmt(s.value)}"
+                for k, s in sorted(self._series.items())]
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}",
+                f"# TYPE {self.name} {self.kind}",
+                *self._samples()]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = (),
+                 buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new(self):
+        return _HistogramValue(self.buckets)
+
+    def _samples(self) -> list[str]:
+        out = []
+        for k, s in sorted(self._series.items()):
+            with s._lock:
+                counts, total, n = list(s.counts), s.sum, s.count
+            cum = 0
+            for le, c in zip((*self.buckets, float("inf")), counts):
+                cum += c
+                le_label = 'le="' + _fmt(le) + '"'
+                labels = _label_str(self.labelnames, k, le_label)
+                out.append(f"{self.name}_bucket{labels} {cum}")
+            labels = _label_str(self.labelnames, k)
+            out.append(f"{self.name}_sum{labels} {_fmt(total)}")
+            out.append(f"{self.name}_count{labels} {n}")
+        return out
+
+
+# (name, type, help, [(label dict, value), ...]) — computed at scrape time
+Collected = tuple[str, str, str, list[tuple[dict[str, str], float]]]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+        self._collectors: list[Callable[[], Iterable[Collected]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str,
+                labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str,
+              labelnames: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Iterable[str] = (),
+                  buckets: tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def add_collector(self, fn: Callable[[], Iterable[Collected]]) -> None:
+        """
+        `fn()` is called on every scrape, e.g. to export another object's
+        stats.
+        """
+        self._collectors.append(fn)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for m in self._metrics:
+            lines += m.render()
+        for fn in self._collectors:
+            for name, kind, help, samples in fn():
+                lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+                for labels, value in samples:
+                    names, values = tuple(labels), tuple(labels.values())
+                    labels = _label_str(names, values)
+                    lines.append(f"{name}{labels} {_fmt(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# ---- the API's metrics
+REGISTRY = Registry()
+REQUESTS = REGISTRY.counter(
+    "churn_http_requests_total", "HTTP requests by route and status code.",
+    ("route", "status"))
+ERRORS = REGISTRY.counter(
+    "churn_http_errors_total",
+    "Failed HTTP requests by route and reason "
+    "(validation, prediction_failed, too_large, shed, internal).",
+    ("route", "reason"))
+IN_FLIGHT = REGISTRY.gauge(
+    "churn_http_requests_in_flight", "HTTP requests currently being served.",
+    ("route",))
+REQUEST_SECONDS = REGISTRY.histogram(
+    "churn_http_request_seconds", "End-to-end HTTP request latency.",
+    ("route",))
+STAGE_SECONDS = REGISTRY.histogram(
+    "churn_stage_seconds",
+    "Latency of one scoring stage call (queue, validate, transform, "
+    "predict, predict_explain, shap).",
+    ("stage",))
+ROWS = REGISTRY.counter(
+    "churn_rows_total", "Rows received by scoring routes.", ("route",))
+ROWS_SCORED = REGISTRY.counter(
+    "churn_rows_scored_total",
+    "Rows run through the model (cache misses), by explain flag.",
+    ("explain",))
+ROW_ERRORS = REGISTRY.counter(
+    "churn_row_errors_total",
+    "Rows answered with an error inside a 200 batch response.",
+    ("route", "reason"))
+
+SHED = REGISTRY.counter(
+    "churn_shed_total",
+    "Requests answered 503 by admission control, by reason "
+    "(queue_full, deadline).",
+    ("route", "reason"))
+SHADOW_ROWS = REGISTRY.counter(
+    "churn_shadow_rows_total",
+    "Served rows sent to the shadow challenger, by outcome "
+    "(scored, dropped, failed).",
+    ("model", "outcome"))
+SHADOW_ABS_DIFF = REGISTRY.histogram(
+    "churn_shadow_abs_diff",
+    "|challenger - served| churn probability per shadow-scored row.",
+    ("model",), buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5))
+SHADOW_DISAGREEMENTS = REGISTRY.counter(
+    "churn_shadow_disagreements_total",
+    "Shadow-scored rows where challenger and served model fall on "
+    "different sides of 0.5.",
+    ("model",))
+
+_STATUS_REASON = {400: "prediction_failed", 413: "too_large",
+                  422: "validation", 503: "shed"}
+
+
+class MetricsMiddleware:
+    """ASGI middleware: latency, in-flight and status counts per route."""
+
+    def __init__(self, app):
+        self.app = app
+        self._routes: set[str] | None = None
+
+    def _route(self, scope) -> str:
+        if self._routes is None:
+            self._routes = {getattr(r, "path", "")
+                            for r in scope["app"].routes}
+        path = scope["path"]
+        # bounded label values
+        return path if path in self._routes else "other"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        t0 = time.perf_counter()
+        # request.state.t_received
+        scope.setdefault("state", {})["t_received"] = t0
+        route = self._route(scope)
+        status = 500
+
+        async def send_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = IN_FLIGHT.labels(route)
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            in_flight.dec()
+            REQUEST_SECONDS.labels(route).observe(time.perf_counter() - t0)
+            REQUESTS.labels(route, str(status)).inc()
+            if status >= 400:
+                fallback = "internal" if status >= 500 else "client"
+                reason = _STATUS_REASON.get(status, fallback)
+                ERRORS.labels(route, reason).inc()
@@ -0,0 +1,366 @@
+"""
+registry.py
+-----------
+Named model + pipeline versions for the scoring API, which one is
+serving, and an optional shadow challenger.
+
+A registry file (`CHURN_MODEL_REGISTRY`, JSON; paths relative to the repo
+root) names the versions:
+
+    {"serving": "final",
+     "models": {"final": {"model": "models/final/model.pkl",
+                          "pipeline": "models/feature_pipeline_v2.pkl"},
+                "lgbm":  {"model": "models/lgbm_optuna_best.txt",
+                          "pipeline": "models/feature_pipeline_v2.pkl"}},
+     "shadow": {"name": "lgbm", "fraction": 0.05}}
+
+Without one the registry holds a single "default" version built from
+CHURN_MODEL_PATH / CHURN_PIPELINE_PATH.
+
+Serving is a single reference: a request reads `serving` once and scores
+with that `Artifacts` throughout, so a swap never waits on or interrupts
+in-flight requests — they finish on the version they started with.  A
+version is loaded and warmed *before* it is swapped in (`promote`), and
+`check_files` reloads any loaded version whose files changed on disk the
+same way; if the load fails the old version keeps serving.
+
+`ShadowScorer` re-scores a sampled fraction of served rows with a
+challenger on its own thread.  `submit` is a non-blocking queue put (a
+full queue drops the sample), so the challenger never adds latency to a
+response; probability differences and decision disagreements are
+exported as metrics.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from src.api.artifacts import Artifacts, artifact_fingerprint, load_artifacts
+from src.api.metrics import SHADOW_ABS_DIFF, SHADOW_DISAGREEMENTS, SHADOW_ROWS
+
+DECISION_THRESHOLD = 0.5
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    model_path: Path
+    pipe_path: Path
+    explain_backend: str = "native"
+
+    def fingerprint(self) -> str:
+        return artifact_fingerprint(self.model_path, self.pipe_path)
+
+
+class ShadowScorer:
+    """Scores sampled served rows with a challenger `Artifacts`, off-thread."""
+
+    def __init__(self, max_pending: int = 32, seed: int | None = None):
+        self.name: str | None = None
+        self.fraction = 0.0
+        self._art: Artifacts | None = None
+        self._queue: queue.Queue = queue.Queue(max_pending)
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self.scored = self.dropped = self.failed = self.disagreements = 0
+        self.abs_diff_sum = self.max_abs_diff = 0.0
+
+    @property
+    def active(self) -> bool:
+        return self._art is not None and self.fraction > 0
+
+    def configure(self, name: str | None, art: Artifacts | None,
+                  fraction: float) -> None:
+        """Shadow `fraction` of served rows to `art` (None or 0: off)."""
+        if not 0.0 <= fraction <= 1.0:
+            raise ValueError("fraction must be between 0 and 1")
+        with self._lock:
+            if name != self.name:
+                self._reset()
+            self.name, self._art, self.fraction = name, art, fraction
+            if self.active and self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="churn-shadow", daemon=True)
+                self._thread.start()
+
+    def sample(self, n: int) -> np.ndarray:
+        """Positions (of `n` served rows) to shadow-score."""
+        if not self.active:
+            return np.empty(0, dtype=np.intp)
+        return np.flatnonzero(self._rng.random(n) < self.fraction)
+
+    def submit(self, rows: pd.DataFrame | list, proba) -> None:
+        """
+        Queue validated rows (DataFrame or `TelcoInput`s) and the
+        probabilities served for them.
+        """
+        name, art = self.name, self._art
+        if art is None:
+            return
+        served = np.asarray(proba, dtype=np.float64)
+        try:
+            self._queue.put_nowait((name, art, rows, served))
+        except queue.Full:
+            self.dropped += len(served)
+            SHADOW_ROWS.labels(name, "dropped").inc(len(served))
+
+    def _run(self) -> None:
+        while True:
+            name, art, rows, served = self._queue.get()
+            try:
+                frame = rows
+                if not isinstance(rows, pd.DataFrame):
+                    frame = pd.DataFrame([r.model_dump() for r in rows])
+                proba, _ = art.score(art.pipe.transform(frame), explain=False)
+            except Exception as e:
+                log.warning("Shadow scoring with %s failed: %s", name, e)
+                self.failed += len(served)
+                SHADOW_ROWS.labels(name, "failed").inc(len(served))
+            else:
+                diff = np.abs(proba - served)
+                disagree = int(np.count_nonzero(
+                    (proba >= DECISION_THRESHOLD)
+                    != (served >= DECISION_THRESHOLD)))
+                with self._lock:
+                    if name == self.name:
+                        self.scored += len(diff)
+                        self.disagreements += disagree
+                        self.abs_diff_sum += float(diff.sum())
+                        self.max_abs_diff = max(self.max_abs_diff,
+                                                float(diff.max()))
+                SHADOW_ROWS.labels(name, "scored").inc(len(diff))
+                SHADOW_DISAGREEMENTS.labels(name).inc(disagree)
+                hist = SHADOW_ABS_DIFF.labels(name)
+                for d in diff:
+                    hist.observe(float(d))
+            finally:
+                self._queue.task_done()
+
+    def join(self) -> None:
+        """Block until every queued sample has been scored."""
+        self._queue.join()
+
+    def stats(self) -> dict:
+        n = self.scored
+        return {"name": self.name, "fraction": self.fraction, "scored": n,
+                "dropped": self.dropped, "failed": self.failed,
+                "disagreements": self.disagreements,
+                "mean_abs_diff": self.abs_diff_sum / n if n else None,
+                "max_abs_diff": self.max_abs_diff if n else None}
+
+
+class ModelRegistry:
+    """Loaded versions by name, the serving one, and the shadow challenger."""
+
+    def __init__(self, specs: dict[str, ModelSpec], serving: str,
+                 warm_fn: Callable[[Artifacts], None] | None = None,
+                 shadow: dict | None = None):
+        if serving not in specs:
+            raise KeyError(f"Serving model {serving!r} is not in the registry")
+        self.specs = dict(specs)
+        self.serving_name = serving
+        self.shadow = ShadowScorer()
+        self.swaps = 0
+        self._warm_fn = warm_fn
+        self._shadow_cfg = shadow
+        self._loaded: dict[str, Artifacts] = {}
+        self._warm: set[str] = set()
+        # name → (fingerprint, error)
+        self._errors: dict[str, tuple[str, str]] = {}
+        self._serving: Artifacts | None = None
+        # loads and swaps; never for reads
+        self._lock = threading.RLock()
+        self._watcher: threading.Thread | None = None
+
+    @classmethod
+    def from_file(
+        cls, path: str | Path, root: Path, explain_backend: str = "native",
+        warm_fn: Callable[[Artifacts], None] | None = None,
+    ) -> "ModelRegistry":
+        cfg = json.loads(Path(path).read_text())
+        specs = {name: ModelSpec(root / m["model"], root / m["pipeline"],
+                                 m.get("explain_backend", explain_backend))
+                 for name, m in cfg["models"].items()}
+        return cls(specs, cfg.get("serving", next(iter(specs))), warm_fn,
+                   cfg.get("shadow"))
+
+    @property
+    def serving(self) -> Artifacts:
+        """
+        The serving version; the first caller pays its load, concurrent
+        callers wait.
+        """
+        art = self._serving
+        if art is None:
+            with self._lock:
+                if self._serving is None:
+                    self._serving = self.get(self.serving_name)
+                art = self._serving
+        return art
+
+    @property
+    def serving_version(self) -> str:
+        """Version of the serving artifacts, else of its files."""
+        art = self._serving
+        if art is not None:
+            return art.version
+        return self.specs[self.serving_name].fingerprint()
+
+    def get(self, name: str) -> Artifacts:
+        """Version `name`, loaded (not warmed) on first use."""
+        art = self._loaded.get(name)
+        if art is None:
+            with self._lock:
+                art = self._loaded.get(name) or self._load(name)
+        return art
+
+    def _load(self, name: str) -> Artifacts:
+        spec = self.specs[name]
+        try:
+            art = load_artifacts(spec.model_path, spec.pipe_path,
+                                 spec.explain_backend)
+        except Exception as e:
+            self._errors[name] = (spec.fingerprint(), repr(e))
+            raise
+        self._errors.pop(name, None)
+        self._loaded[name] = art
+        self._warm.discard(name)
+        return art
+
+    def warm(self, name: str) -> Artifacts:
+        """Version `name`, loaded and pushed through `warm_fn` once."""
+        art = self.get(name)
+        if name not in self._warm:
+            with self._lock:
+                if name not in self._warm:
+                    if art.explain_backend == "shap":
+                        art.explainer
+                    if self._warm_fn is not None:
+                        self._warm_fn(art)
+                    self._warm.add(name)
+        return art
+
+    def add(self, name: str, art: Artifacts) -> None:
+        """Register already built artifacts (no files to watch) as `name`."""
+        with self._lock:
+            self._loaded[name] = art
+            self._warm.discard(name)
+
+    def load(self, name: str) -> Artifacts:
+        """
+        (Re)load `name` from its files and warm it; swap it in if it serves
+        or shadows.
+        """
+        with self._lock:
+            self._load(name)
+            art = self.warm(name)
+            if name == self.serving_name:
+                self._serving = art
+                self.swaps += 1
+            if name == self.shadow.name:
+                self.shadow.configure(name, art, self.shadow.fraction)
+        log.info("Loaded model %s (%s)", name, art.version)
+        return art
+
+    def promote(self, name: str) -> Artifacts:
+        """Load and warm `name` if needed, then make it the serving version."""
+        with self._lock:
+            art = self.warm(name)
+            self.serving_name, self._serving = name, art
+            self.swaps += 1
+        log.info("Serving model %s (%s)", name, art.version)
+        return art
+
+    def set_shadow(self, name: str | None, fraction: float) -> None:
+        """Shadow-score `fraction` of served rows with `name` (None: off)."""
+        art = self.warm(name) if name is not None else None
+        self.shadow.configure(name, art, fraction if name is not None else 0.0)
+
+    def preload(self, warm: bool = True) -> None:
+        """
+        Load (and warm) every registered version and apply the file's
+        shadow setting.
+        """
+        for name in self.specs:
+            try:
+                self.warm(name) if warm else self.get(name)
+            except Exception:
+                log.exception("Could not load model %s", name)
+        if warm and self._shadow_cfg and self.shadow.name is None:
+            try:
+                cfg = self._shadow_cfg
+                self.set_shadow(cfg["name"], float(cfg.get("fraction", 0)))
+            except Exception:
+                log.exception("Could not start shadow scoring")
+
+    def check_files(self) -> list[str]:
+        """
+        Reload loaded versions whose files changed on disk; returns the
+        names reloaded.
+        """
+        reloaded = []
+        for name, art in list(self._loaded.items()):
+            spec = self.specs.get(name)
+            if spec is None:
+                continue
+            fp = spec.fingerprint()
+            if fp == art.version or self._errors.get(name, ("",))[0] == fp:
+                continue
+            try:
+                self.load(name)
+                reloaded.append(name)
+            except Exception:
+                log.exception("Reloading model %s failed; keeping %s",
+                              name, art.version)
+        return reloaded
+
+    def start_watching(self, interval_s: float) -> None:
+        """Poll the files of loaded versions every `interval_s` seconds."""
+        if self._watcher is not None:
+            return
+
+        def watch():
+            while True:
+                time.sleep(interval_s)
+                try:
+                    self.check_files()
+                except Exception:
+                    log.exception("Model file check failed")
+
+        self._watcher = threading.Thread(target=watch,
+                                         name="churn-model-watch",
+                                         daemon=True)
+        self._watcher.start()
+
+    def stats(self) -> dict:
+        models = {}
+        for name, spec in self.specs.items():
+            art = self._loaded.get(name)
+            models[name] = {
+                "model": str(spec.model_path),
+                "pipeline": str(spec.pipe_path),
+                "loaded": art is not None,
+                "warm": name in self._warm,
+                "version": art.version if art is not None else None,
+                "error": self._errors.get(name, (None, None))[1],
+            }
+        for name in self._loaded.keys() - self.specs.keys():
+            models[name] = {"loaded": True, "warm": name in self._warm,
+                            "version": self._loaded[name].version}
+        return {"serving": self.serving_name, "swaps": self.swaps,
+                "models": models, "shadow": self.shadow.stats()}
@@ -37,3 +37,27 @@ class TelcoInput(BaseModel):
 
     MonthlyCharges: float = Field(ge=0)
     TotalCharges: float = Field(ge=0)
+
+
+# A representative valid payload (startup self-checks / warm-up requests)
+TELCO_EXAMPLE = {
+    "gender": "Female",
+    "SeniorCitizen": 0,
+    "Partner": "Yes",
+    "Dependents": "No",
+    "tenure": 12,
+    "PhoneService": "Yes",
+    "MultipleLines": "No",
+    "InternetService": "Fiber optic",
+    "OnlineSecurity": "No",
+    "OnlineBackup": "Yes",
+    "DeviceProtection": "No",
+    "TechSupport": "No",
+    "StreamingTV": "Yes",
+    "StreamingMovies": "No",
+    "Contract": "Month-to-month",
+    "PaperlessBilling": "Yes",
+    "PaymentMethod": "Electronic check",
+    "MonthlyCharges": 84.5,
+    "TotalCharges": 1010.3,
+}
@@ -0,0 +1,182 @@
+"""
+serve.py · Pre-fork server: load artifacts once, fork the workers
+-----------------------------------------------------------------
+`uvicorn --workers N` spawns fresh interpreters, so every worker imports
+the stack and loads model + pipeline on its own and RSS grows linearly
+with N.  Here the parent imports `src.api.app`, loads the artifacts
+(every registered version, see `src.api.registry`), moves everything it
+allocated into the GC's permanent generation (`gc.freeze()`, so
+collections in the workers never write to those pages) and only then
+forks the workers, which serve on the parent's listening socket.
+Imported modules, the booster and the pipeline stay shared copy-on-write;
+each worker's private memory is what it allocates while serving.
+
+The parent never runs a request: boosters are not warmed up before the
+fork (an OpenMP pool started in the parent can't be used by forked
+children), the usual `/readyz` warm-up runs in each worker.  Workers that
+die are re-forked from the same preloaded parent, after a backoff that
+doubles with each crash in a row (`--restart-backoff`, capped at 30 s); a
+worker that stayed up for `STABLE_S` resets its count.  A worker that
+crashes more than `--max-restarts` times in a row stops the whole server
+with exit status 1, so the process manager sees the failure instead of a
+fork loop.  SIGTERM / SIGINT stop all workers gracefully.
+
+    python -m src.api.serve --workers 4 --host 0.0.0.0 --port 8000
+"""
+
+from __future__ import annotations
+
+import gc
+import logging
+import os
+import signal
+import sys
+import time
+
+import click
+
+log = logging.getLogger(__name__)
+
+STABLE_S = 60.0     # uptime after which a worker's crash count starts over
+MAX_BACKOFF_S = 30.0
+
+
+def preload():
+    """Import the app, load its artifacts (no scoring), freeze the heap."""
+    import src.api.app as api
+
+    t0 = time.perf_counter()
+    art = api.get_artifacts()
+    if art.explain_backend == "shap":
+        art.explainer
+    api.MODELS.preload(warm=False)      # standby versions are shared as well
+    gc.collect()
+    gc.freeze()
+    log.info("Preloaded artifacts in %.2f s; %d objects frozen",
+             time.perf_counter() - t0, gc.get_freeze_count())
+    return api.app
+
+
+def _run_worker(config, sock) -> None:
+    import uvicorn
+
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    code = 0
+    try:
+        uvicorn.Server(config).run(sockets=[sock])
+    except SystemExit as e:             # e.g. uvicorn's startup failure
+        code = e.code if isinstance(e.code, int) else int(e.code is not None)
+    except BaseException:
+        log.exception("Worker %d crashed", os.getpid())
+        code = 1
+    finally:
+        os._exit(code)
+
+
+def restart_delay(crashes: int, backoff: float) -> float:
+    """
+    Seconds to wait before re-forking a worker after its `crashes`-th
+    crash in a row.
+    """
+    return min(backoff * 2 ** (crashes - 1), MAX_BACKOFF_S)
+
+
+def serve(host: str = "127.0.0.1", port: int = 8000, workers: int = 1,
+          log_level: str = "info", max_restarts: int = 5,
+          restart_backoff: float = 1.0) -> int:
+    """Run the pre-fork server until stopped; returns the exit status."""
+    import uvicorn
+
+    app = preload()
+    config = uvicorn.Config(app, host=host, port=port, log_level=log_level)
+    sock = config.bind_socket()
+    children: dict[int, int] = {}                 # pid → slot
+    started: dict[int, float] = {}                # slot → fork time
+    crashes: dict[int, int] = {}                  # slot → crashes in a row
+    due: dict[int, float] = {}                    # slot → when to re-fork it
+    stopping = False
+    code = 0
+
+    def spawn(slot: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            _run_worker(config, sock)
+        children[pid] = slot
+        started[slot] = time.monotonic()
+
+    def stop(signum, _frame) -> None:
+        nonlocal stopping
+        stopping = True
+        due.clear()
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for slot in range(workers):
+        spawn(slot)
+    log.info("Serving on %s:%d with %d forked workers", host, port, workers)
+
+    while children or due:
+        now = time.monotonic()
+        for slot in [s for s, t in due.items() if t <= now]:
+            del due[slot]
+            spawn(slot)
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG if due else 0)
+        except ChildProcessError:
+            if not due:
+                break
+            pid = 0
+        if pid == 0:
+            wait = min(due.values(), default=now) - now
+            time.sleep(min(0.1, max(0.0, wait)))
+            continue
+        slot = children.pop(pid, None)
+        if slot is None or stopping:
+            continue
+        if time.monotonic() - started[slot] >= STABLE_S:
+            crashes[slot] = 0
+        crashes[slot] = crashes.get(slot, 0) + 1
+        exit_code = os.waitstatus_to_exitcode(status)
+        if crashes[slot] > max_restarts:
+            log.error("Worker %d exited (status %d), %d crashes in a row; "
+                      "giving up", pid, exit_code, crashes[slot])
+            code = 1
+            stop(None, None)
+            continue
+        delay = restart_delay(crashes[slot], restart_backoff)
+        log.warning("Worker %d exited (status %d); re-forking in %.1f s",
+                    pid, exit_code, delay)
+        due[slot] = time.monotonic() + delay
+    sock.close()
+    return code
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", default=8000, show_default=True)
+@click.option("--workers", default=int(os.getenv("WEB_CONCURRENCY", "1")),
+              show_default=True,
+              help="Forked worker processes (default: $WEB_CONCURRENCY or 1).")
+@click.option("--log-level", default="info", show_default=True)
+@click.option("--max-restarts", default=5, show_default=True,
+              help="Crashes in a row a worker may have before the server "
+                   "exits with status 1.")
+@click.option("--restart-backoff", default=1.0, show_default=True,
+              help="Seconds before the first re-fork; doubles per crash in "
+                   "a row.")
+def main(host: str, port: int, workers: int, log_level: str, max_restarts: int,
+         restart_backoff: float) -> None:
+    logging.basicConfig(level=log_level.upper(),
+                        format="%(asctime)s %(levelname)s %(message)s")
+    sys.exit(serve(host, port, workers, log_level, max_restarts,
+                   restart_backoff))
+
+
+if __name__ == "__main__":
+    main()
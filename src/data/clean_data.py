@@ -1,14 +1,17 @@
 """
 clean_data.py · Telco Churn data‑cleaning script
 ------------------------------------------------
-1. Read data/raw/*.csv
+1. Read data/raw/*.csv with the declared schema (`src/data/schema.py`):
+     • categorical columns → category with their declared domain; values
+       outside it are counted and logged apart from true nulls, and
+       `--max-out-of-domain` fails the run past a share of rows
+     • tenure → int8, MonthlyCharges / TotalCharges → float32
+     • SeniorCitizen → bool, blank TotalCharges → NaN
 2. Impute missing values:
      • numerical  → column mean
      • categorical → "Unknown"
-3. Cast column types:
-     • TotalCharges → float
-     • SeniorCitizen → bool
-     • every Yes/No column → category
+3. Winsorize numerical columns to the IQR fences (rounded inward to the
+   column's dtype, so int columns stay int)
 4. Save cleaned data to data/clean/telco_clean.parquet
 
 Usage (from project root):
@@ -16,68 +19,311 @@ Usage (from project root):
     python -m src.data.clean_data \
         --input  data/raw/WA_Fn-UseC_-Telco-Customer-Churn.csv \
         --output data/clean/telco_clean.parquet
+
+Streaming mode (`--chunksize N` or `--max-memory-mb M`) never holds the
+whole file: a stats pass collects running means, missing counts and a
+`QuantileSketch` per numeric column, then a transform pass cleans chunk by
+chunk and appends one parquet row group per chunk.  Output matches the
+in-memory path exactly except for winsorizing: each IQR quartile is within
+`--sketch-alpha` (default 0.5 %) relative error of an order statistic next
+to the exact quartile, so clipped values can differ by about that much.
 """
 
 from __future__ import annotations
 
+import logging
+import math
+
 import click
 import numpy as np
 import pandas as pd
 from pathlib import Path
+from typing import Iterator
 from tqdm import tqdm
 
+from src.data import schema
+from src.data.sketch import QuantileSketch
+
+log = logging.getLogger(__name__)
 
-def load_raw(path: Path) -> pd.DataFrame:
-    df = pd.read_csv(path)
 
-    df["TotalCharges"] = pd.to_numeric(
-        df["TotalCharges"].replace(r"^\s*$", pd.NA, regex=True), errors="coerce"
-    )
+def _has_dtype(s: pd.Series, dtype) -> bool:
+    """
+    `s.dtype == dtype`, except that categories must also be in the declared
+    order (unordered CategoricalDtypes compare equal whatever their order,
+    but the order fixes the codes the native encodings see).
+    """
+    if isinstance(dtype, pd.CategoricalDtype):
+        return (isinstance(s.dtype, pd.CategoricalDtype)
+                and s.cat.categories.tolist() == dtype.categories.tolist())
+    return s.dtype == dtype
+
 
-    df["SeniorCitizen"] = df["SeniorCitizen"].astype("bool")
+def coerce_raw(df: pd.DataFrame,
+               out_of_domain: dict[str, int] | None = None) -> pd.DataFrame:
+    """
+    Cast a raw frame to the declared dtypes.  Categorical values outside
+    their declared domain become missing (→ "Unknown" in `impute`); their
+    counts per column are added to `out_of_domain` when given.
+    """
+    dtypes = schema.read_dtypes()
+    for col in df.columns.intersection(list(dtypes)):
+        if _has_dtype(df[col], dtypes[col]):
+            continue
+        if col in schema.NUMERIC and df[col].dtype == object:
+            blank = df[col].replace(r"^\s*$", np.nan, regex=True)
+            df[col] = pd.to_numeric(blank, errors="coerce")
+        if (isinstance(df[col].dtype, pd.CategoricalDtype)
+                and col in schema.CATEGORIES):
+            # astype is a no-op between "equal" categoricals: reorder
+            # explicitly
+            cast = df[col].cat.set_categories(dtypes[col].categories)
+        else:
+            cast = df[col].astype(dtypes[col])
+        if out_of_domain is not None and col in schema.CATEGORIES:
+            n = int((df[col].notna() & cast.isna()).sum())
+            out_of_domain[col] = out_of_domain.get(col, 0) + n
+        df[col] = cast
+    for col in schema.BOOL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("bool")
     return df
 
 
-def impute(df: pd.DataFrame) -> pd.DataFrame:
-    num_cols = df.select_dtypes(include="number").columns
-    cat_cols = df.select_dtypes(exclude="number").columns
+def load_raw(path: Path,
+             out_of_domain: dict[str, int] | None = None) -> pd.DataFrame:
+    return coerce_raw(schema.read_csv(path), out_of_domain)
 
-    for col in num_cols:
-        if df[col].isna().any():
-            mean_val = df[col].mean()
-            df[col].fillna(mean_val, inplace=True)
 
-    for col in cat_cols:
-        if df[col].isna().any():
-            df[col].fillna("Unknown", inplace=True)
-    return df
+def report_out_of_domain(counts: dict[str, int], n_rows: int,
+                         max_fraction: float | None = None) -> None:
+    """
+    Log the out-of-domain counts from `coerce_raw`; raise ValueError if a
+    column's share of rows exceeds `max_fraction`.
+    """
+    for col, n in counts.items():
+        if n:
+            log.warning("%s: %d value(s) outside the declared domain, "
+                        "imputed as 'Unknown'", col, n)
+    if max_fraction is None or not n_rows:
+        return
+    over = {c: n for c, n in counts.items() if n / n_rows > max_fraction}
+    if over:
+        raise ValueError(f"Out-of-domain values above {max_fraction:.2%} "
+                         f"of {n_rows} rows: {over}")
 
 
-YES_NO = {"Yes", "No"}
+def _is_nullable_int(s: pd.Series) -> bool:
+    return (isinstance(s.dtype, pd.api.extensions.ExtensionDtype)
+            and s.dtype.kind in "iu")
 
 
-def cast_yes_no(df: pd.DataFrame) -> pd.DataFrame:
-    for col in df.columns:
-        uniq = set(df[col].dropna().unique())
-        if uniq <= YES_NO:
-            df[col] = df[col].astype("category")
+def impute(df: pd.DataFrame,
+           means: dict[str, float] | None = None) -> pd.DataFrame:
+    """
+    Fill numeric gaps with the column mean (or `means[col]`), the rest with
+    "Unknown" — one `fillna` over all columns.  Int columns with gaps become
+    float32, gap-free nullable ints go back to plain NumPy ints.
+    """
+    num_cols = df.select_dtypes(include="number").columns
+    has_na = df.isna().any()
+    fill: dict[str, object] = {}
+    for col in has_na.index[has_na]:
+        if col in num_cols:
+            if _is_nullable_int(df[col]):
+                df[col] = df[col].astype("float32")
+            fill[col] = df[col].mean() if means is None else means[col]
+        else:
+            if (isinstance(df[col].dtype, pd.CategoricalDtype)
+                    and "Unknown" not in df[col].cat.categories):
+                df[col] = df[col].cat.add_categories("Unknown")
+            fill[col] = "Unknown"
+    if fill:
+        df = df.fillna(fill)
+    for col in num_cols:
+        if _is_nullable_int(df[col]):
+            df[col] = df[col].astype(df[col].dtype.numpy_dtype)
     return df
 
 
-def winsorize_iqr(df: pd.DataFrame, factor: float = 1.5) -> pd.DataFrame:
+def iqr_fences(q1: float, q3: float,
+               factor: float = 1.5) -> tuple[float, float]:
+    iqr = q3 - q1
+    return q1 - factor * iqr, q3 + factor * iqr
+
+
+def _inward(low: float, high: float, dtype: np.dtype) -> tuple:
+    """
+    Fences representable in `dtype`, rounded inward so clipped values stay
+    within them.
+    """
+    if dtype.kind in "iu":
+        info = np.iinfo(dtype)
+        return max(math.ceil(low), info.min), min(math.floor(high), info.max)
+    if dtype == np.float32:
+        lo, hi = np.float32(low), np.float32(high)
+        if lo < low:
+            lo = np.nextafter(lo, np.float32(np.inf))
+        if hi > high:
+            hi = np.nextafter(hi, np.float32(-np.inf))
+        return lo, hi
+    return low, high
+
+
+def winsorize_iqr(
+    df: pd.DataFrame,
+    factor: float = 1.5,
+    fences: dict[str, tuple[float, float]] | None = None,
+) -> pd.DataFrame:
     """
     Clip numerical columns to the IQR-based fences:
     [Q1 - factor·IQR, Q3 + factor·IQR]
+    (or to precomputed `fences[col]`)
     """
     num_cols = df.select_dtypes(include=["number"]).columns
+    if fences is None:
+        q = df[num_cols].quantile([0.25, 0.75])
+        fences = {c: iqr_fences(q.at[0.25, c], q.at[0.75, c], factor)
+                  for c in num_cols}
     for col in num_cols:
-        q1, q3 = df[col].quantile([0.25, 0.75])
-        iqr = q3 - q1
-        low, high = q1 - factor * iqr, q3 + factor * iqr
-        df[col] = df[col].clip(lower=low, upper=high)
+        low, high = fences[col]
+        if np.isnan(low) or np.isnan(high):
+            continue
+        df[col] = df[col].clip(*_inward(low, high, df[col].dtype))
     return df
 
 
+# ---------------------------------------------------------------- streaming
+def iter_raw(
+    path: Path, chunksize: int, out_of_domain: dict[str, int] | None = None
+) -> Iterator[pd.DataFrame]:
+    kwargs = schema.read_csv_kwargs()
+    for chunk in pd.read_csv(path, chunksize=chunksize, **kwargs):
+        yield coerce_raw(chunk, out_of_domain)
+
+
+def chunksize_for(path: Path, max_memory_mb: float,
+                  sample_rows: int = 1000) -> int:
+    """
+    Rows per chunk that keep a chunk's working set under `max_memory_mb`.
+    A chunk is alive roughly 4× at peak (raw, imputed copy, arrow table,
+    parquet buffer); the bytes per row come from the first `sample_rows`.
+    """
+    sample = next(iter_raw(path, sample_rows))
+    sample_bytes = sample.memory_usage(deep=True, index=False).sum()
+    row_bytes = sample_bytes / max(len(sample), 1)
+    return max(1_000, int(max_memory_mb * 2**20 / (4 * row_bytes)))
+
+
+class CleanStats:
+    """Everything `impute` / `winsorize_iqr` need, gathered chunk by chunk."""
+
+    def __init__(self, alpha: float = 0.005):
+        self.alpha = alpha
+        self.n_rows = 0
+        self.sums: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+        self.n_missing: dict[str, int] = {}
+        self.out_of_domain: dict[str, int] = {}    # filled by `coerce_raw`
+        self.dtypes: dict[str, np.dtype] = {}
+        self.sketches: dict[str, QuantileSketch] = {}
+        self.columns: list[str] = []
+
+    def update(self, df: pd.DataFrame) -> None:
+        if not self.columns:
+            self.columns = list(df.columns)
+        self.n_rows += len(df)
+        for col, n in df.isna().sum().items():
+            self.n_missing[col] = self.n_missing.get(col, 0) + int(n)
+        for col in df.select_dtypes(include="number").columns:
+            s = df[col]
+            self.sums[col] = self.sums.get(col, 0.0) + float(s.sum())
+            self.counts[col] = self.counts.get(col, 0) + int(s.notna().sum())
+            dt = getattr(s.dtype, "numpy_dtype", s.dtype)
+            self.dtypes[col] = np.result_type(self.dtypes.get(col, dt), dt)
+            self.sketches.setdefault(col, QuantileSketch(self.alpha)).add(
+                s.to_numpy(dtype="float64", na_value=np.nan))
+
+    @property
+    def means(self) -> dict[str, float]:
+        return {c: self.sums[c] / self.counts[c] if self.counts[c] else np.nan
+                for c in self.sums}
+
+    def fences(self, factor: float = 1.5) -> dict[str, tuple[float, float]]:
+        """
+        IQR fences of the imputed columns (gaps count as the mean, as in
+        `impute`).
+        """
+        out = {}
+        means = self.means
+        for col, sk in self.sketches.items():
+            if self.n_missing[col]:
+                sk = QuantileSketch(self.alpha).merge(sk)
+                sk.add([means[col]], weight=self.n_missing[col])
+            out[col] = iqr_fences(sk.quantile(0.25), sk.quantile(0.75), factor)
+        return out
+
+    def output_dtypes(self) -> dict[str, object]:
+        """
+        Dtypes the in-memory path would produce, so every row group shares
+        one schema.
+        """
+        out: dict[str, object] = {}
+        for col in self.columns:
+            missing = self.n_missing[col] > 0
+            if col in schema.CATEGORIES:
+                cats = schema.CATEGORIES[col] + ["Unknown"] * missing
+                out[col] = pd.CategoricalDtype(cats)
+            elif col in self.dtypes:
+                dt = self.dtypes[col]
+                if dt.kind in "iu" and missing:
+                    dt = np.dtype("float32" if col in schema.NUMERIC
+                                  else "float64")
+                out[col] = dt
+        return out
+
+
+def collect_stats(path: Path, chunksize: int,
+                  alpha: float = 0.005) -> CleanStats:
+    stats = CleanStats(alpha)
+    chunks = iter_raw(path, chunksize, stats.out_of_domain)
+    for chunk in tqdm(chunks, desc="stats pass", unit="chunk"):
+        stats.update(chunk)
+    return stats
+
+
+def clean_streaming(
+    inp: Path, outp: Path, chunksize: int, factor: float = 1.5,
+    alpha: float = 0.005, max_out_of_domain: float | None = None,
+) -> tuple[int, int]:
+    """Two-pass chunked clean of `inp` into `outp`; returns the shape."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    stats = collect_stats(inp, chunksize, alpha)
+    report_out_of_domain(stats.out_of_domain, stats.n_rows, max_out_of_domain)
+    means, fences = stats.means, stats.fences(factor)
+    dtypes = stats.output_dtypes()
+
+    writer = None
+    try:
+        for chunk in tqdm(iter_raw(inp, chunksize), desc="transform pass",
+                          unit="chunk"):
+            df = winsorize_iqr(impute(chunk, means), factor, fences)
+            df = df.astype(dtypes)
+            if writer is None:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                writer = pq.ParquetWriter(outp, table.schema)
+            else:
+                table = pa.Table.from_pandas(df, schema=writer.schema,
+                                             preserve_index=False)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return stats.n_rows, len(stats.columns)
+
+
 @click.command()
 @click.option(
     "--input",
@@ -91,7 +337,19 @@ def winsorize_iqr(df: pd.DataFrame, factor: float = 1.5) -> pd.DataFrame:
     type=click.Path(dir_okay=False),
     default="data/clean/telco_clean.parquet",
 )
-def main(input: str, output: str) -> None:
+@click.option("--chunksize", type=int, default=None,
+              help="Stream the file in chunks of this many rows.")
+@click.option("--max-memory-mb", type=float, default=None,
+              help="Stream with chunks sized to stay under this budget.")
+@click.option("--sketch-alpha", type=float, default=0.005, show_default=True,
+              help="Relative error of the streaming IQR quartiles.")
+@click.option("--max-out-of-domain", type=float, default=None,
+              help="Fail if a column has more than this share of rows "
+                   "outside its declared categories (default: only log "
+                   "them).")
+def main(input: str, output: str, chunksize: int | None = None,
+         max_memory_mb: float | None = None, sketch_alpha: float = 0.005,
+         max_out_of_domain: float | None = None) -> None:
     inp = Path(input).resolve()
     outp = Path(output).resolve()
     outp.parent.mkdir(parents=True, exist_ok=True)
@@ -102,15 +360,23 @@ def main(input: str, output: str) -> None:
         except ValueError:
             return p
 
+    if chunksize or max_memory_mb:
+        chunksize = chunksize or chunksize_for(inp, max_memory_mb)
+        print(f"📥  Streaming {rel(inp)} in chunks of {chunksize:,} rows")
+        shape = clean_streaming(inp, outp, chunksize, alpha=sketch_alpha,
+                                max_out_of_domain=max_out_of_domain)
+        print(f"💾  Wrote {rel(outp)}")
+        print("✅  Done. Clean shape:", shape)
+        return
+
     print(f"📥  Reading {rel(inp)}")
-    df = load_raw(inp)
+    out_of_domain: dict[str, int] = {}
+    df = load_raw(inp, out_of_domain)
+    report_out_of_domain(out_of_domain, len(df), max_out_of_domain)
 
     print("🧹  Imputing missing values …")
     df = impute(df)
 
-    print("🔖  Casting Yes/No columns …")
-    df = cast_yes_no(df)
-
     print("✂️  Winsorizing numerical outliers …")
     df = winsorize_iqr(df)
 
@@ -0,0 +1,134 @@
+"""
+schema.py · Declared raw Telco schema
+-------------------------------------
+Column domains and numeric widths for the raw extract, derived from the
+API contract `src.api.schemas.TelcoInput` so cleaning, training and
+serving agree on one definition:
+
+  • Literal fields              → category with the declared categories
+  • int fields with ge/le       → smallest int dtype holding the bounds
+  • float fields                → float32
+  • SeniorCitizen (0/1 flag)    → bool
+  • Churn                       → Yes/No category (customerID stays str)
+
+    read_csv(path)                                   # whole file, pyarrow
+    pd.read_csv(path, chunksize=n, **read_csv_kwargs())  # chunked, pandas
+
+fix every dtype while parsing, instead of inferring object/int64/float64
+and casting afterwards.  Categoricals parse with whatever values the file
+has; `src.data.clean_data.coerce_raw` then applies the declared domain and
+counts what falls outside it.  Numbers that don't fit the declared width
+fail the parse.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Literal, get_args, get_origin
+
+import numpy as np
+import pandas as pd
+
+from src.api.schemas import TelcoInput
+
+ID_COL = "customerID"
+TARGET = "Churn"
+BOOL_COLUMNS = ["SeniorCitizen"]
+NA_VALUES = ["", " "]           # blank TotalCharges for new customers
+
+
+def _int_dtype(lo: int, hi: int) -> np.dtype:
+    for dt in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dt)
+        if info.min <= lo and hi <= info.max:
+            return np.dtype(dt)
+    return np.dtype(np.int64)
+
+
+def telco_domains() -> dict[str, tuple]:
+    """Literal choices per categorical field of TelcoInput."""
+    out = {}
+    for name, field in TelcoInput.model_fields.items():
+        if get_origin(field.annotation) is Literal:
+            out[name] = get_args(field.annotation)
+    return out
+
+
+def _bounds(field) -> tuple[float | None, float | None]:
+    lo = hi = None
+    for m in field.metadata:
+        lo = getattr(m, "ge", lo)
+        hi = getattr(m, "le", hi)
+    return lo, hi
+
+
+CATEGORIES: dict[str, list[str]] = {
+    **{name: sorted(choices) for name, choices in telco_domains().items()},
+    TARGET: ["No", "Yes"],
+}
+NUMERIC: dict[str, np.dtype] = {}
+# Field(ge=, le=) per numeric
+BOUNDS: dict[str, tuple[float | None, float | None]] = {}
+for _name, _field in TelcoInput.model_fields.items():
+    if _field.annotation in (int, float):
+        BOUNDS[_name] = _bounds(_field)
+    if _field.annotation is int:
+        _lo, _hi = _bounds(_field)
+        NUMERIC[_name] = (_int_dtype(_lo, _hi)
+                          if _lo is not None and _hi is not None
+                          else np.dtype(np.int64))
+    elif _field.annotation is float:
+        NUMERIC[_name] = np.dtype(np.float32)
+
+
+def read_dtypes() -> dict[str, object]:
+    """
+    `dtype=` mapping for `pd.read_csv`; ints are nullable so gaps survive
+    parsing.
+    """
+    dtypes: dict[str, object] = {c: pd.CategoricalDtype(cats)
+                                 for c, cats in CATEGORIES.items()}
+    for c, dt in NUMERIC.items():
+        if dt.kind == "i":
+            dt = pd.api.types.pandas_dtype(dt.name.capitalize())
+        dtypes[c] = dt
+    return dtypes
+
+
+def read_csv_kwargs() -> dict[str, object]:
+    """
+    Chunked `pd.read_csv` kwargs; categoricals stay undeclared so
+    `coerce_raw` sees strays.
+    """
+    dtypes = {c: "category" if c in CATEGORIES else dt
+              for c, dt in read_dtypes().items()}
+    return {"dtype": dtypes, "na_values": NA_VALUES, "keep_default_na": False}
+
+
+def is_declared_int(col: str) -> bool:
+    return col in NUMERIC and NUMERIC[col].kind == "i"
+
+
+def read_csv(path: str | Path, block_size: int = 16 << 20) -> pd.DataFrame:
+    """
+    Parse a raw CSV with pyarrow straight into the declared dtypes.
+    Categorical columns are dictionary-encoded block by block, so only one
+    `block_size` slice of text is held as strings at a time; their domains
+    are applied by `coerce_raw`.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pv
+
+    types = {c: pa.dictionary(pa.int32(), pa.string()) for c in CATEGORIES}
+    types.update({c: pa.from_numpy_dtype(dt) for c, dt in NUMERIC.items()})
+    reader = pv.open_csv(
+        path,
+        read_options=pv.ReadOptions(block_size=block_size),
+        convert_options=pv.ConvertOptions(
+            column_types=types, null_values=NA_VALUES, strings_can_be_null=True
+        ),
+    )
+    nullable = {pa.from_numpy_dtype(dt): read_dtypes()[c]
+                for c, dt in NUMERIC.items() if dt.kind == "i"}
+    return reader.read_all().to_pandas(self_destruct=True, split_blocks=True,
+                                       types_mapper=nullable.get)
@@ -0,0 +1,92 @@
+"""
+sketch.py · Mergeable quantile sketch
+-------------------------------------
+A small DDSketch-style sketch: values are counted in logarithmic buckets
+of width `gamma = (1 + alpha) / (1 - alpha)`, so any quantile is returned
+within a relative error `alpha` of the matching order statistic, memory is
+bounded by the value range (not the row count) and two sketches merge by
+adding bucket counts.  Used by the streaming mode of `clean_data.py` to
+get IQR fences without holding a column in memory.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import Counter
+
+import numpy as np
+
+
+class QuantileSketch:
+    """Relative-error quantile sketch with exact min / max / count."""
+
+    def __init__(self, alpha: float = 0.005, min_value: float = 1e-9):
+        if not 0 < alpha < 1:
+            raise ValueError("alpha must be in (0, 1)")
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.pos: Counter[int] = Counter()
+        self.neg: Counter[int] = Counter()
+        self.zero = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _bucket(self, x: np.ndarray) -> np.ndarray:
+        return np.ceil(np.log(x) / self._log_gamma).astype(np.int64)
+
+    def _value(self, i: int) -> float:
+        return 2 * self.gamma ** i / (self.gamma + 1)
+
+    def add(self, values, weight: int = 1) -> None:
+        """Add values (NaNs ignored), each counted `weight` times."""
+        x = np.asarray(values, dtype=float).ravel()
+        x = x[~np.isnan(x)]
+        if x.size == 0 or weight <= 0:
+            return
+        self.count += x.size * weight
+        self.min = min(self.min, float(x.min()))
+        self.max = max(self.max, float(x.max()))
+        small = np.abs(x) < self.min_value
+        self.zero += int(small.sum()) * weight
+        pos, neg = x[x >= self.min_value], -x[x <= -self.min_value]
+        for store, part in ((self.pos, pos), (self.neg, neg)):
+            if part.size:
+                idx, cnt = np.unique(self._bucket(part), return_counts=True)
+                store.update({int(i): int(c) * weight
+                              for i, c in zip(idx, cnt)})
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if other.gamma != self.gamma:
+            raise ValueError("can only merge sketches with the same alpha")
+        self.pos.update(other.pos)
+        self.neg.update(other.neg)
+        self.zero += other.zero
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q: float) -> float:
+        """Value at rank `q · (count - 1)`, within relative error `alpha`."""
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = 0
+        for i in sorted(self.neg, reverse=True):
+            seen += self.neg[i]
+            if seen > rank:
+                return max(-self._value(i), self.min)
+        seen += self.zero
+        if seen > rank:
+            return 0.0
+        for i in sorted(self.pos):
+            seen += self.pos[i]
+            if seen > rank:
+                return min(self._value(i), self.max)
+        return self.max
+
+    def __len__(self) -> int:
+        return len(self.pos) + len(self.neg) + (self.zero > 0)
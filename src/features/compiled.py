@@ -0,0 +1,174 @@
+"""
+compiled.py
+-----------
+"Compile" a fitted `AddDerivedFeatures ➜ ColumnTransformer` pipeline into a
+pure-NumPy encoder for single rows.
+
+`PIPE.transform` on one customer spends most of its time in pandas/sklearn
+dispatch (DataFrame copy, `pd.cut`, ColumnTransformer bookkeeping).  The
+compiled encoder reads the fitted constants once — scaler mean/scale,
+KBins edges, one-hot category → column lookups — and maps a validated
+`TelcoInput` (or any mapping with the same keys) straight to the output
+vector, matching `PIPE.transform` column for column.
+
+    enc = compile_pipeline(joblib.load("models/feature_pipeline_v2.pkl"))
+    x = enc.transform_one(req.data)          # 1-D float64 vector
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Mapping
+from typing import Any, Iterable
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline as SkPipeline
+from sklearn.preprocessing import (
+    KBinsDiscretizer,
+    OneHotEncoder,
+    StandardScaler,
+)
+
+from .transformers import TENURE_BINS, TENURE_LABELS, AddDerivedFeatures
+
+_TENURE_INNER = [float(b) for b in TENURE_BINS[1:-1]]
+
+
+def _derive(row: Mapping[str, Any]) -> dict[str, Any]:
+    """Scalar twin of `AddDerivedFeatures.transform` for a single row."""
+    tenure = row["tenure"]
+    if tenure >= TENURE_BINS[0]:
+        bucket = TENURE_LABELS[bisect_right(_TENURE_INNER, tenure)]
+    else:
+        bucket = None                                 # pd.cut → NaN → unknown
+    return {
+        **row,
+        "Is_MonthToMonth": row["Contract"] == "Month-to-month",
+        "AvgMonthlySpend": row["TotalCharges"] / (tenure + 1),
+        "TenureBucket": bucket,
+    }
+
+
+def _only_step(t):
+    """Unwrap the single-step Pipelines used inside the ColumnTransformer."""
+    if isinstance(t, SkPipeline):
+        if len(t.steps) != 1:
+            raise TypeError(f"Cannot compile multi-step sub-pipeline {t}")
+        return t.steps[0][1]
+    return t
+
+
+class CompiledEncoder:
+    """Pure-NumPy replica of a fitted feature pipeline (1-row fast path)."""
+
+    def __init__(self, pipe: SkPipeline):
+        steps = dict(pipe.steps)
+        if not isinstance(steps.get("derive"), AddDerivedFeatures):
+            raise TypeError("Pipeline has no fitted 'derive' step")
+        pre = steps.get("pre")
+        if not isinstance(pre, ColumnTransformer):
+            raise TypeError("Pipeline has no fitted 'pre' ColumnTransformer")
+
+        self.feature_names = pre.get_feature_names_out()
+        self.n_features_out = len(self.feature_names)
+        self.sparse_output = bool(getattr(pre, "sparse_output_", False))
+
+        # (columns, mean, scale, out_slice)
+        self._scalers: list[
+            tuple[list[str], np.ndarray, np.ndarray, slice]
+        ] = []
+        # (column, inner_edges, first_out_col)
+        self._bins: list[tuple[str, list[float], int]] = []
+        # (column, {category: out_col | -1 for dropped}, raise_on_unknown)
+        self._cats: list[tuple[str, dict, bool]] = []
+
+        for name, trans, cols in pre.transformers_:
+            if name == "remainder" or trans == "drop":
+                continue
+            est = _only_step(trans)
+            out = pre.output_indices_[name]
+            cols = list(cols)
+
+            if isinstance(est, StandardScaler):
+                n = len(cols)
+                mean = est.mean_ if est.with_mean else np.zeros(n)
+                scale = est.scale_ if est.with_std else np.ones(n)
+                self._scalers.append((cols, np.asarray(mean, float),
+                                      np.asarray(scale, float), out))
+
+            elif isinstance(est, KBinsDiscretizer):
+                if est.encode not in ("onehot", "onehot-dense"):
+                    raise TypeError("Cannot compile KBinsDiscretizer"
+                                    f"(encode={est.encode!r})")
+                start = out.start
+                for col, edges, n_bins in zip(cols, est.bin_edges_,
+                                              est.n_bins_):
+                    inner = [float(e) for e in edges[1:-1]]
+                    self._bins.append((col, inner, start))
+                    start += int(n_bins)
+
+            elif isinstance(est, OneHotEncoder):
+                infrequent = getattr(est, "infrequent_categories_", [])
+                if any(c is not None for c in infrequent):
+                    raise TypeError("Cannot compile OneHotEncoder with "
+                                    "infrequent categories")
+                drop_idx = est.drop_idx_
+                if drop_idx is None:
+                    drop_idx = [None] * len(cols)
+                col_out = out.start
+                for col, cats, drop in zip(cols, est.categories_, drop_idx):
+                    lut = {}
+                    for k, cat in enumerate(cats):
+                        if drop is not None and k == drop:
+                            lut[cat] = -1
+                        else:
+                            lut[cat] = col_out
+                            col_out += 1
+                    strict = est.handle_unknown == "error"
+                    self._cats.append((col, lut, strict))
+
+            else:
+                raise TypeError("Cannot compile transformer "
+                                f"{type(est).__name__}")
+
+    def transform_one(self, row: Mapping[str, Any] | Any) -> np.ndarray:
+        """Encode one validated row (mapping or pydantic model) → 1-D."""
+        if not isinstance(row, Mapping):
+            row = row.__dict__                        # pydantic field values
+        vals = _derive(row)
+        x = np.zeros(self.n_features_out)
+
+        for cols, mean, scale, out in self._scalers:
+            v = np.array([vals[c] for c in cols], dtype=float)
+            x[out] = (v - mean) / scale
+
+        for col, edges, start in self._bins:
+            x[start + bisect_right(edges, vals[col])] = 1.0
+
+        for col, lut, strict in self._cats:
+            j = lut.get(vals[col])
+            if j is None:
+                if strict:
+                    raise ValueError(f"Found unknown category {vals[col]!r} "
+                                     f"in column {col!r}")
+            elif j >= 0:
+                x[j] = 1.0
+        return x
+
+    def transform(
+        self, rows: Iterable[Mapping[str, Any] | Any]
+    ) -> np.ndarray | sp.csr_matrix:
+        """
+        Encode several rows → 2-D array (row-wise loop; use PIPE for big
+        batches), CSR like the pipeline's own output if it was built with
+        encoding="sparse".
+        """
+        X = np.vstack([self.transform_one(r) for r in rows])
+        return sp.csr_matrix(X) if self.sparse_output else X
+
+
+def compile_pipeline(pipe: SkPipeline) -> CompiledEncoder:
+    """Return a `CompiledEncoder` for a fitted feature pipeline."""
+    return CompiledEncoder(pipe)
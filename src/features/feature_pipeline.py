@@ -4,54 +4,101 @@ Numeric → StandardScaler
 AvgMonthlySpend → KBinsDiscretizer(4, quantile) → one‑hot
 Low‑card Cats (+ TenureBucket, Is_MonthToMonth) → OneHotEncoder(drop='first')
 Pipeline = AddDerivedFeatures  ➜  ColumnTransformer
+
+encoding="native" (for LightGBM / XGBoost): numerics unscaled (float64),
+AvgMonthlySpend → one ordinal bin column, every categorical → one
+OrdinalEncoder code column (unknown → NaN); `categorical_features(pipe)`
+gives their output indices for the boosters' categorical support.
+
+encoding="sparse": the one-hot layout as a scipy CSR matrix (one-hot bins
+and categoricals stay sparse end to end), for wide high-cardinality
+categoricals (`feature_lists.categorical_high_card`).
+
+Large builds: `fit_columnwise` fits like `pipe.fit` without stacking the
+transformed matrix, `transform_chunked` transforms in row chunks into one
+preallocated (optionally float32, optionally memory-mapped) array.
 """
 
 from __future__ import annotations
+import warnings
 from pathlib import Path
 from typing import List, Tuple
 
 import joblib
+import numpy as np
 import pandas as pd
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline as SkPipeline
-from sklearn.preprocessing import (KBinsDiscretizer, OneHotEncoder,
-                                   StandardScaler)
+from sklearn.preprocessing import (
+    FunctionTransformer,
+    KBinsDiscretizer,
+    OneHotEncoder,
+    OrdinalEncoder,
+    StandardScaler,
+)
 
 from . import feature_lists as fl
 from .transformers import AddDerivedFeatures
 
+ENCODINGS = ("onehot", "native", "sparse")
+
 
 def build_preprocessor(
     num_cols: List[str] = fl.numeric_features,
     cat_cols: List[str] = fl.categorical_low_card,
+    encoding: str = "onehot",
+    high_card_cols: List[str] = fl.categorical_high_card,
 ) -> Tuple[SkPipeline, List[str]]:
     """Return `(full_pipeline, feature_names)` ready for fit/transform."""
+    if encoding not in ENCODINGS:
+        raise ValueError(f"encoding must be one of {ENCODINGS}, "
+                         f"got {encoding!r}")
+    native, sparse = encoding == "native", encoding == "sparse"
 
     # ─────────────────────────────── transformers ──────────────────────────────
-    numeric_t = SkPipeline([("scaler", StandardScaler())])
-
+    if native:               # trees are scale-free: just a float64 cast
+        numeric_t = SkPipeline([("float", FunctionTransformer(
+            np.asarray, kw_args={"dtype": np.float64},
+            feature_names_out="one-to-one"))])
+    else:
+        numeric_t = SkPipeline([("scaler", StandardScaler())])
+
+    bins_encode = ("ordinal" if native else "onehot" if sparse
+                   else "onehot-dense")
     bins_t = SkPipeline([
         (
             "kbins",
-            KBinsDiscretizer(n_bins=4, encode="onehot-dense", strategy="quantile"),
+            KBinsDiscretizer(n_bins=4, strategy="quantile",
+                             encode=bins_encode),
         )
     ])
 
-    cat_t = SkPipeline(
-        [
+    if native:
+        cat_t = SkPipeline([
             (
-                "ohe",
-                OneHotEncoder(
-                    drop="first", sparse_output=False, handle_unknown="ignore"
-                ),
+                "ord",
+                OrdinalEncoder(handle_unknown="use_encoded_value",
+                               unknown_value=np.nan,
+                               encoded_missing_value=np.nan),
             )
-        ]
-    )
+        ])
+    else:
+        cat_t = SkPipeline(
+            [
+                (
+                    "ohe",
+                    OneHotEncoder(
+                        drop="first", sparse_output=sparse,
+                        handle_unknown="ignore",
+                    ),
+                )
+            ]
+        )
 
     # ────────────────────────────── column lists ───────────────────────────────
     bin_cols = ["AvgMonthlySpend"]                       # 派生后再分箱
     extra_cat = ["TenureBucket", "Is_MonthToMonth"]     # 新增派生类别列
-    all_cat_cols = cat_cols + extra_cat
+    all_cat_cols = cat_cols + high_card_cols + extra_cat
 
     pre = ColumnTransformer(
         [
@@ -60,6 +107,8 @@ def build_preprocessor(
             ("cat", cat_t, all_cat_cols),
         ],
         remainder="drop",
+        # always CSR / always dense
+        sparse_threshold=1.0 if sparse else 0.0,
         verbose_feature_names_out=False,
     )
 
@@ -77,10 +126,87 @@ def build_preprocessor(
     return pipe, feature_names
 
 
+def categorical_features(pipe: SkPipeline) -> List[int]:
+    """Output indices of ordinal-coded categoricals (empty for one-hot)."""
+    pre = pipe.named_steps["pre"]
+    cat_t = pre.named_transformers_["cat"]
+    if not isinstance(cat_t.steps[-1][1], OrdinalEncoder):
+        return []
+    cat = pre.output_indices_["cat"]
+    return list(range(cat.start, cat.stop))
+
+
+def fit_columnwise(pipe: SkPipeline, X: pd.DataFrame, y=None,
+                   probe_rows: int = 1000) -> SkPipeline:
+    """
+    Same fitted state as `pipe.fit(X, y)`, without its peak memory:
+    `ColumnTransformer.fit` is a `fit_transform` that stacks every block of
+    the full matrix in float64.  The ColumnTransformer is fitted on the
+    first `probe_rows` rows, then each of its fitted transformers is
+    refitted on its full columns and `output_indices_` is recorded again
+    from the refitted widths (a block can come out wider than on the probe,
+    e.g. a category the probe lacks).
+    """
+    Xd = pipe.named_steps["derive"].fit(X, y).transform(X)
+    pre = pipe.named_steps["pre"]
+    with warnings.catch_warnings():
+        # e.g. degenerate quantile bins on the probe
+        warnings.simplefilter("ignore")
+        pre.fit(Xd.iloc[:probe_rows])
+
+    # as ColumnTransformer.fit records them: fitted blocks in order, the
+    # rest (dropped / empty, the remainder) as empty slices
+    indices, start = {}, 0
+    for name, trans, cols in pre.transformers_:
+        if isinstance(trans, str):                   # "drop" remainder
+            continue
+        trans.fit(Xd[cols], y)
+        width = len(trans.get_feature_names_out())
+        indices[name] = slice(start, start + width)
+        start += width
+    for name in [t[0] for t in pre.transformers] + ["remainder"]:
+        indices.setdefault(name, slice(0, 0))
+    pre.output_indices_ = indices
+    return pipe
+
+
+def transform_chunked(
+    pipe: SkPipeline,
+    X: pd.DataFrame,
+    out: np.ndarray | str | Path | None = None,
+    dtype=np.float64,
+    chunk_rows: int = 100_000,
+) -> np.ndarray:
+    """
+    `pipe.transform(X)` in chunks of `chunk_rows` rows, each written into one
+    preallocated output: `out` itself (an array / memmap of the right shape;
+    its dtype wins), a new `.npy` memmap at `out` if it is a path, or a new
+    in-memory array.  Peak memory is the output plus one chunk's
+    temporaries.  Dense encodings only.
+    """
+    pre = pipe.named_steps["pre"]
+    if pre.sparse_output_:
+        raise ValueError("transform_chunked writes dense output; "
+                         "use pipe.transform for CSR")
+    shape = (len(X), len(pre.get_feature_names_out()))
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    elif isinstance(out, (str, Path)):
+        out = np.lib.format.open_memmap(out, mode="w+", dtype=dtype,
+                                        shape=shape)
+    elif out.shape != shape:
+        raise ValueError(f"out has shape {out.shape}, expected {shape}")
+
+    for start in range(0, shape[0], chunk_rows):
+        stop = min(start + chunk_rows, shape[0])
+        out[start:stop] = pipe.transform(X.iloc[start:stop])
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
+
+
 def save_pipeline(pipeline: SkPipeline, path: str | Path = "models/feature_pipeline_v2.pkl") -> None:
     """Persist pipeline via joblib."""
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
     joblib.dump(pipeline, path)
-
-
@@ -0,0 +1,177 @@
+"""
+matrix_store.py · Versioned on-disk training matrix
+---------------------------------------------------
+A transformed training matrix is stored as a directory of raw `.npy`
+arrays plus `meta.json`:
+
+    data/processed/train_matrix/
+    ├── X.npy        float64, (n_rows, n_features)
+    ├── y.npy        int8 labels
+    └── meta.json    feature names, shape, dtype, pipeline / data hashes
+
+`load_matrix` opens the arrays memory-mapped, so loading is O(1) and
+every process that opens the store — including joblib / loky CV workers,
+which receive memmaps by file reference — shares one page-cache copy
+instead of unpickling its own.
+
+    save_matrix(OUT, X, y, feature_names, pipeline=pipe, data_path=CLEAN)
+    m = load_matrix(OUT)    # m.X (memmap), m.y, m.feature_names, m.meta
+
+The native-categorical encoding lives next to it in `train_matrix_native/`,
+with the ordinal-coded column indices in `meta["categorical_features"]`.
+Sparse matrices (`train_matrix_sparse/`, kind "csr") are stored as their
+three CSR arrays `X.data.npy` / `X.indices.npy` / `X.indptr.npy` and come
+back as a `scipy.sparse.csr_matrix` over the memory-mapped arrays.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import time
+from pathlib import Path
+from typing import Any, NamedTuple, Sequence
+
+import numpy as np
+import scipy.sparse as sp
+
+FORMAT_VERSION = 1
+DEFAULT_DIR = (Path(__file__).resolve().parents[2]
+               / "data" / "processed" / "train_matrix")
+
+
+class TrainMatrix(NamedTuple):
+    X: np.ndarray | sp.csr_matrix
+    y: np.ndarray
+    feature_names: list[str]
+    meta: dict[str, Any]
+
+
+def file_hash(path: str | Path, chunk: int = 1 << 20) -> str:
+    """
+    blake2b of a file's bytes (e.g. the clean parquet the matrix was built
+    from).
+    """
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as fh:
+        while block := fh.read(chunk):
+            h.update(block)
+    return h.hexdigest()
+
+
+def pipeline_hash(pipe) -> str:
+    """blake2b of the pickled (fitted) pipeline."""
+    blob = pickle.dumps(pipe, protocol=5)
+    return hashlib.blake2b(blob, digest_size=16).hexdigest()
+
+
+def save_matrix(
+    path: str | Path,
+    X,
+    y,
+    feature_names: Sequence[str],
+    pipeline=None,
+    data_path: str | Path | None = None,
+    categorical: Sequence[int] = (),
+    extra: dict[str, Any] | None = None,
+) -> Path:
+    """Write the store atomically (temp dir + rename) and return its path."""
+    path = Path(path)
+    sparse = sp.issparse(X)
+    X = sp.csr_matrix(X) if sparse else np.ascontiguousarray(X)
+    y = np.asarray(y)
+    if X.ndim != 2 or len(y) != X.shape[0] or X.shape[1] != len(feature_names):
+        raise ValueError(f"inconsistent shapes: X {X.shape}, y {y.shape}, "
+                         f"{len(feature_names)} feature names")
+
+    tmp = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    if sparse:
+        for part in ("data", "indices", "indptr"):
+            np.save(tmp / f"X.{part}.npy", getattr(X, part))
+    else:
+        np.save(tmp / "X.npy", X)
+    np.save(tmp / "y.npy", y.astype(np.int8) if y.dtype.kind in "biu" else y)
+    meta = {
+        "format": FORMAT_VERSION,
+        "kind": "csr" if sparse else "dense",
+        "shape": list(X.shape),
+        "dtype": X.dtype.str,
+        **({"nnz": int(X.nnz)} if sparse else {}),
+        "feature_names": [str(f) for f in feature_names],
+        "categorical_features": [int(i) for i in categorical],
+        "pipeline_hash": (pipeline_hash(pipeline)
+                          if pipeline is not None else None),
+        "data_hash": file_hash(data_path) if data_path is not None else None,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        **(extra or {}),
+    }
+    (tmp / "meta.json").write_text(json.dumps(meta, indent=2))
+
+    if path.exists():
+        old = path.with_name(f".{path.name}.old-{os.getpid()}")
+        path.rename(old)
+        tmp.rename(path)
+        shutil.rmtree(old, ignore_errors=True)
+    else:
+        tmp.rename(path)
+    return path
+
+
+def load_matrix(path: str | Path = DEFAULT_DIR, mmap: bool = True,
+                expect_pipeline_hash: str | None = None) -> TrainMatrix:
+    """Open a store; `mmap=False` reads it fully into memory instead."""
+    path = Path(path)
+    meta = json.loads((path / "meta.json").read_text())
+    if meta.get("format") != FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported matrix store format "
+                         f"{meta.get('format')}")
+    if (expect_pipeline_hash
+            and meta.get("pipeline_hash") != expect_pipeline_hash):
+        raise ValueError(f"{path} was built with a different feature pipeline")
+    mode = "r" if mmap else None
+    if meta.get("kind") == "csr":
+        X = sp.csr_matrix(tuple(np.load(path / f"X.{part}.npy", mmap_mode=mode)
+                                for part in ("data", "indices", "indptr")),
+                          shape=tuple(meta["shape"]), copy=False)
+    else:
+        X = np.load(path / "X.npy", mmap_mode=mode)
+    y = np.load(path / "y.npy", mmap_mode=mode)
+    return TrainMatrix(X, y, meta["feature_names"], meta)
+
+
+def store_name(encoding: str = "onehot") -> str:
+    if encoding == "onehot":
+        return "train_matrix"
+    return f"train_matrix_{encoding}"
+
+
+def load_training_data(
+    data_dir: str | Path, encoding: str = "onehot"
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    `(X, y)` for the training scripts: the memory-mapped store in
+    `data_dir/train_matrix[_<encoding>]` if present, else (one-hot only)
+    the legacy `X_train.pkl` / `y_train.pkl` pickles.
+    """
+    data_dir = Path(data_dir)
+    store = data_dir / store_name(encoding)
+    if (store / "meta.json").exists() or encoding != "onehot":
+        m = load_matrix(store)
+        return m.X, m.y
+    import joblib
+    return (joblib.load(data_dir / "X_train.pkl"),
+            joblib.load(data_dir / "y_train.pkl"))
+
+
+def categorical_columns(data_dir: str | Path,
+                        encoding: str = "onehot") -> list[int]:
+    """Ordinal-coded categorical column indices (empty for one-hot)."""
+    meta = Path(data_dir) / store_name(encoding) / "meta.json"
+    if not meta.exists():
+        return []
+    return json.loads(meta.read_text()).get("categorical_features", [])
@@ -9,6 +9,9 @@ import numpy as np
 import pandas as pd
 from sklearn.base import BaseEstimator, TransformerMixin
 
+TENURE_BINS = [0, 6, 12, 24, np.inf]
+TENURE_LABELS = ["0-6", "6-12", "12-24", "24+"]
+
 
 class AddDerivedFeatures(BaseEstimator, TransformerMixin):
     """
@@ -21,21 +24,25 @@ class AddDerivedFeatures(BaseEstimator, TransformerMixin):
         return self                          # no state
 
     def transform(self, X: pd.DataFrame):
-        X = X.copy()
+        # shallow copy: the new / recast columns land in the copy only, the
+        # caller's frame and its column buffers are neither touched nor
+        # duplicated
+        if X.columns.has_duplicates:
+            X = X.loc[:, ~X.columns.duplicated()]
+        X = X.copy(deep=False)
 
-        contract_col = X["Contract"]
-        if isinstance(contract_col, pd.DataFrame):
-            contract_col = contract_col.iloc[:, 0]
+        # compact float32 columns from the cleaned parquet → float64, as at
+        # serving time
+        for col in X.columns[X.dtypes == np.float32]:
+            X[col] = X[col].astype(np.float64)
 
-        X["Is_MonthToMonth"] = (contract_col == "Month-to-month").astype("category")
+        X["Is_MonthToMonth"] = (
+            X["Contract"] == "Month-to-month").astype("category")
 
-        
         X["AvgMonthlySpend"] = X["TotalCharges"] / (X["tenure"] + 1)
 
-        bins = [0, 6, 12, 24, np.inf]
-        labels = ["0-6", "6-12", "12-24", "24+"]
-        X["TenureBucket"] = pd.cut(X["tenure"], bins=bins, labels=labels, right=False)
-
-        X = X.loc[:, ~X.columns.duplicated()]
+        X["TenureBucket"] = pd.cut(
+            X["tenure"], bins=TENURE_BINS, labels=TENURE_LABELS, right=False
+        )
 
         return X
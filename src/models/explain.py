@@ -0,0 +1,78 @@
+"""
+explain.py
+----------
+Probabilities and per-feature contributions straight from the booster.
+
+XGBoost (`pred_contribs=True`) and LightGBM (`pred_contrib=True`) compute
+exact TreeSHAP values natively; the contributions plus the bias column sum
+to the raw margin, so the probability comes out of the same call.  An
+early-stopped XGBoost model is cut at `best_iteration`, as its own
+`predict_proba` is (LightGBM does that by default).  Works
+for the sklearn wrappers and for raw boosters as returned by
+`src.models.final_model.load` (e.g. `lgbm_optuna_best.txt`).
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+def _booster(model):
+    """`(library, booster)` of XGBoost/LightGBM models, else `(None, None)`."""
+    mod = type(model).__module__
+    if mod.startswith("xgboost"):
+        if hasattr(model, "get_booster"):
+            return "xgboost", model.get_booster()
+        return "xgboost", model
+    if mod.startswith("lightgbm"):
+        return "lightgbm", getattr(model, "booster_", model)
+    return None, None
+
+
+def _iteration_range(booster) -> tuple[int, int]:
+    """Trees up to `best_iteration` if early stopping set one, else (0, 0)."""
+    best = getattr(booster, "best_iteration", None)
+    return (0, best + 1) if best is not None else (0, 0)
+
+
+def supports_native_contribs(model) -> bool:
+    return _booster(model)[0] is not None
+
+
+def predict_proba(model, X) -> np.ndarray:
+    """Positive-class probability for sklearn classifiers and raw boosters."""
+    if hasattr(model, "predict_proba"):
+        return model.predict_proba(X)[:, 1]
+    lib, booster = _booster(model)
+    if lib == "xgboost":
+        import xgboost as xgb
+        return booster.predict(xgb.DMatrix(X),
+                               iteration_range=_iteration_range(booster))
+    if lib == "lightgbm":
+        return booster.predict(X)
+    raise TypeError(f"Cannot score model of type {type(model).__name__}")
+
+
+def predict_with_contribs(model, X) -> tuple[np.ndarray, np.ndarray]:
+    """
+    One booster call → `(proba, contribs)` with `contribs` shaped
+    (n_rows, n_features), bias column dropped.
+    """
+    lib, booster = _booster(model)
+    if lib == "xgboost":
+        import xgboost as xgb
+        raw = booster.predict(xgb.DMatrix(X), pred_contribs=True,
+                              iteration_range=_iteration_range(booster))
+    elif lib == "lightgbm":
+        raw = booster.predict(X, pred_contrib=True)
+    else:
+        raise TypeError(f"No native contributions for {type(model).__name__}")
+    if sp.issparse(raw):              # LightGBM answers CSR input in CSR
+        raw = raw.toarray()
+    raw = np.asarray(raw, dtype=np.float64)
+    return _sigmoid(raw.sum(axis=1)), raw[:, :-1]
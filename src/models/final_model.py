@@ -1,12 +1,118 @@
+"""
+final_model.py · Load / save the production model in any supported format
+-------------------------------------------------------------------------
+The format follows the file suffix:
+
+  .pkl           joblib pickle (sklearn wrapper; tied to the library versions)
+  .ubj / .json   XGBoost native model (UBJSON / JSON) → `xgb.XGBClassifier`
+  .txt           LightGBM text model → `lightgbm.Booster`
+  .npz           flattened trees (`src.models.flat_trees`), memory-mapped:
+                 probabilities only, no native contributions
+
+`load` memoizes per absolute path: a file whose size and mtime haven't
+changed comes back as the object already loaded (shared — don't mutate
+it), a changed file is loaded again.  Boosters can't be mapped, XGBoost /
+LightGBM copy a model into their own structures; only `.npz` is loaded
+with `mmap`.
+
+    python -m src.models.final_model --model models/final/model.pkl \\
+        --output models/final/model.ubj
+"""
+
+from __future__ import annotations
+
+import os
+import threading
 from pathlib import Path
-import joblib, lightgbm as lgbm
+
+import click
+import joblib
 
 _ROOT = Path(__file__).resolve().parents[2]
 _PATH = _ROOT / "models" / "final" / "model.pkl"
 
-def load():
-    if _PATH.suffix == ".pkl":
-        return joblib.load(_PATH)
-    if _PATH.suffix == ".txt":
-        return lgbm.Booster(model_file=str(_PATH))
-    raise ValueError(f"Unsupported model format: {_PATH}")
+FORMATS = (".pkl", ".ubj", ".json", ".txt", ".npz")
+
+# path → ((mtime, size), model)
+_CACHE: dict[Path, tuple[tuple[int, int], object]] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def _load_xgboost(path: Path):
+    import xgboost as xgb
+    model = xgb.XGBClassifier()
+    model.load_model(path)
+    return model
+
+
+def _load_lightgbm(path: Path):
+    import lightgbm as lgbm
+    return lgbm.Booster(model_file=str(path))
+
+
+def _load_flat(path: Path):
+    from src.models.flat_trees import FlatTrees
+    return FlatTrees.load(path, mmap=True)
+
+
+_LOADERS = {".pkl": joblib.load, ".ubj": _load_xgboost, ".json": _load_xgboost,
+            ".txt": _load_lightgbm, ".npz": _load_flat}
+
+
+def load(path: str | Path = _PATH, cached: bool = True):
+    # no symlink resolution: no extra syscalls
+    path = Path(os.path.abspath(path))
+    loader = _LOADERS.get(path.suffix)
+    if loader is None:
+        raise ValueError(f"Unsupported model format: {path}")
+    if not cached:
+        return loader(path)
+    st = path.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _CACHE_LOCK:
+        hit = _CACHE.get(path)
+        if hit is not None and hit[0] == stamp:
+            return hit[1]
+        model = loader(path)
+        _CACHE[path] = (stamp, model)
+    return model
+
+
+def clear_cache() -> None:
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
+
+def save(model, path: str | Path) -> Path:
+    """Write `model` in the format of `path`'s suffix (see module doc)."""
+    from src.models.explain import _booster
+    from src.models.flat_trees import FlatTrees, export
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lib, booster = _booster(model)
+    if path.suffix == ".pkl":
+        joblib.dump(model, path)
+    elif path.suffix in (".ubj", ".json") and lib == "xgboost":
+        model.save_model(path)
+    elif path.suffix == ".txt" and lib == "lightgbm":
+        booster.save_model(str(path))
+    elif path.suffix == ".npz":
+        (model if isinstance(model, FlatTrees) else export(model)).save(path)
+    else:
+        raise ValueError(f"Can't save {type(model).__name__} as {path.suffix}")
+    return path
+
+
+@click.command()
+@click.option("--model", "model_path", default=str(_PATH), show_default=True)
+@click.option("--output", type=click.Path(dir_okay=False), required=True,
+              help="Target file; format from its suffix "
+                   f"({', '.join(FORMATS)}).")
+def main(model_path: str, output: str) -> None:
+    path = save(load(model_path), output)
+    print(f"✅ {model_path} → {path} ({path.stat().st_size / 2**20:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
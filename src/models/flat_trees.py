@@ -0,0 +1,324 @@
+"""
+flat_trees.py · Booster-free tree evaluator over flat NumPy arrays
+------------------------------------------------------------------
+`export(model)` flattens a binary XGBoost (pickle / Booster) or LightGBM
+(`.txt` / Booster / LGBMClassifier) model into one set of node arrays —
+split feature, threshold, left child (the right one is next to it),
+missing-value direction and leaf value — laid out breadth-first, with
+every tree's root in `roots`.  `FlatTrees.predict_proba` walks all trees
+for a block of rows at once: one gather + compare per depth level, leaves
+pointing at themselves so there is no per-node branching.
+
+Splits are normalised to `x <= threshold`: XGBoost's float32 `x < t` is
+stored as `x <= nextafter(t, -inf)` in float32, LightGBM's double `x <= t`
+as is, including its "Zero" / "None" missing-value rules.  Leaves are
+summed in tree order in the booster's own precision, so margins match the
+booster exactly.  Numeric splits only (no native-categorical models).
+
+    python -m src.models.flat_trees --model models/final/model.pkl \\
+        --output models/final/model_flat.npz
+
+    flat = FlatTrees.load("models/final/model_flat.npz", mmap=True)
+    proba = flat.predict_proba(X)[:, 1]        # sklearn layout, (n_rows, 2)
+
+The `.npz` is written uncompressed, so `load(mmap=True)` maps the node
+arrays read-only straight from the file: loading costs no copy, and
+processes scoring with the same file share its page-cache pages.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import zipfile
+from dataclasses import dataclass, fields
+from pathlib import Path
+
+import click
+import numpy as np
+
+from src.models.explain import _booster
+
+_LGBM_ZERO = 1e-35                      # LightGBM's kZeroThreshold
+
+
+@dataclass
+class FlatTrees:
+    # per node; "float" is the booster's float32 / float64
+    feature: np.ndarray         # int32  split feature; 0 for leaves
+    threshold: np.ndarray       # float  go left if x <= threshold
+    left: np.ndarray            # int32  left child, right child is left + 1;
+    #                                    leaves point at themselves
+    nan_left: np.ndarray        # bool   NaN goes left
+    zero_missing: np.ndarray    # bool   |x| <= 1e-35 is missing (LightGBM)
+    default_left: np.ndarray    # bool   where "missing" goes
+    value: np.ndarray           # float  leaf value; 0 for splits
+    roots: np.ndarray           # int32 (trees,)
+    depth: int
+    n_features: int
+    base_margin: float
+    sigmoid: float = 1.0
+
+    # ─── evaluation ────────────────────────────────────────────────────
+    def leaf_values(self, X: np.ndarray) -> np.ndarray:
+        """(n_rows, n_trees) leaf value reached in every tree; X C-order."""
+        row_base = (np.arange(len(X), dtype=np.intp) * X.shape[1])[:, None]
+        flat_x = X.ravel()
+        idx = np.broadcast_to(self.roots, (len(X), len(self.roots))).copy()
+        check_zero = bool(self.zero_missing.any())
+        for _ in range(self.depth):
+            fv = flat_x.take(row_base + self.feature.take(idx))
+            go_left = fv <= self.threshold.take(idx)
+            nan = np.isnan(fv)
+            if nan.any():
+                go_left = np.where(nan, self.nan_left.take(idx), go_left)
+            if check_zero:
+                zero = (self.zero_missing.take(idx)
+                        & (np.abs(fv) <= _LGBM_ZERO))
+                go_left = np.where(zero, self.default_left.take(idx), go_left)
+            idx = self.left.take(idx)
+            idx += ~go_left
+        return self.value.take(idx)
+
+    def predict_margin(self, X, block_rows: int = 1024) -> np.ndarray:
+        X = np.ascontiguousarray(X, dtype=self.threshold.dtype)
+        if X.ndim == 1:
+            X = X[None, :]
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"expected {self.n_features} features, "
+                             f"got {X.shape[1]}")
+        dtype = self.value.dtype
+        out = np.empty(len(X), dtype=dtype)
+        for start in range(0, len(X), block_rows):
+            leaves = self.leaf_values(X[start:start + block_rows])
+            # sequential (cumsum) rather than pairwise sum: the booster's
+            # own order
+            base = np.full((len(leaves), 1), self.base_margin, dtype=dtype)
+            acc = np.concatenate([base, leaves], axis=1)
+            out[start:start + len(leaves)] = np.cumsum(acc, axis=1,
+                                                       dtype=dtype)[:, -1]
+        return out
+
+    def predict_proba(self, X, block_rows: int = 1024) -> np.ndarray:
+        """Class probabilities like sklearn's, shape (n_rows, 2)."""
+        cast = self.value.dtype.type
+        one = cast(1)
+        z = self.predict_margin(X, block_rows) * cast(self.sigmoid)
+        p = one / (one + np.exp(-z))
+        return np.column_stack([one - p, p])
+
+    # ─── persistence ───────────────────────────────────────────────────
+    def save(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, **{f.name: getattr(self, f.name) for f in fields(self)})
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path, mmap: bool = False) -> "FlatTrees":
+        if mmap:
+            kw = _map_npz(Path(path))
+        else:
+            with np.load(path) as z:
+                kw = {f.name: z[f.name] for f in fields(cls)}
+        for name in ("depth", "n_features"):
+            kw[name] = int(kw[name])
+        for name in ("base_margin", "sigmoid"):
+            kw[name] = float(kw[name])
+        return cls(**kw)
+
+
+def _map_npz(path: Path) -> dict[str, np.ndarray]:
+    """
+    Members of an uncompressed `.npz`, memory-mapped read-only (np.load
+    can't map .npz).
+    """
+    out: dict[str, np.ndarray] = {}
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as fh:
+        for info in zf.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path}: {info.filename} is compressed "
+                                 "and can't be mapped")
+            # local file header: name / extra field lengths at offset 26
+            fh.seek(info.header_offset + 26)
+            name_len, extra_len = struct.unpack("<HH", fh.read(4))
+            start = info.header_offset + 30 + name_len + extra_len
+            fh.seek(start)
+            version = np.lib.format.read_magic(fh)
+            read_header = (np.lib.format.read_array_header_1_0
+                           if version == (1, 0)
+                           else np.lib.format.read_array_header_2_0)
+            shape, fortran, dtype = read_header(fh)
+            name = info.filename.removesuffix(".npy")
+            if shape:
+                out[name] = np.memmap(fh.name, dtype, "r", offset=fh.tell(),
+                                      shape=shape,
+                                      order="F" if fortran else "C",
+                                      ).view(np.ndarray)
+            else:                                   # scalars: just read them
+                fh.seek(start)
+                out[name] = np.lib.format.read_array(fh)
+    return out
+
+
+# ─── export ───────────────────────────────────────────────────────────
+_SPLIT_KEYS = ("feature", "threshold", "nan_left", "zero_missing",
+               "default_left")
+
+
+class _Builder:
+    """
+    Lays trees out breadth-first with siblings adjacent.  A tree is given
+    as `{node_id: ("leaf", value)
+                  | ("split", left_id, right_id, {split fields})}`.
+    """
+
+    def __init__(self):
+        self.cols = {k: [] for k in (*_SPLIT_KEYS, "left", "value")}
+        self.roots: list[int] = []
+        self.depth = 0
+
+    def _alloc(self) -> int:
+        for col in self.cols.values():
+            col.append(0)
+        return len(self.cols["left"]) - 1
+
+    def add_tree(self, nodes: dict, root) -> None:
+        c = self.cols
+        queue = [(root, self._alloc(), 0)]
+        self.roots.append(queue[0][1])
+        while queue:
+            node_id, i, depth = queue.pop(0)
+            node = nodes[node_id]
+            if node[0] == "leaf":
+                # threshold +inf, NaN left: always "left", i.e. the leaf
+                c["feature"][i], c["threshold"][i], c["left"][i] = 0, np.inf, i
+                c["nan_left"][i] = c["default_left"][i] = True
+                c["value"][i] = node[1]
+                continue
+            _, left_id, right_id, split = node
+            for k in _SPLIT_KEYS:
+                c[k][i] = split.get(k, 0)
+            left, right = self._alloc(), self._alloc()
+            c["left"][i] = left
+            self.depth = max(self.depth, depth + 1)
+            queue += [(left_id, left, depth + 1), (right_id, right, depth + 1)]
+
+    def build(self, dtype, **kw) -> FlatTrees:
+        c = self.cols
+        return FlatTrees(
+            feature=np.asarray(c["feature"], np.int32),
+            threshold=np.asarray(c["threshold"], dtype),
+            left=np.asarray(c["left"], np.int32),
+            nan_left=np.asarray(c["nan_left"], bool),
+            zero_missing=np.asarray(c["zero_missing"], bool),
+            default_left=np.asarray(c["default_left"], bool),
+            value=np.asarray(c["value"], dtype),
+            roots=np.asarray(self.roots, np.int32), depth=self.depth, **kw)
+
+
+def _from_xgboost(booster) -> FlatTrees:
+    learner = json.loads(booster.save_raw("json"))["learner"]
+    if learner["objective"]["name"] != "binary:logistic":
+        raise ValueError(
+            f"objective {learner['objective']['name']} not supported")
+    gbm = learner["gradient_booster"]
+    if gbm["name"] != "gbtree":
+        raise ValueError(f"booster {gbm['name']} not supported")
+    trees = gbm["model"]["trees"]
+    best = booster.attr("best_iteration")
+    if best is not None:            # predict() stops at the best iteration
+        trees = trees[:gbm["model"]["iteration_indptr"][int(best) + 1]]
+
+    b = _Builder()
+    for t in trees:
+        if any(t["split_type"]):
+            raise ValueError("categorical splits are not supported")
+        nodes = {}
+        children = zip(t["left_children"], t["right_children"])
+        for n, (lc, rc) in enumerate(children):
+            cond = t["split_conditions"][n]
+            if lc == -1:
+                nodes[n] = ("leaf", cond)
+                continue
+            dflt = bool(t["default_left"][n])
+            nodes[n] = ("split", lc, rc, {
+                "feature": t["split_indices"][n],
+                # float32 x < t  ⇔  x <= nextafter(t, -inf)
+                "threshold": np.nextafter(np.float32(cond),
+                                          np.float32(-np.inf)),
+                "nan_left": dflt, "default_left": dflt,
+            })
+        b.add_tree(nodes, 0)
+
+    param = learner["learner_model_param"]
+    base = np.float32(float(param["base_score"].strip("[]")))
+    margin = -np.log(np.float32(1) / base - np.float32(1))
+    return b.build(np.float32, n_features=int(param["num_feature"]),
+                   base_margin=float(np.float32(margin)))
+
+
+def _from_lightgbm(booster) -> FlatTrees:
+    model = booster.dump_model()
+    objective = model["objective"].split()
+    if objective[0] != "binary" or model["num_tree_per_iteration"] != 1:
+        raise ValueError(f"objective {model['objective']} not supported")
+    sigmoid = next((float(p.split(":")[1]) for p in objective
+                    if p.startswith("sigmoid:")), 1.0)
+
+    def collect(node: dict, nodes: dict) -> int:
+        key = len(nodes)
+        if "leaf_value" in node:
+            nodes[key] = ("leaf", node["leaf_value"])
+            return key
+        if node["decision_type"] != "<=":
+            raise ValueError("categorical splits are not supported")
+        nodes[key] = None                               # reserve the id
+        thr, missing = node["threshold"], node["missing_type"]
+        dflt = node["default_left"]
+        left = collect(node["left_child"], nodes)
+        right = collect(node["right_child"], nodes)
+        nodes[key] = ("split", left, right, {
+            "feature": node["split_feature"], "threshold": thr,
+            "default_left": dflt,
+            # NaN: default side for "NaN"/"Zero" (NaN → 0 is missing),
+            # else compared as 0.0
+            "nan_left": dflt if missing in ("NaN", "Zero") else 0.0 <= thr,
+            "zero_missing": missing == "Zero",
+        })
+        return key
+
+    b = _Builder()
+    for info in model["tree_info"]:
+        nodes: dict = {}
+        b.add_tree(nodes, collect(info["tree_structure"], nodes))
+    return b.build(np.float64, n_features=model["max_feature_idx"] + 1,
+                   base_margin=0.0, sigmoid=sigmoid)
+
+
+def export(model) -> FlatTrees:
+    """Flatten a model as returned by `src.models.final_model.load`."""
+    lib, booster = _booster(model)
+    if lib == "xgboost":
+        return _from_xgboost(booster)
+    if lib == "lightgbm":
+        return _from_lightgbm(booster)
+    raise TypeError(f"Cannot flatten model of type {type(model).__name__}")
+
+
+@click.command()
+@click.option("--model", "model_path", default=None,
+              help="Model file for final_model.load "
+                   "(default: models/final/model.pkl).")
+@click.option("--output", type=click.Path(dir_okay=False), required=True)
+def main(model_path: str | None, output: str) -> None:
+    from src.models import final_model
+    model = final_model.load(model_path) if model_path else final_model.load()
+    flat = export(model)
+    path = flat.save(output)
+    print(f"✅ {len(flat.roots)} trees, {len(flat.feature)} nodes, "
+          f"depth {flat.depth} → {path}")
+
+
+if __name__ == "__main__":
+    main()
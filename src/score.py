@@ -0,0 +1,205 @@
+"""
+score.py · Offline bulk scoring
+-------------------------------
+Stream a raw customer extract (CSV or parquet) in chunks, clean each chunk
+with `src.data.clean_data`, transform it with the fitted feature pipeline
+and score it with the model from `src.models.final_model.load`.  Chunks
+are fanned out over a process pool; each worker writes its own
+`part-NNNNN.parquet`, so memory stays bounded by
+`workers × max_in_flight × chunksize` rows whatever the input size.
+
+Cleaning per chunk = schema dtypes (`src/data/schema.py`) + imputation.
+Imputation means come from a stats pass over the whole input
+(`src.data.clean_data.CleanStats`, as in streaming `clean_data`), so a
+row's score doesn't depend on which chunk it lands in.  IQR winsorizing is
+skipped: the fitted pipeline doesn't need it.
+
+`--top-features` needs native contributions (XGBoost / LightGBM); other
+models are rejected before any chunk is read.
+
+Usage (from project root):
+
+    python -m src.score \\
+        --input  data/raw/WA_Fn-UseC_-Telco-Customer-Churn.csv \\
+        --output data/scored/2025-08-06 \\
+        --workers 8 --chunksize 100000 --top-features 3
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Iterator
+
+import click
+import joblib
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+
+from src.data import schema
+from src.data.clean_data import (
+    CleanStats,
+    coerce_raw,
+    impute,
+    report_out_of_domain,
+)
+from src.features import feature_lists as fl
+from src.models import final_model
+from src.models.explain import (
+    predict_proba,
+    predict_with_contribs,
+    supports_native_contribs,
+)
+
+_ROOT = Path(__file__).resolve().parents[1]
+
+# ---- per-worker state (set by _init_worker)
+_MODEL = _PIPE = _NAMES = _MEANS = _LIMITS = None
+_TOP_K = 0
+
+
+def iter_chunks(path: Path, chunksize: int) -> Iterator[pd.DataFrame]:
+    """Yield raw DataFrame chunks from a CSV or parquet file."""
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize,
+                               **schema.read_csv_kwargs())
+
+
+def fill_means(path: Path, chunksize: int) -> dict[str, float]:
+    """Column means over the whole input — the stats pass behind `impute`
+    (also logs categorical values outside the schema)."""
+    stats = CleanStats()
+    chunks = iter_chunks(path, chunksize)
+    for chunk in tqdm(chunks, desc="stats pass", unit="chunk"):
+        stats.update(coerce_raw(chunk, stats.out_of_domain))
+    report_out_of_domain(stats.out_of_domain, stats.n_rows)
+    return stats.means
+
+
+def _limit_threads(model, n: int) -> None:
+    """Keep boosters from oversubscribing cores shared with other workers."""
+    if hasattr(model, "set_params") and "n_jobs" in model.get_params():
+        model.set_params(n_jobs=n)
+    elif hasattr(model, "set_param"):
+        model.set_param({"nthread": n})
+
+
+def _init_worker(model_path: str, pipe_path: str, top_k: int, threads: int,
+                 means: dict[str, float]) -> None:
+    global _MODEL, _PIPE, _NAMES, _MEANS, _LIMITS, _TOP_K
+    from threadpoolctl import threadpool_limits
+
+    # OpenMP / BLAS pools already exist in a forked worker, so cap them
+    # through threadpoolctl rather than OMP_NUM_THREADS
+    _LIMITS = threadpool_limits(limits=threads)
+    _MODEL = final_model.load(model_path)
+    _limit_threads(_MODEL, threads)
+    _PIPE = joblib.load(pipe_path)
+    _NAMES = _PIPE.named_steps["pre"].get_feature_names_out()
+    _MEANS = means
+    _TOP_K = top_k
+
+
+def score_frame(df: pd.DataFrame, model, pipe, feature_names, top_k: int,
+                id_col: str,
+                means: dict[str, float] | None = None) -> pd.DataFrame:
+    """
+    Clean + transform + score one raw chunk → output frame.  Gaps are
+    filled with `means` (see `fill_means`); without them, the chunk's own.
+    """
+    df = impute(coerce_raw(df), means)
+    X = pipe.transform(df[fl.numeric_features + fl.categorical_low_card
+                          + fl.categorical_high_card])
+
+    out = pd.DataFrame(index=df.index)
+    if id_col in df.columns:
+        out[id_col] = df[id_col].to_numpy()
+    if top_k:
+        proba, contribs = predict_with_contribs(model, X)
+        top_idx = np.argsort(np.abs(contribs), axis=1)[:, ::-1][:, :top_k]
+        out["top_features"] = [list(feature_names[row]) for row in top_idx]
+    else:
+        proba = predict_proba(model, X)
+    out.insert(1 if id_col in out.columns else 0, "churn_probability",
+               proba.astype(np.float32))
+    return out
+
+
+def _score_chunk(idx: int, df: pd.DataFrame, out_dir: str, id_col: str) -> int:
+    out = score_frame(df, _MODEL, _PIPE, _NAMES, _TOP_K, id_col, _MEANS)
+    out.to_parquet(Path(out_dir) / f"part-{idx:05d}.parquet", index=False)
+    return len(out)
+
+
+@click.command()
+@click.option("--input", "-i", "input_", required=True,
+              type=click.Path(exists=True, dir_okay=False),
+              help="Raw .csv or .parquet")
+@click.option("--output", "-o", required=True,
+              type=click.Path(file_okay=False),
+              help="Directory for part-NNNNN.parquet files")
+@click.option("--model", "model_path",
+              default=str(_ROOT / "models" / "final" / "model.pkl"),
+              show_default=True, type=click.Path(exists=True))
+@click.option("--pipeline", "pipe_path",
+              default=str(_ROOT / "models" / "feature_pipeline_v2.pkl"),
+              show_default=True, type=click.Path(exists=True, dir_okay=False))
+@click.option("--chunksize", default=100_000, show_default=True,
+              help="Rows per chunk.")
+@click.option("--workers", default=os.cpu_count() or 1, show_default=True)
+@click.option("--threads-per-worker", default=1, show_default=True)
+@click.option("--max-in-flight", default=2, show_default=True,
+              help="Chunks queued per worker; bounds memory.")
+@click.option("--top-features", default=0, show_default=True,
+              help="Also write the K largest-contribution features (0 = off).")
+@click.option("--id-col", default="customerID", show_default=True)
+def main(input_: str, output: str, model_path: str, pipe_path: str,
+         chunksize: int, workers: int, threads_per_worker: int,
+         max_in_flight: int, top_features: int, id_col: str) -> None:
+    inp, out_dir = Path(input_), Path(output)
+    if (top_features
+            and not supports_native_contribs(final_model.load(model_path))):
+        raise click.BadParameter("needs an XGBoost or LightGBM model with "
+                                 "native contributions",
+                                 param_hint="--top-features")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for old in out_dir.glob("part-*.parquet"):
+        old.unlink()
+
+    t0 = time.perf_counter()
+    means = fill_means(inp, chunksize)
+    n_rows = 0
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(model_path, pipe_path, top_features, threads_per_worker,
+                  means),
+    ) as pool, tqdm(unit="rows", desc="scoring") as bar:
+        pending = set()
+        for idx, chunk in enumerate(iter_chunks(inp, chunksize)):
+            pending.add(pool.submit(_score_chunk, idx, chunk, str(out_dir),
+                                    id_col))
+            if len(pending) >= workers * max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for f in done:
+                    n_rows += f.result()
+                    bar.update(f.result())
+        for f in pending:
+            n_rows += f.result()
+            bar.update(f.result())
+
+    wall = time.perf_counter() - t0
+    print(f"✅  Scored {n_rows:,} rows in {wall:.1f}s "
+          f"→ {n_rows / wall:,.0f} rows/s")
+    print(f"💾  {len(list(out_dir.glob('part-*.parquet')))} parts in {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
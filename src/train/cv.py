@@ -0,0 +1,275 @@
+"""
+cv.py · Shared cross-validation engine
+--------------------------------------
+Fits every fold exactly once, keeps the out-of-fold (OOF) probabilities and
+computes any number of metrics from them — no refitting per metric.  The
+OOF predictions are saved per run under reports/oof/, so reports and model
+comparisons can be redone from disk without training anything.
+
+    from src.train.cv import cross_validate_oof, make_cv
+
+    res = cross_validate_oof(clf, X, y, cv=make_cv())
+    res.summary()         # {"roc_auc_mean": …, "roc_auc_std": …, …}
+    res.save(OOF_DIR / "xgb_default.npz")
+
+    python -m src.train.cv reports/oof/*.npz        # compare saved runs
+
+With `early_stopping_rounds`, XGBoost / LightGBM folds stop adding trees
+once the fold's validation split stops improving; `res.n_estimators` is
+then the tree count to refit with.  `on_fold(k, running_mean)` is called
+after every wave of `n_jobs` folds, which is how the tuners report to an
+Optuna pruner.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Sequence
+
+import click
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.base import clone
+from sklearn.metrics import (average_precision_score, brier_score_loss,
+                             log_loss, roc_auc_score)
+from sklearn.model_selection import StratifiedKFold
+
+ROOT = Path(__file__).resolve().parents[2]
+OOF_DIR = ROOT / "reports" / "oof"
+
+METRICS: dict[str, Callable[[np.ndarray, np.ndarray], float]] = {
+    "roc_auc": roc_auc_score,
+    "pr_auc": average_precision_score,
+    "log_loss": log_loss,
+    "brier": brier_score_loss,
+}
+DEFAULT_METRICS = ("roc_auc", "pr_auc")
+
+
+def make_cv(n_splits: int = 5, seed: int = 42) -> StratifiedKFold:
+    """The project's standard split: stratified, shuffled, seed 42."""
+    return StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=seed)
+
+
+@dataclass
+class CVResult:
+    """
+    Out-of-fold probabilities of one CV run, plus the per-fold scores
+    derived from them.
+    """
+
+    y: np.ndarray
+    oof: np.ndarray         # P(y=1), each row by the fold that held it out
+    folds: np.ndarray       # fold index of every row
+    fit_s: list[float] = field(default_factory=list)
+    meta: dict = field(default_factory=dict)
+    # trees kept per fold (early stopping)
+    best_iterations: list[int] = field(default_factory=list)
+
+    @property
+    def n_estimators(self) -> int | None:
+        """Mean early-stopped tree count across folds (None without it)."""
+        if not self.best_iterations:
+            return None
+        return int(round(np.mean(self.best_iterations)))
+
+    @property
+    def n_folds(self) -> int:
+        return int(self.folds.max()) + 1
+
+    def fold_scores(self, metric: str) -> np.ndarray:
+        fn = METRICS[metric]
+        return np.array([fn(self.y[self.folds == k], self.oof[self.folds == k])
+                         for k in range(self.n_folds)])
+
+    def summary(self, metrics: Iterable[str] = DEFAULT_METRICS
+                ) -> dict[str, float]:
+        """
+        `<metric>_mean` / `<metric>_std` (population std, as in the MLflow
+        runs).
+        """
+        out = {}
+        for m in metrics:
+            s = self.fold_scores(m)
+            out[f"{m}_mean"] = float(s.mean())
+            out[f"{m}_std"] = float(s.std(ddof=0))
+        return out
+
+    def save(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(path, y=self.y, oof=self.oof, folds=self.folds,
+                            fit_s=np.asarray(self.fit_s),
+                            best_iterations=np.asarray(self.best_iterations),
+                            meta=json.dumps(self.meta, default=str))
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> "CVResult":
+        with np.load(path) as z:
+            best = (z["best_iterations"].tolist()
+                    if "best_iterations" in z else [])
+            return cls(y=z["y"], oof=z["oof"], folds=z["folds"],
+                       fit_s=z["fit_s"].tolist(),
+                       meta=json.loads(str(z["meta"])), best_iterations=best)
+
+
+def _predict_pos(est, X) -> np.ndarray:
+    if hasattr(est, "predict_proba"):
+        return est.predict_proba(X)[:, 1]
+    return est.decision_function(X)
+
+
+def _early_stopping(est, X_val, y_val, rounds: int) -> dict:
+    """fit() kwargs stopping `est` on (X_val, y_val); XGBoost / LightGBM."""
+    lib = type(est).__module__.split(".")[0]
+    if lib == "xgboost":
+        est.set_params(early_stopping_rounds=rounds)
+        return {"eval_set": [(X_val, y_val)], "verbose": False}
+    if lib == "lightgbm":
+        import lightgbm
+        return {"eval_set": [(X_val, y_val)],
+                "callbacks": [lightgbm.early_stopping(rounds, verbose=False)]}
+    raise TypeError(
+        f"early stopping is not supported for {type(est).__name__}")
+
+
+def native_categoricals(estimator, categorical: Sequence[int],
+                        n_features: int):
+    """
+    Configure a booster for ordinal-coded categorical columns (the
+    `encoding="native"` feature pipeline); returns `(estimator, fit_params)`.
+    XGBoost takes them as `feature_types`, LightGBM as `categorical_feature`
+    in fit().  No categoricals → the estimator unchanged and no fit params.
+    """
+    if not categorical:
+        return estimator, {}
+    lib = type(estimator).__module__.split(".")[0]
+    if lib == "xgboost":
+        cats = set(categorical)
+        types = ["c" if i in cats else "q" for i in range(n_features)]
+        estimator.set_params(enable_categorical=True, tree_method="hist",
+                             feature_types=types)
+        return estimator, {}
+    if lib == "lightgbm":
+        return estimator, {"categorical_feature": list(categorical)}
+    raise TypeError("native categoricals are not supported for "
+                    f"{type(estimator).__name__}")
+
+
+def _best_iteration(est) -> int | None:
+    if getattr(est, "best_iteration_", None):             # LightGBM, 1-based
+        return int(est.best_iteration_)
+    best = getattr(est, "best_iteration", None)           # XGBoost, 0-based
+    return int(best) + 1 if best is not None else None
+
+
+def _fit_fold(estimator, X, y, train_idx, test_idx, early_stopping_rounds=None,
+              fit_params=None):
+    t0 = time.perf_counter()
+    est = clone(estimator)
+    kw = dict(fit_params or {})
+    if early_stopping_rounds:
+        kw |= _early_stopping(est, X[test_idx], y[test_idx],
+                              early_stopping_rounds)
+    est.fit(X[train_idx], y[train_idx], **kw)
+    best = _best_iteration(est) if early_stopping_rounds else None
+    secs = time.perf_counter() - t0
+    return test_idx, _predict_pos(est, X[test_idx]), secs, best
+
+
+def cross_validate_oof(
+    estimator,
+    X,
+    y,
+    cv=None,
+    n_jobs: int = 1,
+    meta: dict | None = None,
+    early_stopping_rounds: int | None = None,
+    on_fold: Callable[[int, float], None] | None = None,
+    metric: str = "pr_auc",
+    fit_params: dict | None = None,
+) -> CVResult:
+    """
+    Fit `estimator` once per fold of `cv` and collect its out-of-fold
+    probabilities.
+
+    early_stopping_rounds : stop each fold's booster on that fold's
+                            validation split
+    on_fold               : called as `on_fold(k, mean <metric> of folds
+                            0..k)` after every `n_jobs` folds (every fold
+                            with n_jobs=1); may raise (e.g.
+                            `optuna.TrialPruned`) to stop early
+    fit_params            : extra fit() kwargs for every fold (see
+                            `native_categoricals`)
+    """
+    from joblib import Parallel, delayed, effective_n_jobs
+
+    X = X.tocsr() if sp.issparse(X) else np.asarray(X)  # CSR rows: cheap
+    y = np.asarray(y)
+    cv = cv or make_cv()
+    splits = list(cv.split(X, y))
+    oof = np.full(len(y), np.nan)
+    folds = np.full(len(y), -1, dtype=np.int8)
+    fit_s, best_iterations, scores = [], [], []
+
+    def collect(k, fitted):
+        test_idx, proba, secs, best = fitted
+        oof[test_idx] = proba
+        folds[test_idx] = k
+        fit_s.append(secs)
+        if best is not None:
+            best_iterations.append(best)
+        scores.append(METRICS[metric](y[test_idx], proba))
+
+    # without a callback all folds run at once; with one, in waves of n_jobs
+    # folds (-1 etc. resolved to the worker count, so pruning still stops
+    # early) and the callback sees the running score after each wave
+    wave = (len(splits) if on_fold is None
+            else max(effective_n_jobs(n_jobs), 1))
+    for start in range(0, len(splits), wave):
+        jobs = (delayed(_fit_fold)(estimator, X, y, tr, te,
+                                   early_stopping_rounds, fit_params)
+                for tr, te in splits[start:start + wave])
+        for k, fitted in enumerate(Parallel(n_jobs=n_jobs)(jobs), start=start):
+            collect(k, fitted)
+        if on_fold is not None:
+            on_fold(k, float(np.mean(scores)))
+
+    info = {"estimator": type(estimator).__name__, "n_splits": len(splits)}
+    if hasattr(estimator, "get_params"):
+        info["params"] = estimator.get_params()
+    return CVResult(y=y, oof=oof, folds=folds, fit_s=fit_s,
+                    meta=info | (meta or {}),
+                    best_iterations=best_iterations)
+
+
+def compare(results: dict[str, CVResult],
+            metrics: Sequence[str] = DEFAULT_METRICS) -> pd.DataFrame:
+    """
+    One row per run with mean ± std of every metric, recomputed from the
+    saved OOF.
+    """
+    rows = {name: res.summary(metrics) for name, res in results.items()}
+    table = pd.DataFrame.from_dict(rows, orient="index")
+    return table.sort_values(f"{metrics[-1]}_mean", ascending=False)
+
+
+@click.command()
+@click.argument("paths", nargs=-1, required=True,
+                type=click.Path(exists=True, dir_okay=False))
+@click.option("--metric", "-m", "metrics", multiple=True,
+              default=DEFAULT_METRICS, type=click.Choice(list(METRICS)),
+              show_default=True)
+def main(paths: tuple[str, ...], metrics: tuple[str, ...]) -> None:
+    """Compare saved OOF runs without retraining."""
+    results = {str(Path(p).with_suffix("")): CVResult.load(p) for p in paths}
+    print(compare(results, metrics).round(4).to_string())
+
+
+if __name__ == "__main__":
+    main()
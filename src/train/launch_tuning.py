@@ -0,0 +1,209 @@
+"""
+launch_tuning.py · Parallel Optuna tuning with an explicit core budget
+----------------------------------------------------------------------
+Runs K worker processes against one shared study.  Cores are split
+explicitly as  K trials × F folds × T booster threads  ("KxFxT"): every
+worker caps its native thread pools at F·T (threadpoolctl) and builds the
+estimator with `n_jobs=T`, running F folds at a time.
+
+Storage is the tuner's existing sqlite study (`optuna.db` /
+`optuna_lgbm.db`) or, with `--storage journal`, an append-only journal
+file next to it, which avoids sqlite lock contention with many workers.
+
+    # 80 XGB trials, 8 workers × 1 fold × 8 threads on a 64-core box
+    python -m src.train.launch_tuning --tuner xgb --split 8x1x8
+
+    # short runs on throw-away studies to compare splits (trials/hour)
+    python -m src.train.launch_tuning --tuner xgb --trials 16 \\
+        --sweep 1x1x64,4x1x16,8x1x8,16x1x4,16x2x2 --output splits.json
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import multiprocessing as mp
+import os
+import time
+from pathlib import Path
+
+import click
+import optuna
+
+from src.train.tuning import make_pruner
+
+ROOT = Path(__file__).resolve().parents[2]
+TUNERS = {
+    "xgb": ("src.train.tune_xgb_optuna", ROOT / "optuna.db"),
+    "lgbm": ("src.train.tune_lgbm_grid", ROOT / "optuna_lgbm.db"),
+}
+
+
+def parse_split(spec: str) -> tuple[int, int, int]:
+    """
+    "8x1x8" → (workers, fold_jobs, threads); "8x8" means one fold at a time.
+    """
+    parts = [int(p) for p in spec.lower().split("x")]
+    if len(parts) == 2:
+        parts.insert(1, 1)
+    if len(parts) != 3 or min(parts) < 1:
+        raise click.BadParameter("split must look like KxT or KxFxT, "
+                                 f"got {spec!r}")
+    return parts[0], parts[1], parts[2]
+
+
+def default_split(cores: int | None = None) -> tuple[int, int, int]:
+    """One worker per 8 cores, folds sequential (pruning sees every fold)."""
+    cores = cores or os.cpu_count() or 1
+    workers = max(1, cores // 8)
+    return workers, 1, max(1, cores // workers)
+
+
+def make_storage(kind: str, db_path: Path, journal_path: Path | None = None):
+    if kind == "sqlite":
+        # longer timeout: K workers writing the same file
+        return optuna.storages.RDBStorage(
+            f"sqlite:///{db_path}",
+            engine_kwargs={"connect_args": {"timeout": 60}})
+    if kind == "journal":
+        from optuna.storages import JournalStorage
+        try:
+            from optuna.storages.journal import JournalFileBackend
+        except ImportError:                           # optuna < 4
+            from optuna.storages import (
+                JournalFileStorage as JournalFileBackend,
+            )
+        path = journal_path or db_path.with_suffix(".journal")
+        return JournalStorage(JournalFileBackend(str(path)))
+    raise ValueError("storage must be 'sqlite' or 'journal'")
+
+
+def _worker(module: str, storage_kind: str, db_path: str,
+            journal_path: str | None, study_name: str, n_trials: int,
+            fold_jobs: int, threads: int, seed: int,
+            log_mlflow: bool) -> None:
+    from threadpoolctl import threadpool_limits
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    tuner = importlib.import_module(module)
+    storage = make_storage(storage_kind, Path(db_path),
+                           journal_path and Path(journal_path))
+    study = optuna.load_study(
+        study_name=study_name, storage=storage,
+        sampler=optuna.samplers.TPESampler(seed=seed),
+        pruner=make_pruner(os.getenv("CHURN_TUNE_PRUNER", "median")),
+    )
+    X, y = tuner.load_data()
+    callbacks = [tuner.mlflow_callback] if log_mlflow else []
+    with threadpool_limits(limits=fold_jobs * threads):
+        objective = tuner.make_objective(X, y, n_jobs=threads,
+                                         fold_jobs=fold_jobs)
+        study.optimize(objective, n_trials=n_trials, callbacks=callbacks)
+
+
+def run_split(tuner: str, n_trials: int, split: tuple[int, int, int],
+              storage_kind: str = "sqlite",
+              study_name: str | None = None, journal_path: Path | None = None,
+              log_mlflow: bool = True, seed: int = 0) -> dict:
+    """
+    Run `n_trials` across K spawned workers; returns wall time and
+    trials/hour.
+    """
+    module, db_path = TUNERS[tuner]
+    workers, fold_jobs, threads = split
+    storage = make_storage(storage_kind, db_path, journal_path)
+    name = study_name or importlib.import_module(module).STUDY_NAME
+    study = optuna.create_study(study_name=name, direction="maximize",
+                                storage=storage, load_if_exists=True)
+    n_before = len(study.trials)
+
+    per_worker = [n_trials // workers + (i < n_trials % workers)
+                  for i in range(workers)]
+    ctx = mp.get_context("spawn")     # clean OpenMP state in every worker
+    procs = [
+        ctx.Process(target=_worker,
+                    args=(module, storage_kind, str(db_path),
+                          journal_path and str(journal_path), name, n,
+                          fold_jobs, threads, seed + i, log_mlflow))
+        for i, n in enumerate(per_worker) if n
+    ]
+    t0 = time.perf_counter()
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    wall = time.perf_counter() - t0
+    if any(p.exitcode for p in procs):
+        n_failed = sum(bool(p.exitcode) for p in procs)
+        raise RuntimeError(f"{n_failed} tuning worker(s) failed")
+
+    trials = study.get_trials(deepcopy=False)[n_before:]
+    states = optuna.trial.TrialState
+    done = [t for t in trials if t.state in (states.COMPLETE, states.PRUNED)]
+    complete = [t.value for t in trials if t.state == states.COMPLETE]
+    return {
+        "split": "x".join(map(str, split)),
+        "trials": len(done),
+        "pruned": sum(t.state == states.PRUNED for t in done),
+        "wall_s": wall,
+        "trials_per_hour": len(done) / wall * 3600,
+        "best_value": max(complete) if complete else None,
+    }
+
+
+@click.command()
+@click.option("--tuner", type=click.Choice(list(TUNERS)), required=True)
+@click.option("--trials", type=int, default=None,
+              help="Total trials (default: the tuner's budget).")
+@click.option("--split", "split_spec", default=None,
+              help="Workers x fold jobs x booster threads, e.g. 8x1x8 "
+                   "(default: cores/8 workers).")
+@click.option("--storage", type=click.Choice(["sqlite", "journal"]),
+              default="sqlite", show_default=True)
+@click.option("--sweep", default=None,
+              help="Comma-separated splits to time on throw-away journal "
+                   "studies.")
+@click.option("--output", type=click.Path(dir_okay=False), default=None,
+              help="Write the results as JSON.")
+def main(tuner: str, trials: int | None, split_spec: str | None, storage: str,
+         sweep: str | None, output: str | None) -> None:
+    module = importlib.import_module(TUNERS[tuner][0])
+    n_trials = trials or module.N_TRIALS
+    cores = os.cpu_count() or 1
+
+    results = []
+    if sweep:
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            for spec in sweep.split(","):
+                split = parse_split(spec)
+                print(f"⏱️  {spec}: {n_trials} trials …")
+                journal = Path(tmp) / f"{spec}.journal"
+                results.append(run_split(tuner, n_trials, split, "journal",
+                                         study_name=f"sweep_{spec}",
+                                         journal_path=journal,
+                                         log_mlflow=False))
+    else:
+        split = parse_split(split_spec) if split_spec else default_split(cores)
+        print(f"🚀  {tuner}: {n_trials} trials, "
+              f"split {'x'.join(map(str, split))} on {cores} cores")
+        results.append(run_split(tuner, n_trials, split, storage))
+
+    print(f"{'split':<10} {'trials':>6} {'pruned':>6} {'wall s':>8} "
+          f"{'trials/h':>9} {'best':>7}")
+    for r in results:
+        k, f, t = parse_split(r["split"])
+        warn = "  ⚠️ oversubscribed" if k * f * t > cores else ""
+        best = f"{r['best_value']:.4f}" if r["best_value"] is not None else "-"
+        print(f"{r['split']:<10} {r['trials']:>6} {r['pruned']:>6} "
+              f"{r['wall_s']:>8.1f} "
+              f"{r['trials_per_hour']:>9.0f} {best:>7}{warn}")
+
+    if output:
+        with open(output, "w") as fh:
+            json.dump({"tuner": tuner, "cores": cores, "results": results},
+                      fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
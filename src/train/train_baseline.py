@@ -1,26 +1,34 @@
 """
 train_baseline.py – Day 11 Baseline (frozen)
 
-• Loads data/processed/X_train.pkl and y_train.pkl
-• Performs 5‑fold StratifiedKFold CV → records ROC‑AUC & PR‑AUC
+• Opens the memory-mapped training matrix (data/processed/train_matrix/;
+  CHURN_ENCODING=sparse → the CSR store train_matrix_sparse/, `_sparse`
+  outputs)
+• Performs 5‑fold StratifiedKFold CV (src/train/cv.py) → records ROC‑AUC &
+  PR‑AUC and saves the out‑of‑fold predictions →
+  reports/oof/logreg_l2_balanced.npz
 • Retrains on the full training set → saves models/logreg.pkl
 • Logs all hyper‑parameters, metrics, and the model artifact to the
   MLflow experiment “baseline_logreg”
 """
 
 from pathlib import Path
+import os
 import joblib, numpy as np, mlflow, mlflow.sklearn
 from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import StratifiedKFold, cross_validate
+
+from src.features.matrix_store import load_training_data
+from src.train.cv import OOF_DIR, cross_validate_oof, make_cv
 
 # ─────────────────────────────── Paths ────────────────────────────────
 PROJECT_ROOT = Path(__file__).resolve().parents[2]      # src/train/../..
 DATA_DIR     = PROJECT_ROOT / "data" / "processed"
 MODEL_DIR    = PROJECT_ROOT / "models"
 MODEL_DIR.mkdir(exist_ok=True)
+ENCODING = os.getenv("CHURN_ENCODING", "onehot")   # onehot | sparse
+SUFFIX = "" if ENCODING == "onehot" else f"_{ENCODING}"
 
-X = joblib.load(DATA_DIR / "X_train.pkl")
-y = joblib.load(DATA_DIR / "y_train.pkl")
+X, y = load_training_data(DATA_DIR, ENCODING)   # memory-mapped, dense or CSR
 
 # ─────────────────────────────── Cross‑validation ─────────────────────
 clf = LogisticRegression(
@@ -31,12 +39,12 @@ clf = LogisticRegression(
     random_state=42,
 )
 
-cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
-scoring = {"roc_auc": "roc_auc", "pr_auc": "average_precision"}
-scores  = cross_validate(clf, X, y, cv=cv, scoring=scoring, return_estimator=False)
+res = cross_validate_oof(clf, X, y, cv=make_cv())
+scores = res.summary()
+oof_path = res.save(OOF_DIR / f"logreg_l2_balanced{SUFFIX}.npz")
 
-roc_mean, roc_std = scores["test_roc_auc"].mean(), scores["test_roc_auc"].std(ddof=0)
-pr_mean,  pr_std  = scores["test_pr_auc"].mean(),  scores["test_pr_auc"].std(ddof=0)
+roc_mean, roc_std = scores["roc_auc_mean"], scores["roc_auc_std"]
+pr_mean, pr_std = scores["pr_auc_mean"], scores["pr_auc_std"]
 
 print(f"CV ROC‑AUC : {roc_mean:.3f} ± {roc_std:.3f}")
 print(f"CV PR‑AUC  : {pr_mean :.3f} ± {pr_std :.3f}")
@@ -44,7 +52,7 @@ print(f"CV PR‑AUC  : {pr_mean :.3f} ± {pr_std :.3f}")
 # ─────────────────────────────── MLflow Logging ───────────────────────
 mlflow.set_experiment("baseline_logreg")
 
-with mlflow.start_run(run_name="logreg_l2_balanced"):
+with mlflow.start_run(run_name=f"logreg_l2_balanced{SUFFIX}"):
     mlflow.log_params(clf.get_params())
     mlflow.log_metrics({
         "roc_auc_mean": roc_mean,
@@ -52,10 +60,11 @@ with mlflow.start_run(run_name="logreg_l2_balanced"):
         "pr_auc_mean":  pr_mean,
         "pr_auc_std":   pr_std,
     })
+    mlflow.log_artifact(oof_path)
 
     # Train on the full dataset & save the model
     clf.fit(X, y)
-    model_path = MODEL_DIR / "logreg.pkl"
+    model_path = MODEL_DIR / f"logreg{SUFFIX}.pkl"
     joblib.dump(clf, model_path)
     mlflow.log_artifact(model_path)
 
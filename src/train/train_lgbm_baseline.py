@@ -1,22 +1,33 @@
 """
 train_lgbm_baseline.py – Day 19
-* 5-fold CV ROC/PR-AUC on LightGBMClassifier (sklearn API)
+* 5-fold CV ROC/PR-AUC on LightGBMClassifier (sklearn API),
+  OOF → reports/oof/lgbm_default.npz
 * Retrain on full data → save models/lgbm_baseline.txt
+* CHURN_ENCODING=native: ordinal-coded categoricals (train_matrix_native/) as
+  LightGBM categorical features; =sparse: the CSR store (train_matrix_sparse/);
+  outputs get a `_<encoding>` suffix
 * Log to MLflow experiment “baseline_lgbm”
 """
 
 from pathlib import Path
-import joblib, mlflow
-from sklearn.model_selection import StratifiedKFold, cross_validate
+import os
+import mlflow
 from lightgbm import LGBMClassifier
 
+from src.features.matrix_store import categorical_columns, load_training_data
+from src.train.cv import (OOF_DIR, cross_validate_oof, make_cv,
+                          native_categoricals)
+
 # ─── Paths ───────────────────────────────────────────
 ROOT  = Path(__file__).resolve().parents[2]
 DATA  = ROOT / "data" / "processed"
 MODELS = ROOT / "models"; MODELS.mkdir(exist_ok=True)
+# onehot | native (ordinal categoricals) | sparse (CSR)
+ENCODING = os.getenv("CHURN_ENCODING", "onehot")
+SUFFIX = "" if ENCODING == "onehot" else f"_{ENCODING}"
 
-X = joblib.load(DATA / "X_train.pkl")
-y = joblib.load(DATA / "y_train.pkl")
+# memory-mapped train_matrix[_<encoding>]/
+X, y = load_training_data(DATA, ENCODING)
 
 # ─── Model ───────────────────────────────────────────
 clf = LGBMClassifier(
@@ -30,27 +41,31 @@ clf = LGBMClassifier(
     n_jobs=-1,
 )
 
-cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
-scoring = {"roc_auc": "roc_auc", "pr_auc": "average_precision"}
-scores  = cross_validate(clf, X, y, cv=cv, scoring=scoring, return_estimator=False)
+clf, fit_params = native_categoricals(
+    clf, categorical_columns(DATA, ENCODING), X.shape[1])
+
+res = cross_validate_oof(clf, X, y, cv=make_cv(), fit_params=fit_params)
+scores = res.summary()
+oof_path = res.save(OOF_DIR / f"lgbm_default{SUFFIX}.npz")
 
-roc_mu, roc_sd = scores["test_roc_auc"].mean(), scores["test_roc_auc"].std(ddof=0)
-pr_mu , pr_sd  = scores["test_pr_auc"].mean() , scores["test_pr_auc"].std(ddof=0)
+roc_mu, roc_sd = scores["roc_auc_mean"], scores["roc_auc_std"]
+pr_mu, pr_sd = scores["pr_auc_mean"], scores["pr_auc_std"]
 
 print(f"CV ROC-AUC : {roc_mu:.3f} ± {roc_sd:.3f}")
 print(f"CV PR-AUC  : {pr_mu :.3f} ± {pr_sd :.3f}")
 
 # ─── MLflow ──────────────────────────────────────────
 mlflow.set_experiment("baseline_lgbm")
-with mlflow.start_run(run_name="lgbm_default"):
+with mlflow.start_run(run_name=f"lgbm_default{SUFFIX}"):
     mlflow.log_params(clf.get_params())
     mlflow.log_metrics({
         "roc_auc_mean": roc_mu, "roc_auc_std": roc_sd,
         "pr_auc_mean" : pr_mu , "pr_auc_std" : pr_sd,
     })
+    mlflow.log_artifact(oof_path)
 
-    clf.fit(X, y)
-    model_path = MODELS / "lgbm_baseline.txt"
+    clf.fit(X, y, **fit_params)
+    model_path = MODELS / f"lgbm_baseline{SUFFIX}.txt"
     clf.booster_.save_model(model_path)
     mlflow.log_artifact(model_path)
 
@@ -1,16 +1,23 @@
 from pathlib import Path
+import os
 import joblib, mlflow, numpy as np
-from sklearn.model_selection import StratifiedKFold, cross_validate
 from xgboost import XGBClassifier
 
+from src.features.matrix_store import categorical_columns, load_training_data
+from src.train.cv import (OOF_DIR, cross_validate_oof, make_cv,
+                          native_categoricals)
+
 # ─── 路径 ──────────────────────────────────────────────────────────────
 ROOT = Path(__file__).resolve().parents[2]
 DATA = ROOT / "data" / "processed"
 MODEL_DIR = ROOT / "models"
 MODEL_DIR.mkdir(exist_ok=True)
+# onehot | native (ordinal categoricals) | sparse (CSR)
+ENCODING = os.getenv("CHURN_ENCODING", "onehot")
+SUFFIX = "" if ENCODING == "onehot" else f"_{ENCODING}"
 
-X = joblib.load(DATA / "X_train.pkl")
-y = joblib.load(DATA / "y_train.pkl")
+# memory-mapped train_matrix[_<encoding>]/
+X, y = load_training_data(DATA, ENCODING)
 
 # ─── 模型 & CV ────────────────────────────────────────────────────────
 clf = XGBClassifier(
@@ -25,26 +32,31 @@ clf = XGBClassifier(
     n_jobs=-1,
 )
 
-cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
-scoring = {"roc_auc": "roc_auc", "pr_auc": "average_precision"}
-res = cross_validate(clf, X, y, cv=cv, scoring=scoring, n_jobs=-1)
+clf, fit_params = native_categoricals(
+    clf, categorical_columns(DATA, ENCODING), X.shape[1])
+
+res = cross_validate_oof(clf, X, y, cv=make_cv(), n_jobs=-1,
+                         fit_params=fit_params)
+scores = res.summary()
+oof_path = res.save(OOF_DIR / f"xgb_default{SUFFIX}.npz")
 
-roc_mu, roc_sd = res["test_roc_auc"].mean(), res["test_roc_auc"].std(ddof=0)
-pr_mu , pr_sd  = res["test_pr_auc"].mean() , res["test_pr_auc"].std(ddof=0)
+roc_mu, roc_sd = scores["roc_auc_mean"], scores["roc_auc_std"]
+pr_mu, pr_sd = scores["pr_auc_mean"], scores["pr_auc_std"]
 print(f"CV‑ROC AUC : {roc_mu:.3f} ± {roc_sd:.3f}")
 print(f"CV‑PR  AUC : {pr_mu :.3f} ± {pr_sd :.3f}")
 
 # ─── MLflow ──────────────────────────────────────────────────────────
 mlflow.set_experiment("baseline_xgb")
-with mlflow.start_run(run_name="xgb_default"):
+with mlflow.start_run(run_name=f"xgb_default{SUFFIX}"):
     mlflow.log_params(clf.get_params())
     mlflow.log_metrics({
         "roc_auc_mean": roc_mu, "roc_auc_std": roc_sd,
         "pr_auc_mean" : pr_mu , "pr_auc_std" : pr_sd,
     })
+    mlflow.log_artifact(oof_path)
 
-    clf.fit(X, y)
-    model_path = MODEL_DIR / "xgb_baseline.pkl"
+    clf.fit(X, y, **fit_params)
+    model_path = MODEL_DIR / f"xgb_baseline{SUFFIX}.pkl"
     joblib.dump(clf, model_path)
     mlflow.log_artifact(model_path)
 
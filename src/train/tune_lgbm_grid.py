@@ -2,103 +2,171 @@
 tune_lgbm_optuna.py – Day 19
 ────────────────────────────
 • 60 Optuna trials to tune LightGBMClassifier
-• Optimises 5-fold CV PR-AUC (Average Precision)
+• Optimises 5-fold CV PR-AUC (Average Precision); each fold is fitted once
+  and ROC-AUC comes from the same out-of-fold predictions
+  (reports/oof/lgbm_optuna/trial_NNNN.npz)
+• n_estimators is learned, not searched: every fold early-stops on its
+  validation split; the running PR-AUC is reported after each fold so the
+  pruner (CHURN_TUNE_PRUNER = median | halving | none) drops losing trials
+• CHURN_ENCODING=native tunes on ordinal-coded categoricals, =sparse on the
+  CSR matrix (own study, `_<encoding>` suffix on every output)
 • Logs every trial to MLflow experiment “lgbm_optuna”
 • Saves the best booster → models/lgbm_optuna_best.txt
 """
 
 from pathlib import Path
-import joblib, optuna, mlflow
-from sklearn.model_selection import StratifiedKFold, cross_val_score
+import os
+import optuna
+import mlflow
 from lightgbm import LGBMClassifier
 
+from src.features.matrix_store import categorical_columns, load_training_data
+from src.train.cv import (OOF_DIR, cross_validate_oof, make_cv,
+                          native_categoricals)
+from src.train.tuning import (EARLY_STOPPING_ROUNDS, MAX_TREES, fold_reporter,
+                              make_pruner, trial_oof_path)
+
 # ─── Paths ───────────────────────────────────────────────────────────
 ROOT  = Path(__file__).resolve().parents[2]
 DATA  = ROOT / "data" / "processed"
 MODEL = ROOT / "models"; MODEL.mkdir(exist_ok=True)
 DB    = ROOT / "optuna_lgbm.db"            # separate DB from XGB if you like
 
-X = joblib.load(DATA / "X_train.pkl")
-y = joblib.load(DATA / "y_train.pkl")
-cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+ENCODING = os.getenv("CHURN_ENCODING", "onehot")   # onehot | native | sparse
+SUFFIX = "" if ENCODING == "onehot" else f"_{ENCODING}"
+STUDY_NAME = f"lgbm_pr_auc{SUFFIX}"
+N_TRIALS = 60
+
+
+def load_data():
+    return load_training_data(DATA, ENCODING)
+
 
 # ─── Objective ───────────────────────────────────────────────────────
-def objective(trial: optuna.Trial) -> float:
-    params = {
-        # core
-        "n_estimators": trial.suggest_int("n_estimators", 300, 900, step=100),
-        "learning_rate": trial.suggest_float("learning_rate", 1e-3, 0.2, log=True),
-        "max_depth": trial.suggest_int("max_depth", -1, 10),  # -1 = no limit
-        # tree complexity
-        "num_leaves": trial.suggest_int("num_leaves", 31, 255, step=32),
-        "min_child_samples": trial.suggest_int("min_child_samples", 5, 40, step=5),
-        # regularisation
-        "reg_alpha": trial.suggest_float("reg_alpha", 0.0, 1.0),
-        "reg_lambda": trial.suggest_float("reg_lambda", 0.0, 1.0),
-        # subsampling
-        "subsample": trial.suggest_float("subsample", 0.6, 1.0),
-        "colsample_bytree": trial.suggest_float("colsample_bytree", 0.6, 1.0),
-        # fixed
-        "objective": "binary",
-        "metric": "average_precision",     # LightGBM’s AP
-        "random_state": 42,
-        "n_jobs": -1,
-    }
+def make_objective(X, y, n_jobs: int = -1, fold_jobs: int = 1,
+                   categorical=None):
+    """
+    Objective over (X, y); `n_jobs` booster threads, `fold_jobs` folds at a
+    time, `categorical` column indices (default: those of the ENCODING
+    store).
+    """
+    cv = make_cv()
+    if categorical is None:
+        categorical = categorical_columns(DATA, ENCODING)
+
+    def objective(trial: optuna.Trial) -> float:
+        params = {
+            # core (tree count: early stopping up to MAX_TREES)
+            "n_estimators": MAX_TREES,
+            "learning_rate": trial.suggest_float("learning_rate", 1e-3, 0.2,
+                                                 log=True),
+            # -1 = no limit
+            "max_depth": trial.suggest_int("max_depth", -1, 10),
+            # tree complexity
+            "num_leaves": trial.suggest_int("num_leaves", 31, 255, step=32),
+            "min_child_samples": trial.suggest_int("min_child_samples", 5, 40,
+                                                   step=5),
+            # regularisation
+            "reg_alpha": trial.suggest_float("reg_alpha", 0.0, 1.0),
+            "reg_lambda": trial.suggest_float("reg_lambda", 0.0, 1.0),
+            # subsampling
+            "subsample": trial.suggest_float("subsample", 0.6, 1.0),
+            "colsample_bytree": trial.suggest_float("colsample_bytree", 0.6,
+                                                    1.0),
+            # fixed
+            "objective": "binary",
+            "metric": "average_precision",     # LightGBM’s AP
+            "random_state": 42,
+            "n_jobs": n_jobs,
+            "verbose": -1,
+        }
+
+        clf, fit_params = native_categoricals(LGBMClassifier(**params),
+                                              categorical, X.shape[1])
+        res = cross_validate_oof(clf, X, y, cv=cv, n_jobs=fold_jobs,
+                                 early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+                                 on_fold=fold_reporter(trial),
+                                 fit_params=fit_params)
+        scores = res.summary()
+        run_dir = OOF_DIR / f"lgbm_optuna{SUFFIX}"
+        oof_path = res.save(trial_oof_path(run_dir, trial, STUDY_NAME))
 
-    clf = LGBMClassifier(**params)
-    pr_auc = cross_val_score(
-        clf, X, y, cv=cv, scoring="average_precision", n_jobs=-1
-    ).mean()
+        # 额外算一下 ROC-AUC，存在 user_attr 里
+        trial.set_user_attr("roc_auc", scores["roc_auc_mean"])
+        trial.set_user_attr("n_estimators", res.n_estimators)
+        trial.set_user_attr("oof_path", str(oof_path))
 
-    # 额外算一下 ROC-AUC，存在 user_attr 里
-    roc_auc = cross_val_score(
-        clf, X, y, cv=cv, scoring="roc_auc", n_jobs=-1
-    ).mean()
-    trial.set_user_attr("roc_auc", roc_auc)
+        return scores["pr_auc_mean"]  # We maximise PR-AUC
+
+    return objective
 
-    return pr_auc  # We maximise PR-AUC
 
 # ─── Optuna Study ────────────────────────────────────────────────────
-study = optuna.create_study(
-    study_name="lgbm_pr_auc",
-    direction="maximize",
-    storage=f"sqlite:///{DB}",
-    load_if_exists=True,
-)
+def create_study(storage=None) -> optuna.Study:
+    return optuna.create_study(
+        study_name=STUDY_NAME,
+        direction="maximize",
+        storage=storage or f"sqlite:///{DB}",
+        load_if_exists=True,
+        pruner=make_pruner(os.getenv("CHURN_TUNE_PRUNER", "median")),
+    )
 
-# ─── MLflow callback ────────────────────────────────────────────────
-mlflow.set_experiment("lgbm_optuna")
 
-def mlflow_cb(study: optuna.Study, trial: optuna.Trial):
+# ─── MLflow callback ────────────────────────────────────────────────
+def mlflow_callback(study: optuna.Study, trial: optuna.trial.FrozenTrial):
+    if trial.state != optuna.trial.TrialState.COMPLETE:     # pruned / failed
+        return
+    mlflow.set_experiment("lgbm_optuna")
     with mlflow.start_run(run_name=f"trial_{trial.number}"):
         mlflow.log_params(trial.params)
         mlflow.log_metrics({
             "pr_auc": trial.value,
             "roc_auc": trial.user_attrs["roc_auc"],
+            "n_estimators": trial.user_attrs["n_estimators"],
         })
         mlflow.set_tags({"optuna_study": study.study_name})
 
-# ─── Run optimisation ───────────────────────────────────────────────
-study.optimize(objective, n_trials=60, callbacks=[mlflow_cb], show_progress_bar=True)
-
-best = study.best_trial
-print(f"🎯 Best PR-AUC : {best.value:.4f}")
-print("Best params :", best.params)
 
 # ─── Train best model on full data & save ───────────────────────────
-best_params = best.params | {
-    "objective": "binary",
-    "metric": "average_precision",
-    "random_state": 42,
-    "n_jobs": -1,
-}
-best_model = LGBMClassifier(**best_params).fit(X, y)
-out_path = MODEL / "lgbm_optuna_best.txt"
-best_model.booster_.save_model(out_path)
-print("✅ Best model saved →", out_path.relative_to(ROOT))
-
-# log artefact to MLflow
-with mlflow.start_run(run_name="best_model"):
-    mlflow.log_params(best_params)
-    mlflow.log_metric("pr_auc_full", best.value)
-    mlflow.log_artifact(out_path)
+def save_best(study: optuna.Study, X, y) -> Path:
+    best = study.best_trial
+    best_params = best.params | {
+        "n_estimators": best.user_attrs["n_estimators"],
+        "objective": "binary",
+        "metric": "average_precision",
+        "random_state": 42,
+        "n_jobs": -1,
+    }
+    clf, fit_params = native_categoricals(
+        LGBMClassifier(**best_params), categorical_columns(DATA, ENCODING),
+        X.shape[1])
+    best_model = clf.fit(X, y, **fit_params)
+    out_path = MODEL / f"lgbm_optuna_best{SUFFIX}.txt"
+    best_model.booster_.save_model(out_path)
+    print("✅ Best model saved →", out_path.relative_to(ROOT))
+
+    # log artefact to MLflow
+    mlflow.set_experiment("lgbm_optuna")
+    with mlflow.start_run(run_name="best_model"):
+        mlflow.log_params(best_params)
+        mlflow.log_metric("pr_auc_full", best.value)
+        mlflow.log_artifact(out_path)
+    return out_path
+
+
+def main(n_trials: int = N_TRIALS) -> None:
+    X, y = load_data()
+    study = create_study()
+
+    # ─── Run optimisation ───────────────────────────────────────────
+    study.optimize(make_objective(X, y), n_trials=n_trials,
+                   callbacks=[mlflow_callback], show_progress_bar=True)
+
+    best = study.best_trial
+    print(f"🎯 Best PR-AUC : {best.value:.4f}")
+    print("Best params :", best.params)
+    save_best(study, X, y)
+
+
+if __name__ == "__main__":
+    main()
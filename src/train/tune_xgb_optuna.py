@@ -1,70 +1,125 @@
+"""
+tune_xgb_optuna.py
+──────────────────
+• 80 Optuna trials on XGBClassifier, maximising 5-fold CV PR-AUC
+• n_estimators is learned per fold by early stopping (up to MAX_TREES);
+  the pruner (CHURN_TUNE_PRUNER = median | halving | none) sees the running
+  PR-AUC after every fold and stops losing trials early
+• CHURN_ENCODING=native tunes on ordinal-coded categoricals, =sparse on the
+  CSR matrix (own study)
+"""
+
 from pathlib import Path
-import joblib, optuna, mlflow
-import numpy as np
-from sklearn.model_selection import StratifiedKFold, cross_val_score
+import os
+import optuna
+import mlflow
 from xgboost import XGBClassifier
 
+from src.features.matrix_store import categorical_columns, load_training_data
+from src.train.cv import (OOF_DIR, cross_validate_oof, make_cv,
+                          native_categoricals)
+from src.train.tuning import (EARLY_STOPPING_ROUNDS, MAX_TREES, fold_reporter,
+                              make_pruner, trial_oof_path)
+
 
 ROOT     = Path(__file__).resolve().parents[2]       
 DATA_DIR = ROOT / "data" / "processed"
 DB_PATH  = ROOT / "optuna.db"                        
 
 
-X = joblib.load(DATA_DIR / "X_train.pkl")
-y = joblib.load(DATA_DIR / "y_train.pkl")
-cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
-
-
-def objective(trial: optuna.Trial) -> float:
-    params = {
-        "n_estimators":      trial.suggest_int(   "n_estimators", 200, 800, step=100),
-        "max_depth":         trial.suggest_int(   "max_depth",    3,   10),
-        "learning_rate":     trial.suggest_float( "learning_rate", 1e-3, 0.3, log=True),
-        "subsample":         trial.suggest_float( "subsample",    0.5, 1.0),
-        "colsample_bytree":  trial.suggest_float( "colsample_bytree", 0.5, 1.0),
-        "objective": "binary:logistic",
-        "eval_metric": "aucpr",
-        "random_state": 42,
-        "n_jobs": -1,
-    }
-
-    clf = XGBClassifier(**params)
+ENCODING = os.getenv("CHURN_ENCODING", "onehot")   # onehot | native | sparse
+SUFFIX = "" if ENCODING == "onehot" else f"_{ENCODING}"
+STUDY_NAME = f"xgb_pr_auc{SUFFIX}"
+N_TRIALS = 80
+
+
+def load_data():
+    return load_training_data(DATA_DIR, ENCODING)
+
+
+def make_objective(X, y, n_jobs: int = -1, fold_jobs: int = 1,
+                   categorical=None):
+    """
+    Objective over (X, y); `n_jobs` booster threads, `fold_jobs` folds at a
+    time, `categorical` column indices (default: those of the ENCODING
+    store).
+    """
+    cv = make_cv()
+    if categorical is None:
+        categorical = categorical_columns(DATA_DIR, ENCODING)
+
+    def objective(trial: optuna.Trial) -> float:
+        params = {
+            "n_estimators": MAX_TREES,      # early stopping picks the count
+            "max_depth": trial.suggest_int("max_depth", 3, 10),
+            "learning_rate": trial.suggest_float("learning_rate", 1e-3, 0.3,
+                                                 log=True),
+            "subsample": trial.suggest_float("subsample", 0.5, 1.0),
+            "colsample_bytree": trial.suggest_float("colsample_bytree", 0.5,
+                                                    1.0),
+            "objective": "binary:logistic",
+            "eval_metric": "aucpr",
+            "random_state": 42,
+            "n_jobs": n_jobs,
+        }
+
+        clf, fit_params = native_categoricals(XGBClassifier(**params),
+                                              categorical, X.shape[1])
+
+        # one fit per fold; PR-AUC and ROC-AUC from the same OOF predictions
+        res = cross_validate_oof(clf, X, y, cv=cv, n_jobs=fold_jobs,
+                                 early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+                                 on_fold=fold_reporter(trial),
+                                 fit_params=fit_params)
+        scores = res.summary()
+        run_dir = OOF_DIR / f"xgb_optuna{SUFFIX}"
+        oof_path = res.save(trial_oof_path(run_dir, trial, STUDY_NAME))
+
+        trial.set_user_attr("roc_auc", scores["roc_auc_mean"])
+        trial.set_user_attr("n_estimators", res.n_estimators)
+        trial.set_user_attr("oof_path", str(oof_path))
+        return scores["pr_auc_mean"]
+
+    return objective
 
-    pr_auc = cross_val_score(clf, X, y, cv=cv,
-                             scoring="average_precision", n_jobs=-1).mean()
-    roc_auc = cross_val_score(clf, X, y, cv=cv,
-                              scoring="roc_auc", n_jobs=-1).mean()
-
-    trial.set_user_attr("roc_auc", roc_auc)
-    return pr_auc
 
 # ──────────────────────── Optuna Study ───────────────────────
-study = optuna.create_study(
-    study_name="xgb_pr_auc",
-    direction="maximize",
-    storage=f"sqlite:///{DB_PATH}",  
-    load_if_exists=True
-)
-
-
-mlflow.set_experiment("xgb_optuna")
-
-def mlflow_callback(study: optuna.Study, trial: optuna.Trial):
+def create_study(storage=None) -> optuna.Study:
+    return optuna.create_study(
+        study_name=STUDY_NAME,
+        direction="maximize",
+        storage=storage or f"sqlite:///{DB_PATH}",
+        load_if_exists=True,
+        pruner=make_pruner(os.getenv("CHURN_TUNE_PRUNER", "median")),
+    )
+
+
+def mlflow_callback(study: optuna.Study, trial: optuna.trial.FrozenTrial):
+    if trial.state != optuna.trial.TrialState.COMPLETE:     # pruned / failed
+        return
+    mlflow.set_experiment("xgb_optuna")
     with mlflow.start_run(run_name=f"trial_{trial.number}"):
         mlflow.log_params(trial.params)
         mlflow.log_metric("pr_auc", trial.value)
         mlflow.log_metric("roc_auc", trial.user_attrs["roc_auc"])
+        mlflow.log_metric("n_estimators", trial.user_attrs["n_estimators"])
         mlflow.set_tags({"optuna_study": study.study_name})
 
 
-study.optimize(
-    objective,
-    n_trials=80,
-    callbacks=[mlflow_callback],
-    show_progress_bar=True
-)
+def main(n_trials: int = N_TRIALS) -> None:
+    X, y = load_data()
+    study = create_study()
+    study.optimize(
+        make_objective(X, y),
+        n_trials=n_trials,
+        callbacks=[mlflow_callback],
+        show_progress_bar=True
+    )
+
+    best = study.best_trial
+    print(f"🎯 Best PR-AUC : {best.value:.4f}")
+    print("Best params :", best.params)
 
 
-best = study.best_trial
-print(f"🎯 Best PR-AUC : {best.value:.4f}")
-print("Best params :", best.params)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+tuning.py · Shared Optuna helpers for the tuners
+------------------------------------------------
+• make_pruner(kind)     – "median" / "halving" / "none"
+• fold_reporter(trial)  – `on_fold` callback for `cross_validate_oof` that
+                          reports the running CV score after every fold and
+                          stops the trial as soon as the pruner says so
+• trial_oof_path(...)   – where a trial's OOF predictions go, per study
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable
+
+import optuna
+
+PRUNERS = ("median", "halving", "none")
+MAX_TREES = 2000        # cap only — early stopping picks the actual count
+EARLY_STOPPING_ROUNDS = 50
+
+
+def make_pruner(kind: str = "median") -> optuna.pruners.BasePruner:
+    if kind == "median":
+        # judge after the first fold, once a few trials have finished
+        return optuna.pruners.MedianPruner(n_startup_trials=5,
+                                           n_warmup_steps=0)
+    if kind == "halving":
+        return optuna.pruners.SuccessiveHalvingPruner(min_resource=1,
+                                                      reduction_factor=3)
+    if kind == "none":
+        return optuna.pruners.NopPruner()
+    raise ValueError(f"pruner must be one of {PRUNERS}")
+
+
+def fold_reporter(trial: optuna.Trial) -> Callable[[int, float], None]:
+    def report(fold: int, running_score: float) -> None:
+        trial.report(running_score, step=fold)
+        if trial.should_prune():
+            raise optuna.TrialPruned(f"pruned after fold {fold}: "
+                                     f"{running_score:.4f}")
+    return report
+
+
+def trial_oof_path(run_dir: Path, trial: optuna.Trial,
+                   study_name: str) -> Path:
+    """
+    `run_dir/trial_NNNN.npz` for the tuner's own study (`study_name`);
+    other studies (e.g. `launch_tuning --sweep`'s, numbered from 0 again)
+    get their own `run_dir/<study>/` so they can't overwrite its files.
+    """
+    if trial.study.study_name != study_name:
+        run_dir = run_dir / trial.study.study_name
+    return run_dir / f"trial_{trial.number:04d}.npz"
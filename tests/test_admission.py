@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from fastapi.testclient import TestClient
+
+from src.api.admission import (
+    AdmissionController,
+    AdmissionMiddleware,
+    Overloaded,
+)
+
+
+def test_full_queue_and_long_predicted_wait_are_shed():
+    async def run():
+        ctl = AdmissionController(max_concurrency=1, max_queue=1,
+                                  deadline_ms=1000, service_s=0.1)
+        await ctl.acquire()
+        waiter = asyncio.ensure_future(ctl.acquire())
+        await asyncio.sleep(0)
+        assert ctl.queue_depth == 1
+        with pytest.raises(Overloaded) as e:
+            await ctl.acquire()
+        assert e.value.reason == "queue_full" and e.value.retry_after_s >= 1
+        ctl.max_queue = 8
+        with pytest.raises(Overloaded) as e:
+            # 2nd in line ≈ 0.2 s > 50 ms
+            await ctl.acquire(deadline_s=0.05)
+        assert e.value.reason == "deadline"
+        ctl.release(0.1)                # slot goes to the waiter
+        await waiter
+        assert ctl.in_flight == 1 and ctl.queue_depth == 0
+        ctl.release(0.1)
+        assert ctl.in_flight == 0
+        assert ctl.shed == {"queue_full": 1, "deadline": 1}
+
+    asyncio.run(run())
+
+
+def test_waiter_is_shed_at_its_deadline():
+    async def run():
+        ctl = AdmissionController(max_concurrency=1, max_queue=4,
+                                  service_s=0.001)
+        await ctl.acquire()
+        with pytest.raises(Overloaded) as e:
+            await ctl.acquire(deadline_s=0.02)
+        assert e.value.reason == "deadline" and ctl.queue_depth == 0
+        ctl.release()
+        assert ctl.in_flight == 0
+
+    asyncio.run(run())
+
+
+def test_middleware_answers_503_with_retry_after():
+    ctl = AdmissionController(max_concurrency=1, max_queue=0)
+
+    async def score(request):
+        return JSONResponse({"ok": True})
+
+    app = Starlette(routes=[Route("/score", score), Route("/health", score)])
+    client = TestClient(AdmissionMiddleware(app, routes={"/score": ctl}))
+    assert client.get("/score").status_code == 200 and ctl.in_flight == 0
+
+    ctl.in_flight = 1                   # slot held by someone else
+    r = client.get("/score")
+    assert r.status_code == 503 and int(r.headers["retry-after"]) >= 1
+    assert "queue_full" in r.json()["detail"]
+    # unlisted paths pass through
+    assert client.get("/health").status_code == 200
@@ -46,3 +46,222 @@ def test_top_features_len():
     js = resp.json()
     assert "top_features" in js
     assert len(js["top_features"]) == 3
+
+
+def test_batch_matches_single():
+    bodies = [_make_body({"tenure": t}) for t in (1, 12, 40)]
+    bodies = [{**b, "customer_id": f"{i:04d}"} for i, b in enumerate(bodies)]
+    resp = client.post("/predict/batch", json=bodies)
+    assert resp.status_code == 200
+    js = resp.json()
+    assert js["n_ok"] == 3 and js["n_failed"] == 0
+    for body, res in zip(bodies, js["results"]):
+        single = client.post("/predict", json=body).json()
+        assert res["customer_id"] == body["customer_id"]
+        diff = res["churn_probability"] - single["churn_probability"]
+        assert abs(diff) < 1e-6
+        assert res["top_features"] == single["top_features"]
+
+
+def test_batch_reports_row_errors():
+    bad = _make_body({"tenure": 500})
+    bad["customer_id"] = "bad"
+    resp = client.post("/predict/batch",
+                       json=[_make_body(), bad, _make_body()])
+    assert resp.status_code == 200
+    js = resp.json()
+    assert js["n_ok"] == 2 and js["n_failed"] == 1
+    assert js["results"][1]["customer_id"] == "bad"
+    assert "tenure" in js["results"][1]["error"]
+    assert js["results"][0]["churn_probability"] is not None
+
+
+def test_batch_throughput_vs_predict_loop(monkeypatch):
+    """
+    Against looping over the real /predict (compiled single-row path): 10x
+    without explanations; with them the batch is bound by the booster's
+    per-row TreeSHAP cost (~0.7 ms/row on the 800-tree model), so 5x.
+    """
+    import time
+    import src.api.app as api
+    n_single, n_batch = 30, 1000
+
+    # measure vectorization, not cache hits
+    monkeypatch.setattr(api.CACHE, "max_size", 0)
+
+    for explain, target in ((False, 10), (True, 5)):
+        bodies = [{**_make_body({"tenure": i % 73}), "explain": explain}
+                  for i in range(n_batch)]
+        client.post("/predict", json=bodies[0])                 # warm-up
+        client.post("/predict/batch", json=bodies[:10])
+        t0 = time.perf_counter()
+        for body in bodies[:n_single]:
+            assert client.post("/predict", json=body).status_code == 200
+        single_rps = n_single / (time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        resp = client.post("/predict/batch", json=bodies)
+        batch_rps = n_batch / (time.perf_counter() - t0)
+
+        assert resp.status_code == 200 and resp.json()["n_ok"] == n_batch
+        assert batch_rps >= target * single_rps, (
+            f"explain={explain}: {batch_rps:.0f} vs {single_rps:.0f} rows/s")
+
+
+def test_healthz_and_readyz():
+    import time
+    with TestClient(app) as c:                  # runs the lifespan startup
+        assert c.get("/healthz").json() == {"status": "ok"}
+        deadline = time.time() + 60
+        while ((resp := c.get("/readyz")).status_code == 503
+               and time.time() < deadline):
+            time.sleep(0.05)
+        assert resp.status_code == 200
+        startup = resp.json()["startup"]
+        for key in ("import_s", "artifact_load_s", "warmup_s"):
+            assert startup[key] >= 0
+
+
+def test_explain_false_skips_top_features():
+    body = _make_body()
+    body["explain"] = False
+    js = client.post("/predict", json=body).json()
+    assert js["top_features"] == []
+    full = client.post("/predict", json=_make_body()).json()
+    assert abs(js["churn_probability"] - full["churn_probability"]) < 1e-6
+
+
+def test_native_and_shap_backends_agree():
+    import src.api.app as api
+    from src.api.artifacts import Artifacts
+    art = api.get_artifacts()
+    shap_art = Artifacts(art.model, art.pipe, explain_backend="shap")
+    bodies = [_make_body({"tenure": t, "Contract": c})
+              for t in (0, 5, 30, 70) for c in ("Month-to-month", "Two year")]
+    reqs = [api.PredictRequest.model_validate(b) for b in bodies]
+    native = api._score_requests(art, reqs)
+    shap_res = api._score_requests(shap_art, reqs)
+    for a, b in zip(native, shap_res):
+        assert abs(a["churn_probability"] - b["churn_probability"]) < 1e-5
+        assert a["top_features"] == b["top_features"]
+
+
+def test_sparse_pipeline_scores_csr_on_both_paths(monkeypatch):
+    import pandas as pd
+    import scipy.sparse as sp
+    from lightgbm import LGBMClassifier
+    from xgboost import XGBClassifier
+
+    import src.api.app as api
+    from src.api.artifacts import Artifacts
+    from src.features import feature_lists as fl
+    from src.features.feature_pipeline import build_preprocessor
+
+    df = pd.read_parquet("data/clean/telco_clean.parquet")
+    y = (df["Churn"] == "Yes").to_numpy()
+    pipe, _ = build_preprocessor(encoding="sparse")
+    X = pipe.fit_transform(
+        df[fl.numeric_features + fl.categorical_low_card], y)
+    assert sp.issparse(X) and X.format == "csr"
+
+    bodies = [_make_body({"tenure": t, "InternetService": s})
+              for t in (0, 9, 30, 70) for s in ("DSL", "Fiber optic", "No")]
+    reqs = [api.PredictRequest.model_validate(b) for b in bodies]
+    # score both times
+    monkeypatch.setattr(api.CACHE, "max_size", 0)
+    for model in (XGBClassifier(n_estimators=30, max_depth=3),
+                  LGBMClassifier(n_estimators=30, verbose=-1)):
+        art = Artifacts(model.fit(X, y), pipe)
+        assert art.encoder is not None
+        assert sp.issparse(art.encoder.transform([reqs[0].data]))
+        small = api._score_requests(art, reqs)        # compiled encoder
+        with monkeypatch.context() as m:
+            m.setattr(api, "ENCODER_MAX_ROWS", 0)
+            large = api._score_requests(art, reqs)    # PIPE.transform
+        for a, b in zip(small, large):
+            assert "error" not in a and len(a["top_features"]) == 3
+            assert abs(a["churn_probability"] - b["churn_probability"]) < 1e-6
+            assert a["top_features"] == b["top_features"]
+
+
+def test_metrics_endpoint_counts_stages_and_errors():
+    client.post("/predict", json=_make_body())
+    client.post("/predict", json=_make_body({"tenure": "lots"}))      # 422
+    client.post("/predict/batch",
+                json=[_make_body(), {"customer_id": "x", "data": {}}])
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = resp.text
+    for stage in ("validate", "transform"):
+        assert f'churn_stage_seconds_count{{stage="{stage}"}}' in text
+    assert 'churn_http_requests_total{route="/predict",status="200"}' in text
+    assert ('churn_http_errors_total{route="/predict",reason="validation"}'
+            in text)
+    assert ('churn_row_errors_total{route="/predict/batch",'
+            'reason="validation"}' in text)
+    assert 'churn_http_requests_in_flight{route="/predict"} 0' in text
+    assert "churn_cache_lookups_total" in text
+
+
+def test_model_admin_promote_and_shadow(monkeypatch):
+    import src.api.app as api
+    name = api.MODELS.serving_name
+    assert client.get("/models").json()["serving"] == name
+    assert client.post(f"/models/{name}/promote").status_code == 403
+    monkeypatch.setattr(api, "ADMIN_TOKEN", "s3cret")
+    resp = client.post(f"/models/{name}/promote",
+                       headers={"X-Admin-Token": "x"})
+    assert resp.status_code == 401
+    headers = {"X-Admin-Token": "s3cret"}
+    resp = client.post("/models/nope/promote", headers=headers)
+    assert resp.status_code == 404
+    resp = client.post(f"/models/{name}/promote", headers=headers)
+    assert resp.json()["models"][name]["warm"]
+
+    resp = client.post("/models/shadow", json={"name": name, "fraction": 1.0},
+                       headers=headers)
+    assert resp.json()["shadow"]["fraction"] == 1.0
+    try:
+        body = _make_body({"tenure": 11})
+        resp = client.post("/predict/batch", json=[body, body])
+        assert resp.json()["n_ok"] == 2
+        api.MODELS.shadow.join()
+        stats = client.get("/models").json()["shadow"]
+        # challenger == serving
+        assert stats["scored"] >= 2 and stats["max_abs_diff"] < 1e-5
+        assert ('churn_shadow_rows_total{model="default",outcome="scored"}'
+                in client.get("/metrics").text)
+    finally:
+        client.post("/models/shadow", json={"name": None}, headers=headers)
+    assert not api.MODELS.shadow.active
+
+
+def test_serves_flattened_npz_model(tmp_path, monkeypatch):
+    import threading
+    import src.api.app as api
+    from src.api.registry import ModelRegistry, ModelSpec
+    from src.models import final_model
+    from src.models.flat_trees import export
+
+    flat = export(final_model.load(api.MODEL_PATH))
+    path = final_model.save(flat, tmp_path / "model.npz")
+    registry = ModelRegistry({"flat": ModelSpec(path, api.PIPE_PATH)}, "flat",
+                             warm_fn=lambda art: api.warm_up(art))
+    monkeypatch.setattr(api, "MODELS", registry)
+    monkeypatch.setattr(api, "STARTUP", {})
+    monkeypatch.setattr(api, "_ready", threading.Event())
+    monkeypatch.setattr(api, "MODEL_WATCH_S", 0)
+    api._startup()
+
+    ready = client.get("/readyz")
+    assert ready.status_code == 200
+    assert ready.json()["startup"]["model"] == "flat"
+    assert registry.serving.explain_backend == "none"
+    body = _make_body({"tenure": 13})
+    got = client.post("/predict", json=body).json()
+    assert got["top_features"] == [] and 0 < got["churn_probability"] < 1
+    batch = client.post("/predict/batch", json=[body, body]).json()
+    assert batch["n_ok"] == 2
+    first = batch["results"][0]["churn_probability"]
+    assert abs(first - got["churn_probability"]) < 1e-6
@@ -0,0 +1,50 @@
+import asyncio
+import time
+
+import pytest
+
+from src.api.batcher import MicroBatcher
+
+
+def test_concurrent_submits_are_coalesced():
+    sizes = []
+
+    def score(items):
+        sizes.append(len(items))
+        time.sleep(0.01)
+        return [x * 10 for x in items]
+
+    async def main():
+        b = MicroBatcher(score, max_batch_size=8, max_wait_ms=20)
+        return await asyncio.gather(*(b.submit(i) for i in range(20)))
+
+    assert asyncio.run(main()) == [i * 10 for i in range(20)]
+    assert max(sizes) == 8 and sum(sizes) == 20 and len(sizes) < 20
+
+
+def test_zero_wait_does_not_delay_lone_request():
+    async def main():
+        b = MicroBatcher(lambda items: items, max_batch_size=64, max_wait_ms=0)
+        t0 = time.perf_counter()
+        await b.submit("x")
+        return time.perf_counter() - t0
+
+    assert asyncio.run(main()) < 0.5
+
+
+def test_score_errors_reach_every_caller():
+    def boom(items):
+        raise RuntimeError("model exploded")
+
+    async def main():
+        b = MicroBatcher(boom, max_batch_size=4, max_wait_ms=5)
+        return await asyncio.gather(*(b.submit(i) for i in range(3)),
+                                    return_exceptions=True)
+
+    res = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in res)
+
+
+def test_invalid_batch_size():
+    with pytest.raises(ValueError):
+        MicroBatcher(lambda items: items, max_batch_size=0)
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from benchmarks.bench_clean import write_raw_csv
+from benchmarks.suite import STAGES, cli, compare, run_stages
+
+
+def _result(commit, **stages):
+    return {"commit": commit, "sizes": {"10000": {
+        name: {"wall_s": s, "rows": 10000, "rss_mb": mb, "peak_rss_mb": mb}
+        for name, (s, mb) in stages.items()}}}
+
+
+def test_run_stages_times_every_stage(tmp_path):
+    csv = tmp_path / "raw.csv"
+    write_raw_csv(csv, 2000)
+    res = run_stages(csv, "models/xgb_optuna_best.pkl", shap_rows=50)
+    assert list(res) == list(STAGES)
+    assert res["impute"]["rows"] == 2000 and res["shap"]["rows"] == 50
+    assert all(s["wall_s"] > 0 and s["peak_rss_mb"] >= s["rss_mb"] > 0
+               for s in res.values())
+
+
+@pytest.mark.parametrize("new, regressed", [
+    ((0.50, 100), False),       # 5 % slower: within threshold
+    ((0.70, 100), True),        # 40 % slower
+    ((0.50, 150), True),        # peak memory +50 %
+])
+def test_compare_flags_regressions(new, regressed):
+    base = _result("a", predict_proba=(0.48, 100), impute=(0.001, 100))
+    # 3× but below noise floor
+    cur = _result("b", predict_proba=new, impute=(0.003, 100))
+    rows = {r["stage"]: r for r in compare(base, cur, threshold=0.10)}
+    assert rows["predict_proba"]["regression"] is regressed
+    assert rows["impute"]["regression"] is False
+
+
+def test_compare_cli_exit_code(tmp_path):
+    base, slow = tmp_path / "a.json", tmp_path / "b.json"
+    base.write_text(json.dumps(_result("a", predict_proba=(0.5, 100))))
+    slow.write_text(json.dumps(_result("b", predict_proba=(1.0, 100))))
+    runner = CliRunner()
+    assert runner.invoke(cli, ["compare", str(base), str(base)]).exit_code == 0
+    assert runner.invoke(cli, ["compare", str(base), str(slow)]).exit_code == 1
+    res = runner.invoke(cli, ["compare", str(base), str(slow),
+                              "--threshold", "1.5"])
+    assert res.exit_code == 0
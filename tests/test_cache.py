@@ -0,0 +1,75 @@
+import os
+from src.api.artifacts import artifact_fingerprint
+from src.api.cache import PredictionCache, cache_key
+from src.api.schemas import TELCO_EXAMPLE, TelcoInput
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def test_lru_eviction_and_counters():
+    cache = PredictionCache(max_size=2, ttl_s=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1            # a is now most recent
+    cache.put("c", 3)                     # evicts b
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    st = cache.stats()
+    assert st["hits"] == 2 and st["misses"] == 1
+    assert st["evictions"] == 1 and st["size"] == 2
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = PredictionCache(max_size=10, ttl_s=5, clock=clock)
+    cache.put("a", 1)
+    clock.t = 4.9
+    assert cache.get("a") == 1
+    clock.t = 5.0
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_invalidated_when_artifact_changes(tmp_path):
+    clock = FakeClock()
+    f = tmp_path / "model.pkl"
+    f.write_bytes(b"v1")
+    cache = PredictionCache(max_size=10, ttl_s=60, clock=clock,
+                            check_interval_s=1,
+                            version_fn=lambda: artifact_fingerprint(f))
+    cache.put("a", 1)
+    f.write_bytes(b"v2-longer")
+    os.utime(f, ns=(1, 1))
+    assert cache.get("a") == 1            # not re-checked yet
+    clock.t = 1.0
+    assert cache.get("a") is None
+    assert cache.stats()["invalidations"] == 1 and len(cache) == 0
+
+
+def test_key_is_canonical():
+    a = TelcoInput(**TELCO_EXAMPLE)
+    b = TelcoInput(**{**TELCO_EXAMPLE, "tenure": "12",
+                      "MonthlyCharges": 84.50})
+    assert cache_key(a, True, "v") == cache_key(b, True, "v")
+    assert cache_key(a, True, "v") != cache_key(a, False, "v")
+    assert cache_key(a, True, "v") != cache_key(a, True, "w")
+
+
+def test_api_serves_repeats_from_cache():
+    from fastapi.testclient import TestClient
+    from src.api.app import CACHE, app
+    client = TestClient(app)
+    body = {"customer_id": "c1", "data": {**TELCO_EXAMPLE, "tenure": 33}}
+    first = client.post("/predict", json=body).json()
+    hits = CACHE.hits
+    second = client.post("/predict", json={**body, "customer_id": "c2"}).json()
+    assert CACHE.hits == hits + 1
+    assert second["customer_id"] == "c2"
+    assert second["churn_probability"] == first["churn_probability"]
+    assert client.get("/cache/stats").json()["hits"] >= 1
@@ -35,3 +35,103 @@ def test_outlier_clipping():
         iqr = q3 - q1
         low, high = q1 - 1.5 * iqr, q3 + 1.5 * iqr
         assert df_clean[col].between(low, high).all(), f"Outliers remain in {col}"
+
+
+def test_streaming_matches_in_memory(tmp_path):
+    out = tmp_path / "stream.parquet"
+    cln.main.callback(input=str(RAW), output=str(out), chunksize=997)
+    df_stream = pd.read_parquet(out)
+
+    assert df_stream.shape == df_clean.shape
+    assert (df_stream.dtypes == df_clean.dtypes).all()
+    num_cols = df_clean.select_dtypes(include="number").columns
+    other = df_clean.columns.difference(num_cols)
+    pd.testing.assert_frame_equal(df_stream[other], df_clean[other])
+    # only winsorizing is approximate: quartiles within sketch alpha (0.5 %)
+    for col in num_cols:
+        q1, q3 = df_clean[col].quantile([0.25, 0.75])
+        tol = 0.005 * (1 + 2 * 1.5) * max(abs(q1), abs(q3))
+        assert (df_stream[col] - df_clean[col]).abs().max() <= tol, col
+
+
+def test_quantile_sketch_merge_and_accuracy():
+    from src.data.sketch import QuantileSketch
+    rng = np.random.default_rng(0)
+    x = np.concatenate([rng.lognormal(3, 1, 50_000), np.zeros(100),
+                        -rng.exponential(5, 1000)])
+    parts = [QuantileSketch(0.01) for _ in range(4)]
+    for sk, chunk in zip(parts, np.array_split(rng.permutation(x), 4)):
+        sk.add(chunk)
+    merged = parts[0]
+    for sk in parts[1:]:
+        merged.merge(sk)
+    assert merged.count == len(x)
+    for q in (0.01, 0.25, 0.5, 0.75, 0.99):
+        exact = np.quantile(x, q, method="lower")
+        assert abs(merged.quantile(q) - exact) <= 0.01 * abs(exact) + 1e-9
+
+
+def test_schema_dtypes_and_domains(tmp_path):
+    csv = tmp_path / "raw.csv"
+    raw = pd.read_csv(RAW, nrows=50)
+    raw.loc[0, "Contract"] = "Three year"       # outside the declared domain
+    raw["TotalCharges"] = raw["TotalCharges"].astype(str)
+    raw.loc[1, "TotalCharges"] = " "
+    raw.loc[2, "tenure"] = 120                  # beyond the fences, still int8
+    raw.to_csv(csv, index=False)
+
+    df = cln.winsorize_iqr(cln.impute(cln.load_raw(csv)))
+    assert df["tenure"].dtype == "int8"
+    assert df["TotalCharges"].dtype == "float32"
+    assert df["Contract"].dtype == "category"
+    assert df.loc[0, "Contract"] == "Unknown"
+    assert df.isna().sum().sum() == 0
+    assert df["tenure"].max() <= 72 + 1.5 * 72
+
+
+def test_out_of_domain_values_counted_apart_from_nulls(tmp_path, caplog):
+    import pytest
+    csv = tmp_path / "raw.csv"
+    raw = pd.read_csv(RAW, nrows=50)
+    raw.loc[[0, 3], "Contract"] = "Three year"
+    raw.loc[4, "PaymentMethod"] = np.nan             # a true null, not counted
+    raw.to_csv(csv, index=False)
+
+    for chunksize in (None, 7):
+        counts: dict[str, int] = {}
+        if chunksize:
+            df = pd.concat(cln.iter_raw(csv, chunksize, counts))
+        else:
+            df = cln.load_raw(csv, counts)
+        assert counts["Contract"] == 2 and counts.get("PaymentMethod", 0) == 0
+        assert df["Contract"].isna().sum() == 2
+        assert df["PaymentMethod"].isna().sum() == 1
+
+    with caplog.at_level("WARNING"):
+        cln.report_out_of_domain(counts, 50, max_fraction=0.05)
+    assert "Contract: 2 value(s) outside the declared domain" in caplog.text
+    with pytest.raises(ValueError, match="Contract"):
+        cln.report_out_of_domain(counts, 50, max_fraction=0.01)
+    with pytest.raises(ValueError):
+        cln.main.callback(input=str(csv), output=str(tmp_path / "o.parquet"),
+                          chunksize=7, max_out_of_domain=0.01)
+
+
+def test_category_order_is_declared_order_on_both_paths(tmp_path):
+    from src.data import schema
+    raw = pd.read_csv(RAW, nrows=300)
+    # "Two year", "Yes" first
+    raw = raw.sort_values(["Contract", "Partner"], ascending=False)
+    csv = tmp_path / "raw.csv"
+    raw.to_csv(csv, index=False)
+    mem, stream = tmp_path / "mem.parquet", tmp_path / "stream.parquet"
+    cln.main.callback(input=str(csv), output=str(mem))
+    cln.main.callback(input=str(csv), output=str(stream), chunksize=37)
+
+    df_mem, df_stream = pd.read_parquet(mem), pd.read_parquet(stream)
+    for col in df_mem.columns.intersection(list(schema.CATEGORIES)):
+        declared = schema.CATEGORIES[col]
+        cats = df_mem[col].cat.categories.tolist()
+        assert cats[:len(declared)] == declared, col
+        assert df_stream[col].cat.categories.tolist() == cats, col
+        assert (df_stream[col].cat.codes == df_mem[col].cat.codes).all(), col
@@ -0,0 +1,136 @@
+import io
+import json
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi.testclient import TestClient
+
+import src.api.app as api
+from benchmarks.synth import make_frame, make_payloads
+from src.api import columnar
+
+client = TestClient(api.app)
+
+
+def _frame(n=40):
+    df = make_frame(n, seed=11)
+    df.insert(0, "customer_id", [f"C{i:07d}" for i in range(n)])
+    df.loc[3, "gender"] = "X"
+    df.loc[4, "tenure"] = 99
+    df.loc[5, "MonthlyCharges"] = -1.0
+    df["SeniorCitizen"] = df["SeniorCitizen"].astype(float)
+    df.loc[6, "SeniorCitizen"] = 0.5
+    return df
+
+
+def _arrow(table: pa.Table) -> bytes:
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _post(body: bytes, ctype: str, **params):
+    return client.post("/predict/bulk", content=body, params=params,
+                       headers={"content-type": ctype})
+
+
+def test_validation_matches_pydantic_messages(monkeypatch):
+    monkeypatch.setattr(api.CACHE, "max_size", 0)
+    df = _frame()
+    v = columnar.validate_table(pa.Table.from_pandas(df, preserve_index=False))
+    assert v.valid.sum() == len(df) - 4 and len(v.frame) == len(df) - 4
+
+    records = df.drop(columns="customer_id").to_dict(orient="records")
+    bodies = [{"customer_id": c, "data": r}
+              for c, r in zip(df["customer_id"], records)]
+    ref = client.post("/predict/batch", json=bodies).json()["results"]
+    for i in (3, 4, 5, 6):
+        assert v.errors[i] == ref[i]["error"].replace("data.", "")
+
+
+def test_arrow_matches_json_batch(monkeypatch):
+    monkeypatch.setattr(api.CACHE, "max_size", 0)
+    df = _frame()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    resp = _post(_arrow(table), columnar.ARROW)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == columnar.ARROW
+    out = pa.ipc.open_stream(resp.content).read_all().to_pylist()
+
+    records = df.drop(columns="customer_id").to_dict(orient="records")
+    bodies = [{"customer_id": c, "data": r}
+              for c, r in zip(df["customer_id"], records)]
+    ref = client.post("/predict/batch", json=bodies).json()["results"]
+    for got, want in zip(out, ref):
+        assert got["customer_id"] == want["customer_id"]
+        if want.get("error"):
+            assert got["churn_probability"] is None
+            assert got["top_features"] is None
+            assert got["error"]
+        else:
+            assert got["churn_probability"] == want["churn_probability"]
+            assert got["top_features"] == want["top_features"]
+            assert got["error"] is None
+
+
+def test_parquet_and_streamed_ndjson(monkeypatch):
+    monkeypatch.setattr(api, "NDJSON_BLOCK_BYTES", 2000)      # several blocks
+    df = _frame()
+    buf = io.BytesIO()
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), buf)
+    resp = _post(buf.getvalue(), columnar.PARQUET, explain="false")
+    table = pq.read_table(pa.BufferReader(resp.content))
+    assert table.num_rows == len(df)
+    assert "top_features" not in table.column_names
+
+    # nested `data`, like the JSON routes
+    bodies = make_payloads(25, seed=2)
+    bodies[7]["data"]["Contract"] = "Weekly"
+    nd = "".join(json.dumps(b) + "\n" for b in bodies).encode()
+    text = _post(nd, columnar.NDJSON).text
+    lines = [json.loads(line) for line in text.splitlines()]
+    assert ([r["customer_id"] for r in lines]
+            == [b["customer_id"] for b in bodies])
+    assert lines[7]["error"].startswith("Validation failed: Contract")
+    assert all(r["churn_probability"] is not None
+               for i, r in enumerate(lines) if i != 7)
+
+
+def test_bad_bodies():
+    assert _post(b"x", "text/csv").status_code == 415
+    table = pa.Table.from_pandas(_frame().drop(columns=["tenure"]),
+                                 preserve_index=False)
+    resp = _post(_arrow(table), columnar.ARROW)
+    assert resp.status_code == 400 and "tenure" in resp.json()["detail"]
+    assert _post(b"not arrow", columnar.ARROW).status_code == 400
+
+
+def test_malformed_ndjson_line_fails_alone():
+    bodies = make_payloads(6, seed=3)
+    # string where the others have numbers, number where they have strings
+    bodies[1]["data"]["tenure"] = "lots"
+    bodies[3]["customer_id"] = 12345
+    lines = [json.dumps(b) for b in bodies]
+    lines.insert(5, "{not json")
+    resp = _post(("\n".join(lines) + "\n").encode(), columnar.NDJSON,
+                 explain="false")
+    out = [json.loads(line) for line in resp.text.splitlines()]
+
+    assert len(out) == 7
+    assert out[1]["customer_id"] == bodies[1]["customer_id"]
+    assert out[1]["error"].startswith("Validation failed: tenure")
+    assert out[3]["customer_id"] == "12345"
+    assert out[3]["churn_probability"] is not None
+    assert out[5] == {"error": out[5]["error"]}
+    assert "Unreadable NDJSON line" in out[5]["error"]
+    ok = [0, 2, 3, 4, 6]
+    assert all(out[i]["error"] is None
+               and out[i]["churn_probability"] is not None for i in ok)
+    bodies[3]["customer_id"] = "12345"
+    valid = [b for i, b in enumerate(bodies) if i != 1]
+    ref = client.post("/predict/batch", json=valid).json()
+    np.testing.assert_allclose([out[i]["churn_probability"] for i in ok],
+                               [r["churn_probability"]
+                                for r in ref["results"]], atol=1e-5)
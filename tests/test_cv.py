@@ -0,0 +1,118 @@
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import cross_validate
+
+from src.train.cv import CVResult, compare, cross_validate_oof, make_cv
+
+X, y = make_classification(n_samples=600, n_features=12, weights=[0.75],
+                           random_state=0)
+
+
+class CountingLR(LogisticRegression):
+    n_fits = 0
+
+    def fit(self, X, y, **kw):
+        type(self).n_fits += 1
+        return super().fit(X, y, **kw)
+
+
+def test_one_fit_per_fold_and_sklearn_parity():
+    CountingLR.n_fits = 0
+    res = cross_validate_oof(CountingLR(max_iter=1000), X, y, cv=make_cv())
+    assert CountingLR.n_fits == 5                    # not 5 per metric
+
+    assert not np.isnan(res.oof).any()
+    assert np.bincount(res.folds).tolist() == [120] * 5
+
+    scoring = {"roc_auc": "roc_auc", "pr_auc": "average_precision"}
+    ref = cross_validate(LogisticRegression(max_iter=1000), X, y, cv=make_cv(),
+                         scoring=scoring)
+    np.testing.assert_allclose(res.fold_scores("roc_auc"), ref["test_roc_auc"])
+    np.testing.assert_allclose(res.fold_scores("pr_auc"), ref["test_pr_auc"])
+
+
+def test_oof_roundtrip(tmp_path):
+    res = cross_validate_oof(LogisticRegression(max_iter=1000), X, y,
+                             meta={"run": "lr"})
+    path = res.save(tmp_path / "lr.npz")
+    back = CVResult.load(path)
+    assert back.meta["run"] == "lr"
+    metrics = ["roc_auc", "pr_auc", "brier"]
+    assert back.summary(metrics) == res.summary(metrics)
+    table = compare({"a": res, "b": back})
+    assert list(table.columns) == ["roc_auc_mean", "roc_auc_std",
+                                   "pr_auc_mean", "pr_auc_std"]
+
+
+def test_early_stopping_learns_tree_count(tmp_path):
+    from xgboost import XGBClassifier
+    clf = XGBClassifier(n_estimators=1000, learning_rate=0.3, max_depth=3,
+                        eval_metric="aucpr")
+    res = cross_validate_oof(clf, X, y, early_stopping_rounds=10)
+    assert len(res.best_iterations) == 5
+    assert 0 < res.n_estimators < 1000
+    back = CVResult.load(res.save(tmp_path / "es.npz"))
+    assert back.n_estimators == res.n_estimators
+
+
+def test_fold_reporter_prunes_bad_trial():
+    import optuna
+    from src.train.tuning import fold_reporter
+
+    pruner = optuna.pruners.MedianPruner(n_startup_trials=1)
+    study = optuna.create_study(direction="maximize", pruner=pruner)
+    good = study.ask()
+    cross_validate_oof(LogisticRegression(max_iter=1000), X, y,
+                       on_fold=fold_reporter(good))
+    study.tell(good, 1.0)
+
+    bad, seen = study.ask(), []
+
+    def on_fold(k, score):
+        seen.append(k)
+        fold_reporter(bad)(k, score)
+
+    # no signal → worse than median
+    shuffled = np.random.default_rng(0).permutation(y)
+    try:
+        cross_validate_oof(LogisticRegression(max_iter=1000), X, shuffled,
+                           on_fold=on_fold)
+    except optuna.TrialPruned:
+        pass
+    assert seen == [0]
+
+
+def test_native_categoricals_for_both_boosters():
+    from lightgbm import LGBMClassifier
+    from xgboost import XGBClassifier
+
+    from src.train.cv import native_categoricals
+    rng = np.random.default_rng(0)
+    code = rng.integers(0, 6, 600).astype(float)
+    Xc = np.c_[rng.normal(size=600), code]
+    yc = np.isin(code, [1, 4]).astype(int)    # not ordinal in the code
+
+    xgb, kw = native_categoricals(
+        XGBClassifier(n_estimators=20, max_depth=2), [1], 2)
+    assert kw == {} and xgb.get_params()["feature_types"] == ["q", "c"]
+    lgbm, kw = native_categoricals(
+        LGBMClassifier(n_estimators=20, verbose=-1), [1], 2)
+    assert kw == {"categorical_feature": [1]}
+
+    for est, fit_params in ((xgb, {}), (lgbm, kw)):
+        res = cross_validate_oof(est, Xc, yc, fit_params=fit_params)
+        assert res.summary()["roc_auc_mean"] > 0.99
+    lr = LogisticRegression()
+    assert native_categoricals(lr, [], 2) == (lr, {})
+
+
+def test_on_fold_runs_in_waves_with_all_cores(monkeypatch):
+    import joblib
+
+    from src.train import cv
+    monkeypatch.setattr(joblib, "effective_n_jobs", lambda n_jobs: 2)
+    seen = []
+    cv.cross_validate_oof(LogisticRegression(max_iter=1000), X, y, n_jobs=-1,
+                          on_fold=lambda k, score: seen.append(k))
+    assert seen == [1, 3, 4]                    # waves of 2 over 5 folds
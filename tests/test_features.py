@@ -10,3 +10,97 @@ def test_pipeline_shape_and_nan():
     X_t = pipe.fit_transform(X_raw, y)
     assert X_t.shape[0] == len(y)
     assert not np.isnan(X_t).any()
+
+
+def test_compiled_encoder_parity():
+    from src.features.compiled import compile_pipeline
+    df = pd.read_parquet("data/clean/telco_clean.parquet")
+    X_raw = df[fl.numeric_features + fl.categorical_low_card]
+    pipe, _ = build_preprocessor()
+    pipe.fit(X_raw)
+    enc = compile_pipeline(pipe)
+    sample = X_raw.sample(500, random_state=0)
+    expected = pipe.transform(sample)
+    got = enc.transform(sample.to_dict(orient="records"))
+    assert got.shape == expected.shape
+    np.testing.assert_array_equal(got, expected)
+
+
+def test_native_encoding_is_narrow_with_categorical_indices():
+    from src.features.feature_pipeline import categorical_features
+    df = pd.read_parquet("data/clean/telco_clean.parquet")
+    X_raw = df[fl.numeric_features + fl.categorical_low_card]
+    pipe, names = build_preprocessor(encoding="native")
+    X_t = pipe.fit_transform(X_raw)
+    cats = categorical_features(pipe)
+
+    assert X_t.shape == (len(df), len(names)) and X_t.dtype == np.float64
+    assert [names[i] for i in cats] == (fl.categorical_low_card
+                                        + ["TenureBucket", "Is_MonthToMonth"])
+    # unscaled
+    np.testing.assert_array_equal(X_t[:, 1], X_raw["tenure"])
+    assert (X_t[:, cats] >= 0).all() and not np.isnan(X_t).any()
+
+    unseen = (X_raw.head(1).astype({"Contract": object})
+              .assign(Contract="Weekly"))
+    assert np.isnan(pipe.transform(unseen)[0, names.index("Contract")])
+    assert categorical_features(build_preprocessor()[0].fit(X_raw)) == []
+
+
+def test_sparse_encoding_matches_dense_layout():
+    import scipy.sparse as sp
+    from src.features.compiled import compile_pipeline
+    df = pd.read_parquet("data/clean/telco_clean.parquet")
+    X_raw = df[fl.numeric_features + fl.categorical_low_card]
+    dense, names = build_preprocessor()
+    sparse, sparse_names = build_preprocessor(encoding="sparse")
+    X_d, X_s = dense.fit_transform(X_raw), sparse.fit_transform(X_raw)
+
+    assert sp.isspmatrix_csr(X_s) and sparse_names == names
+    np.testing.assert_array_equal(X_s.toarray(), X_d)
+    assert X_s.nnz < 0.5 * X_d.size
+
+    sample = X_raw.sample(50, random_state=0)
+    got = compile_pipeline(sparse).transform(sample.to_dict(orient="records"))
+    assert sp.isspmatrix_csr(got)
+    np.testing.assert_array_equal(got.toarray(),
+                                  sparse.transform(sample).toarray())
+
+
+def test_derive_leaves_input_alone_without_copying_it():
+    from src.features.transformers import AddDerivedFeatures
+    df = pd.read_parquet("data/clean/telco_clean.parquet")
+    dtypes = df.dtypes.copy()
+    out = AddDerivedFeatures().transform(df)
+
+    assert df.dtypes.equals(dtypes) and "AvgMonthlySpend" not in df
+    # float32 upcast in the copy
+    assert out["TotalCharges"].dtype == np.float64
+    assert np.shares_memory(out["tenure"].to_numpy(), df["tenure"].to_numpy())
+    dup = pd.concat([df, df[["Contract"]]], axis=1)
+    assert not AddDerivedFeatures().transform(dup).columns.has_duplicates
+
+
+def test_columnwise_fit_and_chunked_transform_match_fit_transform(tmp_path):
+    from src.features.compiled import compile_pipeline
+    from src.features.feature_pipeline import fit_columnwise, transform_chunked
+    df = pd.read_parquet("data/clean/telco_clean.parquet")
+    X_raw = df[fl.numeric_features + fl.categorical_low_card]
+    ref, _ = build_preprocessor()
+    expected = ref.fit_transform(X_raw)
+    pipe, _ = build_preprocessor()
+    # too few rows to see every category
+    fit_columnwise(pipe, X_raw, probe_rows=5)
+
+    np.testing.assert_array_equal(
+        transform_chunked(pipe, X_raw, chunk_rows=1000), expected)
+    assert (pipe.named_steps["pre"].output_indices_
+            == ref.named_steps["pre"].output_indices_)
+    enc = compile_pipeline(pipe)
+    row = X_raw.iloc[7].to_dict()
+    np.testing.assert_allclose(enc.transform_one(row), expected[7], atol=1e-5)
+    X32 = transform_chunked(pipe, X_raw, out=tmp_path / "X.npy",
+                            dtype=np.float32, chunk_rows=999)
+    assert isinstance(X32, np.memmap) and X32.dtype == np.float32
+    np.testing.assert_allclose(np.load(tmp_path / "X.npy"), expected,
+                               rtol=1e-6, atol=1e-6)
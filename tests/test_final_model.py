@@ -1,11 +1,72 @@
-import numpy as np, joblib
+import numpy as np
+from src.features.matrix_store import load_training_data
 from src.models.final_model import load
 
 def test_final_model_predict_shape():
-    X = joblib.load("data/processed/X_train.pkl")[:50]
+    X = load_training_data("data/processed")[0][:50]
     model = load()
     proba = (model.predict_proba(X)[:,1]
              if hasattr(model, "predict_proba")
              else model.predict(X))
     assert proba.shape == (50,)
     assert np.isfinite(proba).all()
+
+
+def test_flattened_final_model_matches_booster():
+    from src.models.explain import predict_proba
+    from src.models.flat_trees import export
+    X = np.asarray(load_training_data("data/processed")[0][:200])
+    model = load()
+    np.testing.assert_allclose(export(model).predict_proba(X)[:, 1],
+                               predict_proba(model, X), rtol=1e-6, atol=0)
+
+
+def test_native_formats_roundtrip(tmp_path):
+    from src.models import final_model
+    from src.models.explain import predict_proba
+    X = np.asarray(load_training_data("data/processed")[0][:200])
+    cases = (("models/xgb_optuna_best.pkl", (".ubj", ".json", ".npz")),
+             ("models/lgbm_optuna_best.txt", (".txt", ".npz")))
+    for src, formats in cases:
+        model = final_model.load(src)
+        ref = predict_proba(model, X)
+        for fmt in formats:
+            path = final_model.save(model, tmp_path / f"model{fmt}")
+            got = predict_proba(final_model.load(path), X)
+            np.testing.assert_allclose(got, ref, rtol=1e-6, atol=0)
+
+
+def test_load_is_memoized_until_the_file_changes(tmp_path):
+    import os
+    import shutil
+    from src.models import final_model
+    path = shutil.copy("models/lgbm_optuna_best.txt", tmp_path / "m.txt")
+    first = final_model.load(path)
+    assert final_model.load(path) is first
+    assert final_model.load(path, cached=False) is not first
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert final_model.load(path) is not first
+
+
+def test_contribs_stop_at_best_iteration():
+    import xgboost as xgb
+    from src.models.explain import predict_proba, predict_with_contribs
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(600, 5))
+    y = (X[:, 0] + rng.normal(size=600) > 0).astype(int)
+    model = xgb.XGBClassifier(n_estimators=200, learning_rate=0.3,
+                              early_stopping_rounds=5)
+    model.fit(X[:400], y[:400], eval_set=[(X[400:], y[400:])], verbose=False)
+    assert model.best_iteration + 1 < 200
+
+    margin = model.predict(X, output_margin=True)
+    for m in (model, model.get_booster()):
+        proba, contribs = predict_with_contribs(m, X)
+        # contributions + the (constant) bias column sum to the
+        # early-stopped margin
+        bias = margin - contribs.sum(axis=1)
+        np.testing.assert_allclose(bias, bias[0], atol=1e-5)
+        np.testing.assert_allclose(proba, 1 / (1 + np.exp(-margin)), rtol=1e-5)
+        np.testing.assert_allclose(predict_proba(m, X),
+                                   model.predict_proba(X)[:, 1], rtol=1e-5)
@@ -0,0 +1,71 @@
+import lightgbm as lgb
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from xgboost import XGBClassifier
+
+from src.models.flat_trees import FlatTrees, export
+
+X, y = make_classification(n_samples=600, n_features=8, random_state=0)
+X[::7, 2] = np.nan                               # missing values on both paths
+X[::5, 3] = 0.0
+
+
+def _assert_parity(flat, margin, proba, X):
+    np.testing.assert_array_equal(flat.predict_margin(X), margin)
+    np.testing.assert_allclose(flat.predict_proba(X)[:, 1], proba,
+                               rtol=1e-6, atol=0)
+    np.testing.assert_allclose(flat.predict_proba(X[0])[:, 1], proba[:1],
+                               rtol=1e-6, atol=0)
+    np.testing.assert_allclose(flat.predict_proba(X).sum(axis=1), 1.0,
+                               rtol=1e-6)
+
+
+def test_xgboost_parity_with_early_stopping():
+    model = XGBClassifier(n_estimators=200, max_depth=4,
+                          early_stopping_rounds=5, eval_metric="logloss")
+    model.fit(X[:400], y[:400], eval_set=[(X[400:], y[400:])], verbose=False)
+    assert model.best_iteration < 199
+
+    flat = export(model)
+    assert len(flat.roots) == model.best_iteration + 1
+    Xf = X.astype(np.float32)
+    _assert_parity(flat, model.predict(Xf, output_margin=True),
+                   model.predict_proba(Xf)[:, 1], Xf)
+
+
+@pytest.mark.parametrize("params", [{}, {"zero_as_missing": True},
+                                    {"use_missing": False}])
+def test_lightgbm_parity_for_each_missing_type(params):
+    booster = lgb.train({"objective": "binary", "num_leaves": 15,
+                         "verbose": -1, **params},
+                        lgb.Dataset(X, y), num_boost_round=60)
+    flat = export(booster)
+    _assert_parity(flat, booster.predict(X, raw_score=True),
+                   booster.predict(X), X)
+
+
+def test_save_load_roundtrip(tmp_path):
+    flat = export(XGBClassifier(n_estimators=20, max_depth=3).fit(X, y))
+    back = FlatTrees.load(flat.save(tmp_path / "flat.npz"))
+    np.testing.assert_array_equal(back.predict_margin(X),
+                                  flat.predict_margin(X))
+    assert back.depth == flat.depth and back.base_margin == flat.base_margin
+    mapped = FlatTrees.load(tmp_path / "flat.npz", mmap=True)
+    np.testing.assert_array_equal(mapped.predict_margin(X),
+                                  flat.predict_margin(X))
+    assert not mapped.value.flags.owndata and not mapped.value.flags.writeable
+
+    with pytest.raises(ValueError, match="expected 8 features"):
+        flat.predict_proba(X[:, :5])
+
+
+def test_unsupported_models_raise_value_error():
+    reg = XGBClassifier(n_estimators=3, objective="binary:hinge").fit(X, y)
+    with pytest.raises(ValueError,
+                       match="objective binary:hinge not supported"):
+        export(reg)
+    booster = lgb.train({"objective": "regression", "verbose": -1},
+                        lgb.Dataset(X, y), num_boost_round=3)
+    with pytest.raises(ValueError, match="objective regression not supported"):
+        export(booster)
@@ -1,6 +1,7 @@
 # tests/test_lgbm.py
 import joblib, numpy as np, lightgbm as lgb
 from pathlib import Path
+from src.features.matrix_store import load_training_data
 
 MODEL_DIR = Path("models")
 DATA_DIR  = Path("data/processed")
@@ -20,8 +21,7 @@ def _load_lgb_model(path: Path):
         return lambda X: booster.predict(X)
 
 def test_lgbm_proba_shape_no_nan():
-    import joblib, numpy as np
-    X = joblib.load(DATA_DIR / "X_train.pkl")
+    X, _ = load_training_data(DATA_DIR)
 
     # prefer tuned model, else baseline
     model_path = (
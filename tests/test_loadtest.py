@@ -0,0 +1,25 @@
+import numpy as np
+
+from benchmarks.loadtest import arrival_times, summarize
+
+
+def test_arrivals_are_open_loop_poisson():
+    t = arrival_times(200, 30, seed=1)
+    assert (np.diff(t) > 0).all() and t[-1] < 30
+    assert abs(len(t) / 30 - 200) < 10                     # ≈ requested rate
+    np.testing.assert_array_equal(t, arrival_times(200, 30, seed=1))
+
+
+def test_summarize_counts_errors_and_rows():
+    s = summarize([0.010] * 90 + [0.100] * 10, errors=25, duration=10,
+                  rows_per_request=50)
+    assert s["sent"] == 125 and s["ok"] == 100
+    assert s["throughput_rps"] == 10 and s["rows_per_s"] == 500
+    assert s["error_rate"] == 0.2
+    assert s["p50_ms"] == 10.0 and s["p99_ms"] > 90
+
+
+def test_summarize_reports_shed_separately():
+    s = summarize([0.010] * 80, errors=0, duration=10, shed=20)
+    assert s["sent"] == 100 and s["shed_rate"] == 0.2
+    assert s["error_rate"] == 0.0
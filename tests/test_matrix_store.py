@@ -0,0 +1,88 @@
+import json
+
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.linear_model import LogisticRegression
+
+from src.features.matrix_store import (
+    load_matrix,
+    load_training_data,
+    save_matrix,
+)
+from src.train.cv import cross_validate_oof, make_cv
+
+X, y = make_classification(n_samples=400, n_features=6, random_state=0)
+NAMES = [f"f{i}" for i in range(6)]
+
+
+def test_roundtrip_memmapped_with_metadata(tmp_path):
+    pipe = {"scaler": "fitted"}                       # anything picklable
+    src = tmp_path / "clean.parquet"
+    src.write_bytes(b"rows")
+    save_matrix(tmp_path / "m", X, y, NAMES, pipeline=pipe, data_path=src)
+
+    m = load_matrix(tmp_path / "m")
+    assert isinstance(m.X, np.memmap) and not m.X.flags.writeable
+    np.testing.assert_array_equal(m.X, X)
+    np.testing.assert_array_equal(m.y, y)
+    assert m.y.dtype == np.int8
+    assert m.feature_names == NAMES
+    assert m.meta["shape"] == [400, 6] and m.meta["dtype"] == "<f8"
+    assert m.meta["pipeline_hash"] and m.meta["data_hash"]
+
+    with pytest.raises(ValueError, match="different feature pipeline"):
+        load_matrix(tmp_path / "m", expect_pipeline_hash="0" * 32)
+
+    # parallel CV on the memmap gives the same OOF as on the in-memory array
+    ref = cross_validate_oof(LogisticRegression(), X, y, cv=make_cv())
+    res = cross_validate_oof(LogisticRegression(), m.X, m.y, cv=make_cv(),
+                             n_jobs=2)
+    np.testing.assert_allclose(res.oof, ref.oof)
+
+
+def test_overwrite_and_shape_checks(tmp_path):
+    save_matrix(tmp_path / "m", X, y, NAMES)
+    save_matrix(tmp_path / "m", X[:10], y[:10], NAMES)
+    assert load_matrix(tmp_path / "m").X.shape == (10, 6)
+    # no temp dirs left
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["m"]
+
+    with pytest.raises(ValueError, match="inconsistent shapes"):
+        save_matrix(tmp_path / "bad", X, y[:-1], NAMES)
+
+
+def test_load_training_data_prefers_store(tmp_path):
+    import joblib
+    joblib.dump(X[:5], tmp_path / "X_train.pkl")
+    joblib.dump(y[:5], tmp_path / "y_train.pkl")
+    # legacy pickles
+    assert load_training_data(tmp_path)[0].shape == (5, 6)
+
+    save_matrix(tmp_path / "train_matrix", X, y, NAMES)
+    Xs, ys = load_training_data(tmp_path)
+    assert isinstance(Xs, np.memmap) and Xs.shape == (400, 6)
+    meta = json.loads((tmp_path / "train_matrix" / "meta.json").read_text())
+    assert meta["kind"] == "dense"
+
+
+def test_csr_store_is_memmapped_and_trainable(tmp_path):
+    import scipy.sparse as sp
+    Xs = sp.csr_matrix(np.where(np.abs(X) > 1, X, 0.0))
+    save_matrix(tmp_path / "train_matrix_sparse", Xs, y, NAMES)
+    m = load_matrix(tmp_path / "train_matrix_sparse")
+
+    assert m.meta["kind"] == "csr" and m.meta["nnz"] == Xs.nnz
+    assert sp.isspmatrix_csr(m.X) and (m.X != Xs).nnz == 0
+    base = m.X.data
+    # a view over the mapped file, no copy
+    while not isinstance(base, np.memmap):
+        base = base.base
+    Xl, _ = load_training_data(tmp_path, "sparse")
+    assert sp.isspmatrix_csr(Xl)
+
+    ref = cross_validate_oof(LogisticRegression(), Xs.toarray(), y,
+                             cv=make_cv())
+    res = cross_validate_oof(LogisticRegression(), m.X, m.y, cv=make_cv(),
+                             n_jobs=2)
+    np.testing.assert_allclose(res.oof, ref.oof, rtol=1e-6)
@@ -0,0 +1,50 @@
+import threading
+
+import pytest
+
+from src.api.metrics import Registry
+
+
+def test_render_prometheus_text():
+    reg = Registry()
+    c = reg.counter("req_total", "Requests.", ("route", "status"))
+    g = reg.gauge("in_flight", "In flight.")
+    h = reg.histogram("lat_seconds", "Latency.", ("stage",),
+                      buckets=(0.01, 0.1))
+    c.labels("/predict", "200").inc()
+    c.labels("/predict", "200").inc(2)
+    g.labels().inc()
+    for v in (0.005, 0.01, 0.05, 3.0):
+        h.labels("transform").observe(v)
+    reg.add_collector(
+        lambda: [("cache_entries", "gauge", "Entries.", [({}, 7)])])
+
+    text = reg.render()
+    assert "# TYPE req_total counter" in text
+    assert 'req_total{route="/predict",status="200"} 3' in text
+    assert "in_flight 1" in text
+    # le is inclusive
+    assert 'lat_seconds_bucket{stage="transform",le="0.01"} 2' in text
+    assert 'lat_seconds_bucket{stage="transform",le="0.1"} 3' in text
+    assert 'lat_seconds_bucket{stage="transform",le="+Inf"} 4' in text
+    assert 'lat_seconds_count{stage="transform"} 4' in text
+    assert "cache_entries 7" in text and text.endswith("\n")
+
+    with pytest.raises(ValueError, match="expects labels"):
+        c.labels("/predict")
+
+
+def test_concurrent_increments_are_not_lost():
+    h = Registry().histogram("x_seconds", "X.")
+    series = h.labels()
+
+    def work():
+        for _ in range(10_000):
+            series.observe(0.001)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert series.count == 40_000 and sum(series.counts) == 40_000
@@ -0,0 +1,76 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from src.api.registry import ModelRegistry, ModelSpec, ShadowScorer
+from src.api.schemas import TELCO_EXAMPLE
+
+PIPE = "models/feature_pipeline_v2.pkl"
+
+
+def _registry(tmp_path=None, warmed=None):
+    model = "models/xgb_optuna_best.pkl"
+    if tmp_path is not None:
+        model = shutil.copy(model, tmp_path / "model.pkl")
+    specs = {"xgb": ModelSpec(model, PIPE),
+             "lgbm": ModelSpec("models/lgbm_optuna_best.txt", PIPE)}
+    warm_fn = None if warmed is None else warmed.append
+    return ModelRegistry(specs, "xgb", warm_fn=warm_fn)
+
+
+def test_promote_warms_then_swaps():
+    warmed = []
+    reg = _registry(warmed=warmed)
+    old = reg.serving
+    assert warmed == []                 # first use loads, doesn't warm
+    new = reg.promote("lgbm")
+    assert warmed == [new] and reg.serving is new
+    assert reg.serving_name == "lgbm"
+    assert reg.serving_version == new.version != old.version
+    assert reg.promote("xgb") is old and reg.swaps == 2
+
+
+def test_changed_files_reload_and_bad_files_keep_serving(tmp_path):
+    reg = _registry(tmp_path)
+    old = reg.serving
+    assert reg.check_files() == []
+    path = tmp_path / "model.pkl"
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert reg.check_files() == ["xgb"]
+    reloaded = reg.serving
+    assert reloaded is not old and reg.swaps == 1
+
+    path.write_bytes(b"not a pickle")
+    assert reg.check_files() == [] and reg.serving is reloaded
+    assert reg.stats()["models"]["xgb"]["error"]
+    # the same broken file isn't retried
+    assert reg.check_files() == []
+
+
+def test_shadow_scores_sampled_rows_in_background():
+    reg = _registry()
+    frame = pd.DataFrame([TELCO_EXAMPLE] * 5)
+    art = reg.serving
+    served = art.score(art.pipe.transform(frame), explain=False)[0]
+    reg.set_shadow("lgbm", 1.0)
+    assert len(reg.shadow.sample(5)) == 5
+    reg.shadow.submit(frame, served)
+    reg.shadow.join()
+    stats = reg.shadow.stats()
+    assert stats["name"] == "lgbm" and stats["scored"] == 5
+    assert stats["failed"] == 0
+    assert 0 < stats["mean_abs_diff"] < 0.1
+    reg.set_shadow(None, 0.0)
+    assert not reg.shadow.active and len(reg.shadow.sample(5)) == 0
+
+
+def test_shadow_drops_when_queue_is_full():
+    shadow = ShadowScorer(max_pending=1)
+    # no worker thread
+    shadow._art, shadow.name, shadow.fraction = object(), "x", 1.0
+    shadow.submit(pd.DataFrame([TELCO_EXAMPLE]), np.array([0.5]))
+    shadow.submit(pd.DataFrame([TELCO_EXAMPLE]), np.array([0.5]))
+    assert shadow.dropped == 1
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from click.testing import CliRunner
+
+from src.data.clean_data import coerce_raw, impute
+from src.features import feature_lists as fl
+from src.models import final_model
+from src.models.explain import predict_proba
+from src.score import main
+
+RAW = Path("data/raw/WA_Fn-UseC_-Telco-Customer-Churn.csv")
+MODEL = Path("models/final/model.pkl")
+PIPE = Path("models/feature_pipeline_v2.pkl")
+
+
+def test_bulk_score_matches_in_memory(tmp_path):
+    raw = pd.read_csv(RAW, nrows=500)
+    raw["TotalCharges"] = raw["TotalCharges"].astype(str)
+    # gaps in four different chunks
+    raw.loc[[5, 130, 250, 499], "TotalCharges"] = " "
+    src = tmp_path / "raw.csv"
+    raw.to_csv(src, index=False)
+    out = tmp_path / "scored"
+
+    res = CliRunner().invoke(main, [
+        "-i", str(src), "-o", str(out),
+        "--model", str(MODEL), "--pipeline", str(PIPE),
+        "--chunksize", "120", "--workers", "2", "--top-features", "3",
+    ])
+    assert res.exit_code == 0, res.output
+    parts = sorted(out.glob("part-*.parquet"))
+    assert len(parts) == 5
+    scored = pd.concat([pd.read_parquet(p) for p in parts], ignore_index=True)
+
+    assert list(scored.columns) == [
+        "customerID", "churn_probability", "top_features"]
+    assert scored["customerID"].tolist() == raw["customerID"].tolist()
+    assert scored["top_features"].map(len).eq(3).all()
+
+    # blank TotalCharges get the whole file's mean, whichever chunk they're in
+    df = impute(coerce_raw(raw.copy()))
+    X = joblib.load(PIPE).transform(
+        df[fl.numeric_features + fl.categorical_low_card])
+    ref = predict_proba(final_model.load(MODEL), X)
+    np.testing.assert_allclose(scored["churn_probability"].to_numpy(), ref,
+                               atol=1e-6)
+
+
+def test_top_features_needs_native_contributions(tmp_path):
+    src = tmp_path / "raw.csv"
+    pd.read_csv(RAW, nrows=10).to_csv(src, index=False)
+    res = CliRunner().invoke(main, [
+        "-i", str(src), "-o", str(tmp_path / "scored"),
+        "--model", "models/logreg.pkl",
+        "--pipeline", str(PIPE), "--top-features", "3",
+    ])
+    assert res.exit_code == 2
+    assert "--top-features" in res.output
+    assert not (tmp_path / "scored").exists()
@@ -0,0 +1,68 @@
+import gc
+
+import src.api.app as api
+from src.api import serve
+
+
+def test_preload_loads_artifacts_and_freezes_heap():
+    try:
+        app = serve.preload()
+        assert app is api.app
+        assert api.MODELS.stats()["models"][api.MODELS.serving_name]["loaded"]
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+
+
+def test_restart_delay_doubles_up_to_the_cap():
+    delays = [serve.restart_delay(n, 1.0) for n in (1, 2, 3, 4)]
+    assert delays == [1.0, 2.0, 4.0, 8.0]
+    assert serve.restart_delay(20, 1.0) == serve.MAX_BACKOFF_S
+
+
+def test_crash_looping_worker_stops_the_server(monkeypatch):
+    import os
+    import signal
+    import time
+
+    forks = []
+    monkeypatch.setattr(serve, "preload", lambda: api.app)
+    monkeypatch.setattr(serve, "_run_worker", lambda config, sock: os._exit(3))
+    real_fork = os.fork
+    monkeypatch.setattr(
+        os, "fork", lambda: forks.append(time.monotonic()) or real_fork())
+    handlers = (signal.getsignal(signal.SIGTERM),
+                signal.getsignal(signal.SIGINT))
+    try:
+        assert serve.serve(port=0, workers=1, max_restarts=3,
+                           restart_backoff=0.05) == 1
+    finally:
+        signal.signal(signal.SIGTERM, handlers[0])
+        signal.signal(signal.SIGINT, handlers[1])
+    assert len(forks) == 4                          # first start + 3 restarts
+    gaps = [b - a for a, b in zip(forks, forks[1:])]
+    assert gaps[0] >= 0.05 and gaps[1] >= 0.1 and gaps[2] >= 0.2
+
+
+def test_worker_exit_status_reflects_how_it_ended(monkeypatch):
+    import os
+
+    import uvicorn
+
+    class Server:
+        def __init__(self, config):
+            pass
+
+        def run(self, sockets):
+            if outcome == "raise":
+                raise RuntimeError("boom")
+            if outcome == "exit":
+                raise SystemExit(3)
+
+    monkeypatch.setattr(uvicorn, "Server", Server)
+    for outcome, expected in (("return", 0), ("raise", 1), ("exit", 3)):
+        pid = os.fork()
+        if pid == 0:
+            serve._run_worker(None, None)
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == expected, outcome
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from src.train import launch_tuning as lt
+
+# this module doubles as a tiny "tuner" for the launcher's spawned workers
+STUDY_NAME = "toy"
+N_TRIALS = 6
+
+
+def load_data():
+    return None, None
+
+
+def make_objective(X, y, n_jobs=-1, fold_jobs=1):
+    def objective(trial):
+        x = trial.suggest_float("x", -3, 3)
+        return -(x - 1) ** 2
+    return objective
+
+
+def mlflow_callback(study, trial):
+    pass
+
+
+def test_parse_split():
+    assert lt.parse_split("8x1x8") == (8, 1, 8)
+    assert lt.parse_split("4x16") == (4, 1, 16)
+    assert lt.default_split(64) == (8, 1, 8)
+    with pytest.raises(Exception):
+        lt.parse_split("0x8")
+
+
+@pytest.mark.parametrize("storage", ["sqlite", "journal"])
+def test_workers_share_one_study(tmp_path, monkeypatch, storage):
+    monkeypatch.setitem(lt.TUNERS, "toy", (__name__, tmp_path / "toy.db"))
+    res = lt.run_split("toy", 6, (2, 1, 1), storage, log_mlflow=False)
+    assert res["trials"] == 6
+    assert res["trials_per_hour"] > 0
+    assert np.isfinite(res["best_value"])
+
+
+def test_other_studies_keep_their_own_oof_files(tmp_path):
+    import optuna
+    from src.train.tuning import trial_oof_path
+
+    def path_in(study_name):
+        trial = optuna.create_study(study_name=study_name).ask()
+        return trial_oof_path(tmp_path, trial, "xgb_pr_auc")
+
+    assert path_in("xgb_pr_auc") == tmp_path / "trial_0000.npz"
+    sweep = tmp_path / "sweep_8x1x8"
+    assert path_in("sweep_8x1x8") == sweep / "trial_0000.npz"